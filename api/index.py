@@ -13,12 +13,18 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'credit_system.settings')
 import django
 django.setup()
 
-# --- RUN MIGRATIONS ON SERVERLESS START ---
-from django.core.management import call_command
-call_command('migrate', interactive=False)
+# --- PREPARE THE DATABASE ON SERVERLESS START ---
+from django.conf import settings
+if settings.FASTBOOT:
+    # Restore the prebuilt snapshot and skip migrations when the schema is current
+    from credit_system.fastboot import ensure_database
+    ensure_database()
+else:
+    from django.core.management import call_command
+    call_command('migrate', interactive=False)
 
 # Import the WSGI application
 from credit_system.wsgi import application
 
 # This is the entry point for Vercel
-app = application 
\ No newline at end of file
+app = application
@@ -0,0 +1,86 @@
+"""Shared setup for benchmarks: Django bootstrap, a throwaway database and timers"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_NAMES = [
+    'Aaron', 'Abigail', 'Adrian', 'Aisha', 'Carlos', 'Chloe', 'Daniel', 'Elena', 'Ethan', 'Fatima',
+    'Grace', 'Hannah', 'Isaac', 'James', 'Jose', 'Joseph', 'Julia', 'Kevin', 'Liam', 'Maria',
+    'Mohammed', 'Nora', 'Olivia', 'Priya', 'Rahul', 'Sofia', 'Thomas', 'Wei', 'Yusuf', 'Zoe',
+]
+LAST_NAMES = [
+    'Anderson', 'Brown', 'Chen', 'Davis', 'Garcia', 'Gupta', 'Hernandez', 'Jackson', 'Johnson', 'Khan',
+    'Kumar', 'Lee', 'Lopez', 'Martin', 'Martinez', 'Miller', 'Moore', 'Nguyen', 'Patel', 'Rodriguez',
+    'Sharma', 'Silva', 'Singh', 'Smith', 'Taylor', 'Thomas', 'Walker', 'White', 'Williams', 'Wilson',
+]
+
+
+def setup_django():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'credit_system.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """Create a test database for the duration of the benchmark, like the test runner does"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_customers_and_loans(count, batch_size=5000, loans=True):
+    """Insert `count` customers, with one loan each unless `loans` is false"""
+    from loans.models import Customer, Loan
+
+    Customer.objects.bulk_create(  # type: ignore
+        (
+            Customer(
+                customer_id=index, first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+                last_name=LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)],
+                age=20 + index % 50, phone_number=f'9{index:09d}',
+                monthly_salary=30000 + index % 7000 + 0.5, approved_limit=1000000 + index,
+            )
+            for index in range(1, count + 1)
+        ),
+        batch_size=batch_size,
+    )
+    if not loans:
+        return
+    Loan.objects.bulk_create(  # type: ignore
+        (
+            Loan(
+                loan_id=index, customer_id=index, loan_amount=100000 + index, tenure=12 + index % 48,
+                interest_rate=8 + index % 9 + 0.25, monthly_repayment=5000 + index % 900,
+                emis_paid_on_time=index % 12, start_date=date(2020, 1, 1), end_date=date(2030, 1, 1),
+            )
+            for index in range(1, count + 1)
+        ),
+        batch_size=batch_size,
+    )
+
+
+def best_of(func, repeat=3):
+    """Fastest wall time of `repeat` runs in seconds, and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
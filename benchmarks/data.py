@@ -0,0 +1,114 @@
+"""Generate synthetic customer and loan files shaped like the sample workbooks.
+
+    python -m benchmarks.data --scale 100k --out benchmark-data
+
+The columns match customer_data.xlsx and loan_data.xlsx, so the files go
+through the same ingestion pipelines. Generation is seeded and vectorized,
+so the same scale and seed always produce the same rows, even at 1M.
+"""
+import argparse
+import os
+
+from benchmarks.common import FIRST_NAMES, LAST_NAMES, setup_django
+
+SCALES = {'1k': 1000, '100k': 100000, '1M': 1000000}
+
+TENURES = [6, 12, 18, 24, 36, 48, 60, 84, 120, 180, 240]
+
+# Loans per customer in the generated portfolio
+LOANS_PER_CUSTOMER = 1.5
+
+# Rows of one Excel sheet, the header included
+EXCEL_MAX_ROWS = 1048576
+
+
+def parse_scale(value):
+    """Row count from a scale name (1k, 100k, 1M) or a plain number"""
+    return SCALES[value] if value in SCALES else int(value)
+
+
+def customer_frame(count, seed=0, first_id=1, phone_offset=0):
+    """Customers with the customer_data.xlsx columns"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(first_id, first_id + count)
+    salary = rng.integers(150, 2000, count) * 100
+    return pd.DataFrame({
+        'Customer ID': ids,
+        'First Name': np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), count)],
+        'Last Name': np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), count)],
+        'Age': rng.integers(21, 66, count),
+        'Phone Number': 9000000000 + phone_offset + ids,
+        'Monthly Salary': salary,
+        # Same rule as customer registration: 36 x salary to the nearest lakh
+        'Approved Limit': np.round(salary * 36 / 100000) * 100000,
+    })
+
+
+def loan_frame(customer_count, seed=0, loans_per_customer=LOANS_PER_CUSTOMER):
+    """Loans with the loan_data.xlsx columns for customers 1..customer_count"""
+    import numpy as np
+    import pandas as pd
+    from loans.utils import calculate_monthly_installments
+
+    rng = np.random.default_rng(seed + 1)
+    count = int(customer_count * loans_per_customer)
+    amount = rng.integers(50, 2000, count) * 1000
+    tenure = np.array(TENURES)[rng.integers(0, len(TENURES), count)]
+    rate = np.round(rng.uniform(6, 18, count), 2)
+    start = np.datetime64('2015-01-01') + rng.integers(0, 11 * 365, count).astype('timedelta64[D]')
+    return pd.DataFrame({
+        'Customer ID': rng.integers(1, customer_count + 1, count),
+        'Loan ID': np.arange(1, count + 1),
+        'Loan Amount': amount,
+        'Tenure': tenure,
+        'Interest Rate': rate,
+        'Monthly payment': calculate_monthly_installments(amount, tenure, rate),
+        'EMIs paid on Time': rng.integers(0, tenure + 1),
+        'Date of Approval': pd.to_datetime(start),
+        'End Date': pd.to_datetime(start + (tenure * 30).astype('timedelta64[D]')),
+    })
+
+
+def write_frame(frame, path):
+    if path.endswith('.xlsx'):
+        frame.to_excel(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+def generate(count, out, seed=0, file_format='csv'):
+    """Write customers.<format> and loans.<format> to `out`, returns their paths"""
+    loan_count = int(count * LOANS_PER_CUSTOMER)
+    if file_format == 'xlsx' and loan_count >= EXCEL_MAX_ROWS:
+        raise ValueError(
+            f'{loan_count} loans do not fit in one Excel sheet ({EXCEL_MAX_ROWS - 1} rows), use csv'
+        )
+    os.makedirs(out, exist_ok=True)
+    customers = write_frame(customer_frame(count, seed), os.path.join(out, f'customers.{file_format}'))
+    loans = write_frame(loan_frame(count, seed), os.path.join(out, f'loans.{file_format}'))
+    return customers, loans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='1k', help='1k, 100k, 1M or a number of customers')
+    parser.add_argument('--out', default='benchmark-data')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+    args = parser.parse_args()
+
+    setup_django()
+    try:
+        paths = generate(parse_scale(args.scale), args.out, args.seed, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+    for path in paths:
+        print(f'Wrote {path}')
+
+
+if __name__ == '__main__':
+    main()
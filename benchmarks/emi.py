@@ -0,0 +1,57 @@
+"""Compare the Decimal-exact EMI calculator with the float path.
+
+    python -m benchmarks.emi --loans 100000
+"""
+import argparse
+import random
+from decimal import Decimal
+
+from benchmarks.common import best_of, setup_django
+
+# A product catalogue of rates and tenures, like the one the cached factors target
+RATES = [Decimal(rate) for rate in ('7.25', '8.50', '9.99', '10.50', '12.00', '14.75', '16.00', '18.50')]
+TENURES = [6, 12, 24, 36, 48, 60, 120, 240, 360]
+
+
+def run(count, repeat):
+    from loans.utils import (
+        annuity_factor, calculate_monthly_installment, calculate_monthly_installment_exact
+    )
+
+    generator = random.Random(count)
+    loans = [
+        (Decimal(generator.randint(10000000, 1000000000)) / 100, generator.choice(TENURES), generator.choice(RATES))
+        for _ in range(count)
+    ]
+
+    def float_path():
+        # What check_loan_eligibility used to do: float EMI converted back to Decimal
+        return [Decimal(str(calculate_monthly_installment(amount, tenure, rate))) for amount, tenure, rate in loans]
+
+    def exact_path():
+        return [calculate_monthly_installment_exact(amount, tenure, rate) for amount, tenure, rate in loans]
+
+    annuity_factor.cache_clear()
+    float_seconds, float_emis = best_of(float_path, repeat)
+    exact_seconds, exact_emis = best_of(exact_path, repeat)
+    differing = sum(1 for a, b in zip(float_emis, exact_emis) if a != b)
+    print(
+        f'{count:>9,} EMIs: float {float_seconds:7.3f}s  exact {exact_seconds:7.3f}s  '
+        f'ratio {float_seconds / exact_seconds:5.2f}x  differing by a cent or more: {differing:,}'
+    )
+    print(f'factor cache: {annuity_factor.cache_info()}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--loans', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    for count in args.loans:
+        run(count, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Time the indexed customer search against the old icontains filter.
+
+    python -m benchmarks.search --rows 1000000
+"""
+import argparse
+
+from benchmarks.common import benchmark_database, best_of, seed_customers_and_loans, setup_django
+
+QUERIES = ['jo', 'jose', 'martinez', 'jose mart', 'sofia silva', '9000001', '9000123456', '123456']
+
+
+def run(rows, repeat):
+    from django.db.models import Q
+    from loans.models import Customer
+    from loans.search import rebuild_search_index, search_customers
+
+    seed_customers_and_loans(rows, loans=False)
+    rebuild_search_index()
+    customers = Customer.objects.order_by('-created_at')  # type: ignore
+    for query in QUERIES:
+        indexed_seconds, indexed = best_of(lambda: list(search_customers(customers, query)[0][:10]), repeat)
+        scan_seconds, _ = best_of(lambda: list(customers.filter(
+            Q(first_name__icontains=query) | Q(last_name__icontains=query) | Q(phone_number__icontains=query)
+        )[:10]), repeat)
+        print(
+            f'{rows:>9,} customers  {query!r:>14}: indexed {indexed_seconds * 1000:7.1f} ms  '
+            f'icontains {scan_seconds * 1000:8.1f} ms  ({len(indexed)} shown)'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    for rows in args.rows:
+        with benchmark_database():
+            run(rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
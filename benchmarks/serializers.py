@@ -0,0 +1,48 @@
+"""Compare the values_list() fast path with the DRF serializers on list output.
+
+    python -m benchmarks.serializers --rows 10000 100000
+"""
+import argparse
+import json
+
+from benchmarks.common import benchmark_database, best_of, seed_customers_and_loans, setup_django
+
+
+def run(rows, repeat):
+    from django.core.serializers.json import DjangoJSONEncoder
+    from loans.models import Customer, Loan
+    from loans.serializers import CustomerSerializer, LoanDetailSerializer, ValuesSerializer
+
+    seed_customers_and_loans(rows)
+    cases = [
+        ('customers', CustomerSerializer, Customer.objects.order_by('customer_id')),  # type: ignore
+        ('loans', LoanDetailSerializer, Loan.objects.select_related('customer').order_by('loan_id')),  # type: ignore
+    ]
+    for label, serializer_class, queryset in cases:
+        fast = ValuesSerializer(serializer_class)
+        drf_seconds, drf_json = best_of(
+            lambda: json.dumps(serializer_class(queryset.all(), many=True).data, cls=DjangoJSONEncoder), repeat
+        )
+        fast_seconds, fast_json = best_of(
+            lambda: json.dumps(fast.serialize(fast.values(queryset.all())), cls=DjangoJSONEncoder), repeat
+        )
+        print(
+            f'{label:>9} x {rows:>7,}: DRF {drf_seconds:7.3f}s  fast path {fast_seconds:7.3f}s  '
+            f'speedup {drf_seconds / fast_seconds:5.1f}x  identical={drf_json == fast_json}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    for rows in args.rows:
+        with benchmark_database():
+            run(rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""Reproducible benchmark suite with a JSON baseline.
+
+    python -m benchmarks.suite --scale 100k --output baseline.json
+    python -m benchmarks.suite --scale 100k --output current.json --compare baseline.json
+
+Generates seeded synthetic data at the requested scale, ingests it into a
+throwaway database and times scoring, approval, EMI, ingestion, upload,
+dashboard and list API paths. Every benchmark records latency percentiles,
+queries per call and peak Python memory per call (tracemalloc). With
+--compare, benchmarks whose p50 grew past --threshold are reported and the
+command exits with status 1.
+"""
+import argparse
+import io
+import itertools
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.common import ROOT, benchmark_database, setup_django
+from benchmarks.data import customer_frame, generate, parse_scale
+
+# Calls per benchmark, before the query-count and memory runs
+DEFAULT_ITERATIONS = 100
+UPLOAD_ROWS = 500
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[index]
+
+
+def measure(call, iterations, warmup=1):
+    """Latency percentiles in ms, then one run under query capture and one under tracemalloc"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        call()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    with CaptureQueriesContext(connection) as queries:
+        call()
+    # Read now, the next test client request resets connection.queries_log
+    query_count = len(queries)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'mean_ms': round(sum(samples) / len(samples), 4),
+        'p50_ms': round(percentile(samples, 0.50), 4),
+        'p90_ms': round(percentile(samples, 0.90), 4),
+        'p99_ms': round(percentile(samples, 0.99), 4),
+        'max_ms': round(samples[-1], 4),
+        'queries': query_count,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def measure_once(run, rows):
+    """Single timed run for one-shot work like ingestion, with queries and peak memory"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'iterations': 1,
+        'mean_ms': round(seconds * 1000, 4),
+        'p50_ms': round(seconds * 1000, 4),
+        'p90_ms': round(seconds * 1000, 4),
+        'p99_ms': round(seconds * 1000, 4),
+        'max_ms': round(seconds * 1000, 4),
+        'queries': len(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'rows': rows,
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+    }
+
+
+def run_suite(count, iterations, seed, only=None):
+    from django.test import Client
+    from django.test.utils import override_settings
+    from loans.models import Customer, Loan
+    from loans.tasks import ingest_customer_data, ingest_loan_data
+    from loans.utils import calculate_credit_score, calculate_monthly_installment, determine_loan_approval
+
+    rng = random.Random(seed)
+    results = {}
+
+    def selected(name):
+        return only is None or name in only
+
+    with tempfile.TemporaryDirectory() as directory:
+        customers_path, loans_path = generate(count, directory, seed)
+        # Ingestion seeds the database for every other benchmark, so it always runs
+        loan_rows = sum(1 for _ in open(loans_path)) - 1
+        customer_result = measure_once(lambda: ingest_customer_data(customers_path), count)
+        loan_result = measure_once(lambda: ingest_loan_data(loans_path), loan_rows)
+        if selected('ingest_customer_data'):
+            results['ingest_customer_data'] = customer_result
+        if selected('ingest_loan_data'):
+            results['ingest_loan_data'] = loan_result
+
+    customer_ids = rng.sample(range(1, count + 1), min(iterations, count))
+    customers = itertools.cycle(list(Customer.objects.filter(customer_id__in=customer_ids)))  # type: ignore
+    loan_count = Loan.objects.count()  # type: ignore
+    loan_ids = rng.sample(range(1, loan_count + 1), min(iterations, loan_count))
+    loans = itertools.cycle(list(Loan.objects.select_related('customer').filter(loan_id__in=loan_ids)))  # type: ignore
+    emi_inputs = itertools.cycle([
+        (rng.randint(50, 2000) * 1000, rng.choice([12, 24, 60, 120]), round(rng.uniform(6, 18), 2))
+        for _ in range(1000)
+    ])
+    cursors = itertools.cycle([rng.randint(0, count) for _ in range(100)])
+    loan_cursors = itertools.cycle([rng.randint(0, loan_count) for _ in range(100)])
+    client = Client()
+
+    def score():
+        calculate_credit_score(next(customers))
+
+    def approve():
+        loan = next(loans)
+        determine_loan_approval(loan.customer, loan)
+
+    def emi():
+        calculate_monthly_installment(*next(emi_inputs))
+
+    uploads = itertools.count(1)
+
+    def upload():
+        # A fresh phone number block per call, clear of the ingested customers
+        frame = customer_frame(UPLOAD_ROWS, seed, phone_offset=next(uploads) * 10 ** 7)
+        frame = frame.drop(columns=['Customer ID'])
+        workbook = io.BytesIO()
+        frame.to_excel(workbook, index=False)
+        workbook.seek(0)
+        workbook.name = 'customers.xlsx'
+        with override_settings(EXCEL_UPLOAD_ASYNC=False):
+            client.post('/loans/excel-upload/', {'excel_file': workbook})
+
+    cases = [
+        ('calculate_credit_score', score, iterations),
+        ('determine_loan_approval', approve, iterations),
+        ('calculate_monthly_installment', emi, iterations * 100),
+        ('excel_upload', upload, max(3, iterations // 20)),
+        ('dashboard', lambda: client.get('/loans/'), iterations),
+        ('api_customers', lambda: client.get(f'/loans/api/customers/?cursor={next(cursors)}'), iterations),
+        ('api_loans', lambda: client.get(f'/loans/api/loans/?cursor={next(loan_cursors)}'), iterations),
+    ]
+    for name, call, calls in cases:
+        if selected(name):
+            results[name] = measure(call, calls)
+            if name == 'excel_upload':
+                results[name]['rows'] = UPLOAD_ROWS
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """Print p50 ratios against a baseline, returns the names that regressed"""
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or not before['p50_ms']:
+            print(f'{name:>30}: no baseline')
+            continue
+        ratio = result['p50_ms'] / before['p50_ms']
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(
+            f"{name:>30}: p50 {before['p50_ms']:10.3f} -> {result['p50_ms']:10.3f} ms ({ratio:5.2f}x)  "
+            f"queries {before['queries']} -> {result['queries']}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='1k', help='1k, 100k, 1M or a number of customers')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', help='Benchmark names to run (ingestion always runs to seed data)')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--compare', help='Baseline JSON to diff the results against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='p50 ratio that counts as a regression')
+    args = parser.parse_args()
+
+    setup_django()
+    import django
+
+    count = parse_scale(args.scale)
+    with benchmark_database():
+        results = run_suite(count, args.iterations, args.seed, set(args.only) if args.only else None)
+
+    report = {
+        'meta': {
+            'scale': args.scale,
+            'customers': count,
+            'iterations': args.iterations,
+            'seed': args.seed,
+            'commit': _git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+    for name, result in results.items():
+        print(
+            f"{name:>30}: p50 {result['p50_ms']:10.3f} ms  p90 {result['p90_ms']:10.3f} ms  "
+            f"p99 {result['p99_ms']:10.3f} ms  {result['queries']:>4} queries  {result['peak_memory_kb']:>10} KB"
+        )
+    print(f'Wrote {args.output}')
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if compare(report, baseline, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Fast cold starts for the serverless entry point.
+
+Instead of running every migration on each cold start, ensure_database():
+
+- restores a prebuilt SQLite snapshot (FASTBOOT_DB_SNAPSHOT) when the
+  database file does not exist yet,
+- skips `migrate` when the schema fingerprint stamped next to the database
+  matches the migrations shipped with the code,
+- on other databases, only migrates when the migration plan is not empty.
+"""
+import hashlib
+import shutil
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def schema_fingerprint():
+    """Hash of the Django version and every migration file of the installed apps"""
+    digest = hashlib.sha256(django.get_version().encode())
+    for app_config in apps.get_app_configs():
+        migrations_dir = Path(app_config.path) / 'migrations'
+        if not migrations_dir.is_dir():
+            continue
+        for path in sorted(migrations_dir.glob('*.py')):
+            digest.update(f'{app_config.label}/{path.name}'.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _sqlite_path(alias):
+    """Path of an on-disk SQLite database, None for in-memory or other engines"""
+    database = connections[alias].settings_dict
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        return None
+    name = str(database['NAME'])
+    if name == ':memory:' or name.startswith('file:'):
+        return None
+    return Path(name)
+
+
+def _stamp_path(db_path):
+    return db_path.with_name(db_path.name + '.schema')
+
+
+def restore_snapshot(db_path, snapshot):
+    """Copy a prebuilt database and its schema stamp into place when none exists yet"""
+    if not snapshot or db_path.exists() or not Path(snapshot).is_file():
+        return False
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(snapshot, db_path)
+    stamp = _stamp_path(Path(snapshot))
+    if stamp.is_file():
+        shutil.copyfile(stamp, _stamp_path(db_path))
+    return True
+
+
+def _has_unapplied_migrations(alias):
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[alias])
+    return bool(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+
+
+def ensure_database(alias=DEFAULT_DB_ALIAS, snapshot=None):
+    """Bring the database schema up to date as cheaply as possible, returns whether it migrated"""
+    from django.core.management import call_command
+
+    snapshot = getattr(settings, 'FASTBOOT_DB_SNAPSHOT', '') if snapshot is None else snapshot
+    db_path = _sqlite_path(alias)
+    if db_path is None:
+        if not _has_unapplied_migrations(alias):
+            return False
+        call_command('migrate', database=alias, interactive=False, verbosity=0)
+        return True
+
+    restore_snapshot(db_path, snapshot)
+    fingerprint = schema_fingerprint()
+    stamp = _stamp_path(db_path)
+    if db_path.exists() and stamp.is_file() and stamp.read_text().strip() == fingerprint:
+        return False
+    call_command('migrate', database=alias, interactive=False, verbosity=0)
+    stamp.write_text(fingerprint)
+    return True
+
+
+def build_snapshot(target, alias=DEFAULT_DB_ALIAS):
+    """Migrate the SQLite database and copy it with its schema stamp to `target`"""
+    db_path = _sqlite_path(alias)
+    if db_path is None:
+        raise ValueError('Snapshots can only be built from an on-disk SQLite database')
+    ensure_database(alias, snapshot='')
+    connections[alias].close()
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(db_path, target)
+    shutil.copyfile(_stamp_path(db_path), _stamp_path(target))
+    return target
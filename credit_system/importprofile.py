@@ -0,0 +1,69 @@
+"""Import-time profile of the application boot, like `python -X importtime`.
+
+    python -m credit_system.importprofile --top 20
+
+Runs the boot imports in a fresh interpreter and breaks the time down by
+top-level package, so heavy imports creeping into the boot path show up.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything a worker imports before serving its first request
+BOOT_STATEMENT = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'credit_system.settings'); "
+    "import django; django.setup(); import credit_system.urls"
+)
+
+
+def profile_imports(statement=BOOT_STATEMENT):
+    """Run `statement` with -X importtime, returns [(module, self_us, cumulative_us)]"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Column header
+        entries.append((fields[2].strip(), self_us, cumulative_us))
+    return entries
+
+
+def summarize(entries, top=15):
+    """Self time per top-level package in microseconds, largest first"""
+    totals = Counter()
+    for module, self_us, _ in entries:
+        totals[module.split('.')[0]] += self_us
+    return totals.most_common(top)
+
+
+def format_report(entries, top=15):
+    total = sum(self_us for _, self_us, _ in entries) or 1
+    lines = [f'{len(entries)} modules imported in {total / 1000:.1f} ms']
+    for package, self_us in summarize(entries, top):
+        lines.append(f'  {package:<28} {self_us / 1000:8.1f} ms  {self_us / total:6.1%}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('statement', nargs='?', default=BOOT_STATEMENT)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+    print(format_report(profile_imports(args.statement), args.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'loans.profiling.ProfilingMiddleware',  # First, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -91,6 +93,49 @@ if config('DATABASE_URL', default=None):
     DATABASES['default'] = dj_database_url.parse(config('DATABASE_URL'))
 
 
+# Cache configuration
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# Credit scores and approval decisions are cached under the 'credit' alias.
+# Writes invalidate entries by bumping a version stamp in that same cache,
+# so the backend must be shared by every worker: set CREDIT_CACHE_URL to a
+# Redis URL (needs the redis package), or point CREDIT_CACHE_BACKEND at
+# django.core.cache.backends.db.DatabaseCache (LOCATION is a table created
+# with `manage.py createcachetable`). Without one the cache is a no-op and
+# scores are read from their persisted snapshots. A process-local
+# LocMemCache is only honoured with CREDIT_CACHE_SINGLE_PROCESS=True, for a
+# single long-lived process such as runserver.
+
+CREDIT_CACHE_ALIAS = 'credit'
+
+CREDIT_CACHE_URL = config('CREDIT_CACHE_URL', default='')
+
+CREDIT_CACHE_SINGLE_PROCESS = config('CREDIT_CACHE_SINGLE_PROCESS', default=False, cast=bool)
+
+CREDIT_CACHE_BACKEND = config(
+    'CREDIT_CACHE_BACKEND',
+    default='django.core.cache.backends.redis.RedisCache' if CREDIT_CACHE_URL
+    else 'django.core.cache.backends.dummy.DummyCache'
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    CREDIT_CACHE_ALIAS: {
+        'BACKEND': CREDIT_CACHE_BACKEND,
+        'LOCATION': config('CREDIT_CACHE_LOCATION', default=CREDIT_CACHE_URL or 'credit-scores'),
+        'TIMEOUT': config('CREDIT_CACHE_TIMEOUT', default=3600, cast=int),
+    },
+}
+
+# Redis passes OPTIONS to its connection pool and evicts on its own
+if not CREDIT_CACHE_BACKEND.endswith('RedisCache'):
+    CACHES[CREDIT_CACHE_ALIAS]['OPTIONS'] = {
+        'MAX_ENTRIES': config('CREDIT_CACHE_MAX_ENTRIES', default=10000, cast=int),
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -134,6 +179,20 @@ STATICFILES_DIRS = [
 # Static files storage
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Uploaded files waiting for background import
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Background import jobs for Excel uploads
+# Serverless deployments cannot keep worker threads alive after the response,
+# so uploads are processed inside the request there.
+EXCEL_UPLOAD_ASYNC = config('EXCEL_UPLOAD_ASYNC', default=not os.environ.get('VERCEL_ENV'), cast=bool)
+IMPORT_JOB_WORKERS = config('IMPORT_JOB_WORKERS', default=2, cast=int)
+IMPORT_JOB_UPLOAD_DIR = 'uploads'
+# Jobs run in the web worker that accepted the upload and die with it (gunicorn
+# max_requests, timeouts, crashes). Queued or running jobs without progress
+# for this many seconds are marked failed; chunks report progress far more often.
+IMPORT_JOB_STALE_AFTER = config('IMPORT_JOB_STALE_AFTER', default=1800, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -151,6 +210,27 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [],
 }
 
+# Keyset pagination and NDJSON streaming for the JSON list endpoints
+API_PAGE_SIZE = config('API_PAGE_SIZE', default=100, cast=int)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=1000, cast=int)
+API_STREAM_CHUNK_SIZE = config('API_STREAM_CHUNK_SIZE', default=2000, cast=int)
+
+# HTML lists show an estimated total instead of running COUNT(*) per page view.
+# Tables smaller than the threshold are counted exactly, and pages past
+# LIST_MAX_OFFSET_PAGE are reached through keyset cursors instead of OFFSET.
+LIST_COUNT_CACHE_TIMEOUT = config('LIST_COUNT_CACHE_TIMEOUT', default=60, cast=int)
+LIST_EXACT_COUNT_THRESHOLD = config('LIST_EXACT_COUNT_THRESHOLD', default=10000, cast=int)
+LIST_MAX_OFFSET_PAGE = config('LIST_MAX_OFFSET_PAGE', default=20, cast=int)
+
+# Largest number of applications accepted by the batch eligibility endpoint
+ELIGIBILITY_BATCH_MAX_SIZE = config('ELIGIBILITY_BATCH_MAX_SIZE', default=5000, cast=int)
+
+# Largest number of loans evaluated by one bulk loan approval request
+APPROVAL_BATCH_MAX_SIZE = config('APPROVAL_BATCH_MAX_SIZE', default=5000, cast=int)
+
+# Largest number of what-if scenarios evaluated by one simulation request
+SIMULATION_MAX_SCENARIOS = config('SIMULATION_MAX_SCENARIOS', default=10000, cast=int)
+
 # Security settings for production
 if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
@@ -179,3 +259,23 @@ if os.environ.get('VERCEL_ENV'):
             'NAME': '/tmp/db.sqlite3',  # Use temp directory
         }
     }
+    MEDIA_ROOT = '/tmp/media'
+
+# Serverless cold starts (api/index.py) skip migrations while the schema
+# fingerprint stamped next to the SQLite file is current, and restore the
+# snapshot built with `manage.py build_db_snapshot` when no database exists.
+FASTBOOT = config('FASTBOOT', default=True, cast=bool)
+FASTBOOT_DB_SNAPSHOT = config('FASTBOOT_DB_SNAPSHOT', default='')
+
+# Per-view profiling served at /profiling/. Views over their declared query
+# budget log a warning, and fail outright when budgets are enforced, which
+# is the default under `manage.py test`.
+PROFILING_ENFORCE_BUDGETS = config(
+    'PROFILING_ENFORCE_BUDGETS', default=len(sys.argv) > 1 and sys.argv[1] == 'test', cast=bool
+)
+
+# Prometheus metrics at /metrics. Under multi-process gunicorn, point
+# METRICS_MULTIPROCESS_DIR at a directory shared by the workers (cleared on
+# start) so every worker's values are added up.
+METRICS_MULTIPROCESS_DIR = config('METRICS_MULTIPROCESS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=1.0, cast=float)
@@ -6,6 +6,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from loans.metrics import REGISTRY
+from loans.profiling import profile_stats
 from loans.views import dashboard
 
 @csrf_exempt
@@ -25,6 +27,14 @@ def health_check(request):
         "service": "bank-credit-score-loan-calculator"
     })
 
+def profiling_view(request):
+    """Per-view request timings, query counts and scoring time of this process"""
+    return JsonResponse(profile_stats())
+
+def metrics_view(request):
+    """Prometheus text exposition of the in-process metrics"""
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @csrf_exempt
 def favicon_view(request):
     """Handle favicon requests"""
@@ -35,6 +45,8 @@ urlpatterns = [
     path('loans/', include('loans.urls')),
     path('test/', test_view, name='test'),
     path('health/', health_check, name='health'),
+    path('profiling/', profiling_view, name='profiling'),
+    path('metrics', metrics_view, name='metrics'),
     path('favicon.ico', favicon_view, name='favicon'),
     path('favicon.png', favicon_view, name='favicon_png'),
     path('', dashboard, name='home'),  # Restore dashboard as root
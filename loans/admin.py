@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Customer, Loan
+from .models import Customer, Loan, CreditScoreSnapshot, DashboardStats, LoanApprovalDecision
 
 
 @admin.register(Customer)
@@ -16,3 +16,24 @@ class LoanAdmin(admin.ModelAdmin):
                    'tenure', 'monthly_repayment', 'start_date', 'end_date']
     list_filter = ['start_date', 'end_date', 'interest_rate']
     search_fields = ['customer__first_name', 'customer__last_name']
+
+
+@admin.register(CreditScoreSnapshot)
+class CreditScoreSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['customer', 'score', 'num_loans', 'current_debt', 'as_of', 
+                   'is_stale', 'computed_at']
+    list_filter = ['is_stale', 'as_of']
+    search_fields = ['customer__first_name', 'customer__last_name']
+
+
+@admin.register(DashboardStats)
+class DashboardStatsAdmin(admin.ModelAdmin):
+    list_display = ['total_customers', 'total_loans', 'total_loan_amount', 'excellent', 'good',
+                   'fair', 'poor', 'updated_at', 'reconciled_at']
+
+
+@admin.register(LoanApprovalDecision)
+class LoanApprovalDecisionAdmin(admin.ModelAdmin):
+    list_display = ['loan', 'approval', 'credit_score', 'evaluated_at']
+    list_filter = ['approval', 'evaluated_at']
+    search_fields = ['loan__customer__first_name', 'loan__customer__last_name']
@@ -0,0 +1,113 @@
+"""Versioned cache for credit scores and loan approval decisions.
+
+Entries live in the Django cache configured under ``CREDIT_CACHE_ALIAS``.
+Every key embeds the customer's version stamp and the current day, so a
+write to the customer or their loans, or the date rollover, simply makes
+old entries unreachable until the backend evicts them.
+
+A version bump only reaches the processes that share the backend, so
+process-local backends are bypassed (values are computed every time)
+unless CREDIT_CACHE_SINGLE_PROCESS says there is only one process.
+"""
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import CACHE_REQUESTS
+
+DEFAULT_CACHE_ALIAS = 'credit'
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def get_cache():
+    """Return the cache backend used for credit data"""
+    return caches[getattr(settings, 'CREDIT_CACHE_ALIAS', DEFAULT_CACHE_ALIAS)]
+
+
+def cache_enabled():
+    """Whether cached entries can be invalidated in every process that reads them"""
+    cache = get_cache()
+    if isinstance(cache, DummyCache):
+        return False
+    if isinstance(cache, LocMemCache):
+        return getattr(settings, 'CREDIT_CACHE_SINGLE_PROCESS', False)
+    return True
+
+
+def _version_key(customer_id):
+    return f'loans:customer-version:{customer_id}'
+
+
+def get_customer_version(customer_id):
+    """Return the version stamp of a customer, creating one if missing"""
+    cache = get_cache()
+    key = _version_key(customer_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh timestamp can never collide with entries written under an
+        # evicted version, so losing the stamp only costs a cache miss
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_customer_versions(customer_ids):
+    """Invalidate all cached entries of the given customers"""
+    if not cache_enabled():
+        return
+    version = time.time_ns()
+    get_cache().set_many(
+        {_version_key(customer_id): version for customer_id in customer_ids},
+        timeout=None
+    )
+
+
+def _record(kind, hit):
+    CACHE_REQUESTS.inc(kind=kind, result='hit' if hit else 'miss')
+    with _stats_lock:
+        counters = _stats.setdefault(kind, {'hits': 0, 'misses': 0})
+        counters['hits' if hit else 'misses'] += 1
+
+
+def cached(kind, customer_id, compute, *key_parts):
+    """Return a cached value for a customer, computing and storing it on a miss"""
+    if not cache_enabled():
+        return compute()
+    cache = get_cache()
+    version = get_customer_version(customer_id)
+    key = ':'.join([
+        'loans', kind, str(customer_id), *map(str, key_parts),
+        str(version), date.today().isoformat()
+    ])
+    value = cache.get(key)
+    if value is not None:
+        _record(kind, True)
+        return value
+    
+    _record(kind, False)
+    value = compute()
+    cache.set(key, value)
+    return value
+
+
+def cache_stats():
+    """Hit/miss counters per entry kind for this process"""
+    with _stats_lock:
+        stats = {kind: dict(counters) for kind, counters in _stats.items()}
+    for counters in stats.values():
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    """Reset the hit/miss counters"""
+    with _stats_lock:
+        _stats.clear()
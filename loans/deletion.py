@@ -0,0 +1,53 @@
+"""Set-based deletion of customers and everything hanging off them.
+
+Customer.delete() goes through Django's collector, and because the stats,
+snapshot and cache receivers in signals.py listen on Customer and Loan it
+cannot fast-delete: every cascaded row is fetched and sends its own
+signals. Here the dependent tables are deleted with one statement each and
+the totals and cache entries are adjusted once for the whole set.
+Decisions, search terms and snapshots have no receivers, so their
+QuerySet.delete() is already a single statement.
+"""
+from django.db import router, transaction
+from django.db.models import Count, Sum
+
+from .cache import bump_customer_versions
+from .models import CreditScoreSnapshot, Customer, CustomerSearchTerm, Loan, LoanApprovalDecision
+from .stats import record_customers, record_loans, record_score_changes
+
+# Customer versions bumped per cache call
+INVALIDATION_CHUNK_SIZE = 5000
+
+
+def delete_customers(customers):
+    """Delete a customer queryset with its loans, decisions, snapshots and search terms"""
+    using = router.db_for_write(Customer)
+    customer_ids = list(customers.values_list('customer_id', flat=True))
+    if not customer_ids:
+        return 0, 0
+
+    deleted_customers = Customer.objects.filter(customer_id__in=customers.values('customer_id'))  # type: ignore
+    customer_subquery = deleted_customers.values('customer_id')
+    loans = Loan.objects.filter(customer__in=customer_subquery)  # type: ignore
+    snapshots = CreditScoreSnapshot.objects.filter(customer__in=customer_subquery)  # type: ignore
+    with transaction.atomic(using=using):
+        totals = loans.aggregate(count=Count('pk'), amount=Sum('loan_amount'))
+        scores = list(snapshots.values_list('score', flat=True))
+        LoanApprovalDecision.objects.filter(loan__in=loans.values('loan_id')).delete()  # type: ignore
+        CustomerSearchTerm.objects.filter(customer__in=customer_subquery).delete()  # type: ignore
+        snapshots.delete()
+        # The signals.py receivers on Loan and Customer would make delete() load
+        # every row and run them once per row, the totals and cache entries they
+        # maintain are adjusted for the whole set below instead. _raw_delete is
+        # private Django API, but the only single-statement delete that skips them.
+        loans._raw_delete(using)
+        deleted = deleted_customers._raw_delete(using)
+
+        record_customers(-deleted)
+        record_loans(-totals['count'], -(totals['amount'] or 0))
+        record_score_changes((score, None) for score in scores)
+
+    # Ids can be handed out again, so cached scores of deleted customers must go
+    for offset in range(0, len(customer_ids), INVALIDATION_CHUNK_SIZE):
+        bump_customer_versions(customer_ids[offset:offset + INVALIDATION_CHUNK_SIZE])
+    return deleted, totals['count']
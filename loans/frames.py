@@ -0,0 +1,44 @@
+"""Column converters for uploaded and ingested DataFrames.
+
+Shared by the ingestion pipeline in tasks.py and the upload validators in
+validation.py, so a file column is read the same way on both paths.
+Unparseable values become NaN/NaT for the caller's rules to reject.
+"""
+import pandas as pd
+
+# Keep IN (...) lookups under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def column_or_default(df, column, default=None):
+    """Return a column, or a constant default when the file does not have it"""
+    if column in df.columns:
+        return df[column]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def numeric_column(df, column, default=None):
+    return pd.to_numeric(column_or_default(df, column, default), errors='coerce')
+
+
+def text_column(df, column):
+    return column_or_default(df, column, '').fillna('').astype(str).str.strip()
+
+
+def date_column(df, column):
+    return pd.to_datetime(column_or_default(df, column), errors='coerce')
+
+
+def phone_numbers(series):
+    """Render phone numbers as digit strings even when Excel stored them as floats"""
+    numeric = pd.to_numeric(series, errors='coerce')
+    whole = numeric.notna() & (numeric == numeric.round())
+    phones = series.astype(str).str.strip()
+    phones[whole] = numeric[whole].astype('int64').astype(str)
+    return phones.where(series.notna(), '')
+
+
+def in_chunks(values, size=LOOKUP_CHUNK_SIZE):
+    values = list(values)
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
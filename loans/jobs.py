@@ -0,0 +1,132 @@
+"""Background import jobs for uploaded customer and loan files.
+
+Uploads are written to the default storage and processed on a local thread
+pool, so no external broker is needed. Progress is persisted on the
+ImportJob row after every chunk, where the upload page polls it.
+
+The pool lives in the web worker that accepted the upload, so a recycled,
+timed out or crashed worker takes its jobs with it. Every progress write
+refreshes updated_at, and sweep_stale_jobs() fails queued or running jobs
+that have been silent for IMPORT_JOB_STALE_AFTER seconds. It runs before
+each new upload, when a stale job is polled, and from the
+sweep_import_jobs command.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ImportJob
+from .tasks import import_upload
+
+logger = logging.getLogger(__name__)
+
+# Only the first errors are kept on the job row, the counters stay exact
+MAX_JOB_ERRORS = 1000
+
+STALE_JOB_MESSAGE = 'Import was interrupted: the worker running it stopped. Please upload the file again.'
+
+ACTIVE_STATUSES = [ImportJob.STATUS_QUEUED, ImportJob.STATUS_RUNNING]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide thread pool running import jobs"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMPORT_JOB_WORKERS', 2),
+                thread_name_prefix='import-job'
+            )
+        return _executor
+
+
+def sweep_stale_jobs(stale_after=None):
+    """Fail queued or running jobs whose worker stopped reporting, returns how many"""
+    stale_after = settings.IMPORT_JOB_STALE_AFTER if stale_after is None else stale_after
+    stale = ImportJob.objects.filter(  # type: ignore
+        status__in=ACTIVE_STATUSES,
+        updated_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    )
+    swept = 0
+    for job_id, file_path in list(stale.values_list('job_id', 'file_path')):
+        now = timezone.now()
+        # Re-checked per job, one may have reported progress since the lookup
+        if not stale.filter(job_id=job_id).update(
+            status=ImportJob.STATUS_FAILED, message=STALE_JOB_MESSAGE, finished_at=now, updated_at=now
+        ):
+            continue
+        logger.warning(f"Import job {job_id} went stale and was marked failed")
+        if default_storage.exists(file_path):
+            default_storage.delete(file_path)
+        swept += 1
+    return swept
+
+
+def submit_import_job(uploaded_file):
+    """Store an uploaded file and queue it for background processing"""
+    sweep_stale_jobs()
+    upload_dir = getattr(settings, 'IMPORT_JOB_UPLOAD_DIR', 'uploads')
+    file_path = default_storage.save(os.path.join(upload_dir, uploaded_file.name), uploaded_file)
+    job = ImportJob.objects.create(file_name=uploaded_file.name, file_path=file_path)  # type: ignore
+    transaction.on_commit(lambda: get_executor().submit(run_import_job, job.job_id))
+    return job
+
+
+def _save_progress(job, report):
+    ImportJob.objects.filter(job_id=job.job_id).update(  # type: ignore
+        kind=report.label,
+        rows_processed=report.processed,
+        rows_succeeded=report.created,
+        rows_failed=report.rejected,
+        errors=report.errors[:MAX_JOB_ERRORS],
+        updated_at=timezone.now(),
+    )
+
+
+def run_import_job(job_id):
+    """Process a queued import job, recording progress and the final outcome"""
+    now = timezone.now()
+    # A job swept while it waited in the queue has lost its file, leave it failed
+    started = ImportJob.objects.filter(job_id=job_id, status=ImportJob.STATUS_QUEUED).update(  # type: ignore
+        status=ImportJob.STATUS_RUNNING, started_at=now, updated_at=now
+    )
+    job = ImportJob.objects.get(job_id=job_id)  # type: ignore
+    if not started:
+        _release_connection()
+        return job
+    
+    try:
+        with default_storage.open(job.file_path) as source:
+            report = import_upload(source, progress=lambda report: _save_progress(job, report))
+        _save_progress(job, report)
+        job.refresh_from_db()
+        job.status = ImportJob.STATUS_FAILED if report.error else ImportJob.STATUS_COMPLETED
+        job.message = report.error or str(report)
+    except Exception as e:
+        logger.exception(f"Import job {job_id} failed")
+        job.refresh_from_db()
+        job.status = ImportJob.STATUS_FAILED
+        job.message = f'Error processing Excel file: {str(e)}'
+    finally:
+        job.finished_at = job.updated_at = timezone.now()
+        job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+        if default_storage.exists(job.file_path):
+            default_storage.delete(job.file_path)
+        _release_connection()
+    return job
+
+
+def _release_connection():
+    # Worker threads own their database connection
+    if threading.current_thread() is not threading.main_thread():
+        connection.close()
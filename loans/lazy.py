@@ -0,0 +1,31 @@
+"""Deferred imports of the data-science stack.
+
+numpy, pandas and openpyxl cost hundreds of milliseconds and tens of MB
+per process. Modules on the request path bind them with lazy_module(), so
+they load on first use instead of when Django imports the views.
+"""
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        value = getattr(self._module, attr)
+        # Later lookups of the same attribute skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from credit_system.fastboot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Migrate the SQLite database and save it as a snapshot for fast serverless cold starts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', help='Path of the snapshot file (point FASTBOOT_DB_SNAPSHOT at it)')
+
+    def handle(self, *args, **options):
+        target = build_snapshot(options['target'])
+        self.stdout.write(f'Wrote database snapshot to {target}')
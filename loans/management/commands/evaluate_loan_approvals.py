@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from loans.portfolio import pending_loans, reevaluate_portfolio
+from loans.utils import LOOKUP_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Re-evaluate loan approval decisions and store them (schedule nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending-only',
+            action='store_true',
+            help='Only evaluate loans without a decision or awaiting manual review',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes evaluating chunks (1 runs serially)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=LOOKUP_CHUNK_SIZE,
+            help='Number of loans evaluated per chunk',
+        )
+
+    def handle(self, *args, **options):
+        loans = pending_loans() if options['pending_only'] else None
+        
+        self.stdout.write('Evaluating loan approvals...')
+        totals = reevaluate_portfolio(loans, workers=options['workers'], chunk_size=options['chunk_size'])
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(totals.items()))
+        self.stdout.write(f'Stored {sum(totals.values())} decisions ({summary or "no loans"})')
@@ -1,21 +1,59 @@
 from django.core.management.base import BaseCommand
-from loans.tasks import ingest_customer_data, ingest_loan_data
+from loans.readers import DEFAULT_CHUNK_SIZE
+from loans.tasks import DEFAULT_BATCH_SIZE, ingest_customer_data, ingest_data_parallel, ingest_loan_data
 
 
 class Command(BaseCommand):
     help = 'Ingest customer and loan data from Excel files'
-    
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes validating and converting rows (1 runs serially)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of rows inserted per transaction',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of rows read per partition',
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Starting data ingestion...')
-        
+
+        # Customers are fully written before loans so every loan finds its customer
         # Ingest customer data
         self.stdout.write('Ingesting customer data...')
-        customer_result = ingest_customer_data()
+        customer_result = self.ingest('customers', 'customer_data.xlsx', ingest_customer_data, options)
         self.stdout.write(f'Customer data: {customer_result}')
-        
+
         # Ingest loan data
         self.stdout.write('Ingesting loan data...')
-        loan_result = ingest_loan_data()
+        loan_result = self.ingest('loans', 'loan_data.xlsx', ingest_loan_data, options)
         self.stdout.write(f'Loan data: {loan_result}')
-        
-        self.stdout.write('Data ingestion completed successfully!')
\ No newline at end of file
+
+        self.stdout.write('Data ingestion completed successfully!')
+
+    def ingest(self, kind, path, ingest_serially, options):
+        if options['workers'] <= 1:
+            return ingest_serially(path, options['batch_size'], options['chunk_size'])
+
+        report, stats = ingest_data_parallel(
+            kind, path, options['workers'], options['batch_size'], options['chunk_size']
+        )
+        for worker, worker_stats in sorted(stats.items()):
+            seconds = worker_stats['seconds']
+            rate = worker_stats['rows'] / seconds if seconds else 0
+            self.stdout.write(
+                f"  worker {worker}: {worker_stats['rows']} rows in "
+                f"{worker_stats['partitions']} partitions, {seconds:.2f}s ({rate:,.0f} rows/s)"
+            )
+        return report
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from loans.search import INDEX_BATCH_SIZE, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the customer search terms used by the customer and loan list searches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=INDEX_BATCH_SIZE,
+            help='Number of customers indexed per query',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding customer search index...')
+        indexed = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(f'Indexed {indexed} customers')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from loans.stats import reconcile_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard totals and score histogram from the tables (schedule periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-scores',
+            action='store_true',
+            help='Count the persisted snapshots without recomputing credit scores first',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reconciling dashboard stats...')
+        stats = reconcile_dashboard_stats(refresh_scores=not options['skip_scores'])
+        self.stdout.write(
+            f'{stats.total_customers} customers, {stats.total_loans} loans, '
+            f'score bands {stats.score_distribution}'
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from loans.models import Customer
+from loans.utils import refresh_credit_score_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Recompute persisted credit score snapshots (schedule daily for the date rollover)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            help='Only refresh snapshots that were invalidated by writes',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of customers scored per query',
+        )
+
+    def handle(self, *args, **options):
+        customers = Customer.objects.all()  # type: ignore
+        if options['stale_only']:
+            customers = customers.filter(credit_score_snapshot__is_stale=True)
+        
+        self.stdout.write('Refreshing credit score snapshots...')
+        refreshed = refresh_credit_score_snapshots(customers, batch_size=options['batch_size'])
+        self.stdout.write(f'Refreshed {refreshed} credit score snapshots')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from loans.jobs import sweep_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Mark import jobs whose worker stopped reporting progress as failed (schedule periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=None,
+            help='Seconds without progress before a job counts as stale (default: IMPORT_JOB_STALE_AFTER)',
+        )
+
+    def handle(self, *args, **options):
+        swept = sweep_stale_jobs(options['stale_after'])
+        self.stdout.write(f'Marked {swept} stale import jobs as failed')
@@ -0,0 +1,266 @@
+"""In-process metrics exported in the Prometheus text format at /metrics.
+
+Counters, gauges and histograms live in a registry held by each process.
+Under a multi-process server (gunicorn workers) set METRICS_MULTIPROCESS_DIR
+to a directory shared by the workers: every process then writes its values
+to its own file there, at most every METRICS_FLUSH_INTERVAL seconds and on
+exit, and /metrics adds up the counters and histograms of all processes.
+Gauges are not added up, each process reports its own under a `pid` label.
+The file of an exited worker stays in place so counters and histograms keep
+what it recorded, only its gauges stop being reported. Clear the directory
+when the server starts, like prometheus_client's multiprocess mode.
+"""
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _update(self, labels, update):
+        self.registry.update(self.name, self._key(labels), update)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('Counters can only go up')
+        self._update(labels, lambda value: (value or 0) + amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        self._update(labels, lambda _: value)
+
+    def inc(self, amount=1, **labels):
+        self._update(labels, lambda value: (value or 0) + amount)
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        # Per-bucket counts plus a last +Inf bucket, then the sum
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+
+        def update(state):
+            state = state or [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+            return state
+        self._update(labels, update)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._values = {}
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+            self._values[metric.name] = {}
+
+    def update(self, name, key, update):
+        with self._lock:
+            if os.getpid() != self._pid:
+                # A forked worker starts from zero instead of the parent's values
+                self._pid = os.getpid()
+                self._values = {metric_name: {} for metric_name in self._metrics}
+            samples = self._values[name]
+            samples[key] = update(samples.get(key))
+        self._maybe_flush()
+
+    def collect(self):
+        """Values of this process as a JSON-serializable dict"""
+        with self._lock:
+            return {
+                name: [[list(key), value] for key, value in self._values[name].items()]
+                for name in self._metrics
+            }
+
+    def _directory(self):
+        return getattr(settings, 'METRICS_MULTIPROCESS_DIR', '') if settings.configured else ''
+
+    def _maybe_flush(self):
+        if not self._directory():
+            return
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0)
+        if time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        """Write this process's values to its file in the multi-process directory"""
+        directory = self._directory()
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as handle:
+            json.dump(self.collect(), handle)
+        os.replace(temporary, os.path.join(directory, f'metrics-{os.getpid()}.json'))
+
+    def merged(self):
+        """Values of every process sharing the directory, or of this process alone"""
+        directory = self._directory()
+        if not directory:
+            return self.collect()
+        self.flush()
+        merged = {}
+        for path in sorted(Path(directory).glob('metrics-*.json')):
+            try:
+                pid = int(path.stem[len('metrics-'):])
+            except ValueError:
+                continue
+            running = _is_running(pid)
+            try:
+                values = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # A file being replaced or truncated by a crash
+            for name, samples in values.items():
+                if name not in self._metrics:
+                    continue
+                gauge = self._metrics[name].kind == 'gauge'
+                if gauge and not running:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in samples:
+                    key = tuple(key) + ((str(pid),) if gauge else ())
+                    target[key] = _add(target.get(key), value)
+        return {name: [[list(key), value] for key, value in samples.items()] for name, samples in merged.items()}
+
+    def render(self):
+        """Prometheus text exposition format"""
+        values = self.merged()
+        multiprocess = bool(self._directory())
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            labelnames = metric.labelnames
+            if multiprocess and metric.kind == 'gauge':
+                labelnames += ('pid',)
+            for key, value in sorted(values.get(name, []), key=lambda sample: sample[0]):
+                labels = list(zip(labelnames, key))
+                if metric.kind == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (math.inf,), value[:-1]):
+                        cumulative += count
+                        le = '+Inf' if bound == math.inf else repr(float(bound))
+                        lines.append(f'{name}_bucket{_labels(labels + [("le", le)])} {cumulative}')
+                    lines.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+                    lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+                else:
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._values = {name: {} for name in self._metrics}
+
+
+def _is_running(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Running under another user
+    return True
+
+
+def _add(current, value):
+    if current is None:
+        return value
+    if isinstance(value, list):
+        return [a + b for a, b in zip(current, value)]
+    return current + value
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _number(value):
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+REQUEST_LATENCY = Histogram(
+    'credit_http_request_duration_seconds', 'Request latency per URL name',
+    ['view', 'method', 'status'],
+)
+SECTION_LATENCY = Histogram(
+    'credit_scoring_duration_seconds', 'Time spent in credit scoring and approval functions',
+    ['function'],
+)
+CACHE_REQUESTS = Counter(
+    'credit_cache_requests_total', 'Credit cache lookups by entry kind and result',
+    ['kind', 'result'],
+)
+INGESTED_ROWS = Counter(
+    'credit_ingested_rows_total', 'Rows inserted by the ingestion pipelines',
+    ['kind'],
+)
+INGESTION_SECONDS = Counter(
+    'credit_ingestion_seconds_total', 'Time spent inserting ingested rows',
+    ['kind'],
+)
+INGESTION_RATE = Gauge(
+    'credit_ingestion_rows_per_second', 'Insert throughput of the last ingestion batch',
+    ['kind'],
+)
+LOAN_DECISIONS = Counter(
+    'credit_loan_decisions_total', 'Loan approval decisions by outcome',
+    ['approval'],
+)
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditScoreSnapshot',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='credit_score_snapshot', serialize=False, to='loans.customer')),
+                ('score', models.IntegerField()),
+                ('num_loans', models.IntegerField(default=0)),
+                ('total_emis', models.IntegerField(default=0)),
+                ('paid_on_time', models.IntegerField(default=0)),
+                ('current_year_loans', models.IntegerField(default=0)),
+                ('total_loan_amount', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('current_debt', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('as_of', models.DateField()),
+                ('is_stale', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'credit_score_snapshots',
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+import unicodedata
+
+# Frozen copy of the normalization in loans.search, later edits there must
+# not change what this migration writes
+TERM_MAX_LENGTH = 100
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text):
+    return [token[:TERM_MAX_LENGTH] for token in _TOKEN_RE.findall(normalize(text))]
+
+
+def terms_for(first_name, last_name, phone_number):
+    terms = set(tokenize(first_name)) | set(tokenize(last_name))
+    digits = re.sub(r'\D', '', str(phone_number or ''))
+    if digits:
+        terms.add(digits[:TERM_MAX_LENGTH])
+    return terms
+
+
+def index_existing_customers(apps, schema_editor):
+    Customer = apps.get_model('loans', 'Customer')
+    CustomerSearchTerm = apps.get_model('loans', 'CustomerSearchTerm')
+    batch = []
+    for customer in Customer.objects.only('first_name', 'last_name', 'phone_number').iterator(chunk_size=2000):
+        batch.extend(
+            CustomerSearchTerm(customer_id=customer.pk, term=term)
+            for term in terms_for(customer.first_name, customer.last_name, customer.phone_number)
+        )
+        if len(batch) >= 2000:
+            CustomerSearchTerm.objects.bulk_create(batch)
+            batch = []
+    CustomerSearchTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='loans.customer')),
+            ],
+            options={
+                'db_table': 'customer_search_terms',
+                'indexes': [models.Index(fields=['term', 'customer'], name='search_term_customer_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='customersearchterm',
+            constraint=models.UniqueConstraint(fields=('customer', 'term'), name='unique_customer_search_term'),
+        ),
+        migrations.RunPython(index_existing_customers, migrations.RunPython.noop),
+    ]
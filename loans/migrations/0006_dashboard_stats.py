@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0005_customer_search_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_customers', models.IntegerField(default=0)),
+                ('total_loans', models.IntegerField(default=0)),
+                ('total_loan_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('excellent', models.IntegerField(default=0)),
+                ('good', models.IntegerField(default=0)),
+                ('fair', models.IntegerField(default=0)),
+                ('poor', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reconciled_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard stats',
+                'db_table': 'dashboard_stats',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0006_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoanApprovalDecision',
+            fields=[
+                ('loan', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='approval_decision', serialize=False, to='loans.loan')),
+                ('approval', models.CharField(choices=[('approved', 'Approved'), ('pending', 'Pending'), ('rejected', 'Rejected')], max_length=20)),
+                ('reason', models.TextField()),
+                ('credit_score', models.IntegerField()),
+                ('evaluated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'loan_approval_decisions',
+                'indexes': [models.Index(fields=['approval'], name='approval_decision_idx')],
+            },
+        ),
+    ]
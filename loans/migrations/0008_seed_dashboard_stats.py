@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+# Frozen copy of the score bands, the live ones in loans.stats may move on
+SCORE_BANDS = [
+    ('excellent', Q(credit_score_snapshot__score__gte=800)),
+    ('good', Q(credit_score_snapshot__score__gte=700, credit_score_snapshot__score__lt=800)),
+    ('fair', Q(credit_score_snapshot__score__gte=600, credit_score_snapshot__score__lt=700)),
+    ('poor', Q(credit_score_snapshot__score__lt=600)),
+]
+
+
+def seed_dashboard_stats(apps, schema_editor):
+    """Count the existing rows so the dashboard never has to build the stats row"""
+    Customer = apps.get_model('loans', 'Customer')
+    Loan = apps.get_model('loans', 'Loan')
+    DashboardStats = apps.get_model('loans', 'DashboardStats')
+    customers = Customer.objects.aggregate(
+        total_customers=Count('pk'),
+        **{band: Count('credit_score_snapshot', filter=condition) for band, condition in SCORE_BANDS}
+    )
+    loans = Loan.objects.aggregate(total_loans=Count('pk'), total_loan_amount=Sum('loan_amount'))
+    now = timezone.now()
+    DashboardStats.objects.update_or_create(
+        pk=1,
+        defaults={
+            'total_loans': loans['total_loans'],
+            'total_loan_amount': loans['total_loan_amount'] or 0,
+            'updated_at': now,
+            'reconciled_at': now,
+            **customers,
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0007_loan_approval_decision'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_dashboard_stats, migrations.RunPython.noop),
+    ]
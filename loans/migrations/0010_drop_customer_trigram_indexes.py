@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# The customer_search_terms prefix lookup replaced the icontains searches, so
+# the pg_trgm indexes from 0004 serve no query and only slow down writes.
+# Frozen copy of 0004's list, the reverse builds them again.
+TRIGRAM_INDEXES = [
+    ('customers_first_name_trgm', 'customers', 'first_name'),
+    ('customers_last_name_trgm', 'customers', 'last_name'),
+    ('customers_phone_trgm', 'customers', 'phone_number'),
+]
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0009_import_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_trigram_indexes, create_trigram_indexes),
+    ]
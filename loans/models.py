@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 from decimal import Decimal
 
 
@@ -29,6 +31,10 @@ class Customer(models.Model):
 
     class Meta:
         db_table = 'customers'
+        indexes = [
+            # Customer list ordering
+            models.Index(fields=['created_at'], name='customers_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -62,6 +68,14 @@ class Loan(models.Model):
 
     class Meta:
         db_table = 'loans'
+        indexes = [
+            # Active loans (end_date > today) in eligibility checks and scoring
+            models.Index(fields=['customer', 'end_date'], name='loans_customer_end_idx'),
+            # Current-year loans in scoring
+            models.Index(fields=['customer', 'start_date'], name='loans_customer_start_idx'),
+            # Loan list ordering
+            models.Index(fields=['created_at'], name='loans_created_idx'),
+        ]
 
     def __str__(self):
         return f"Loan {self.loan_id} - {getattr(self.customer, 'first_name', 'Unknown')}"
@@ -75,4 +89,158 @@ class Loan(models.Model):
         if self.emis_paid_on_time > self.tenure:
             raise ValidationError("EMIs paid on time cannot exceed total tenure")
         if self.start_date and self.end_date and self.start_date >= self.end_date:
-            raise ValidationError("End date must be after start date")
\ No newline at end of file
+            raise ValidationError("End date must be after start date")
+
+
+class CreditScoreSnapshot(models.Model):
+    customer = models.OneToOneField(
+        Customer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='credit_score_snapshot'
+    )
+    score = models.IntegerField()
+    num_loans = models.IntegerField(default=0)
+    total_emis = models.IntegerField(default=0)
+    paid_on_time = models.IntegerField(default=0)
+    current_year_loans = models.IntegerField(default=0)
+    total_loan_amount = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    current_debt = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    as_of = models.DateField()  # Day the date-dependent components were evaluated for
+    is_stale = models.BooleanField(default=False)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'credit_score_snapshots'
+
+    def __str__(self):
+        return f"Credit score {self.score} for customer {self.customer_id}"  # type: ignore
+
+
+class LoanApprovalDecision(models.Model):
+    """Latest approval decision of a loan, written by portfolio re-evaluation runs"""
+    APPROVED = 'approved'
+    PENDING = 'pending'
+    REJECTED = 'rejected'
+    APPROVAL_CHOICES = [
+        (APPROVED, 'Approved'),
+        (PENDING, 'Pending'),
+        (REJECTED, 'Rejected'),
+    ]
+
+    loan = models.OneToOneField(
+        Loan,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='approval_decision'
+    )
+    approval = models.CharField(max_length=20, choices=APPROVAL_CHOICES)
+    reason = models.TextField()
+    credit_score = models.IntegerField()
+    evaluated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'loan_approval_decisions'
+        indexes = [
+            # Pending loans picked up by the next evaluation run
+            models.Index(fields=['approval'], name='approval_decision_idx'),
+        ]
+
+    def __str__(self):
+        return f"Loan {self.loan_id} {self.approval}"  # type: ignore
+
+
+class CustomerSearchTerm(models.Model):
+    """Normalized name and phone tokens of a customer, searched by prefix"""
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = 'customer_search_terms'
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'term'], name='unique_customer_search_term'),
+        ]
+        indexes = [
+            # Prefix range scans return rows already ordered by term
+            models.Index(fields=['term', 'customer'], name='search_term_customer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> customer {self.customer_id}"  # type: ignore
+
+
+class ImportJob(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    job_id = models.AutoField(primary_key=True)
+    file_name = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500)
+    kind = models.CharField(max_length=20, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    rows_processed = models.IntegerField(default=0)
+    rows_succeeded = models.IntegerField(default=0)
+    rows_failed = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Last sign of life from the worker, queued and running jobs go stale without it
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'import_jobs'
+
+    def __str__(self):
+        return f"Import job {self.job_id} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    @property
+    def is_stale(self) -> bool:
+        if self.is_finished:
+            return False
+        return (timezone.now() - self.updated_at).total_seconds() > settings.IMPORT_JOB_STALE_AFTER
+
+
+class DashboardStats(models.Model):
+    """Single row of dashboard totals, maintained incrementally on writes"""
+    SINGLETON_ID = 1
+
+    total_customers = models.IntegerField(default=0)
+    total_loans = models.IntegerField(default=0)
+    total_loan_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    # Customers per credit score band of their persisted snapshot
+    excellent = models.IntegerField(default=0)
+    good = models.IntegerField(default=0)
+    fair = models.IntegerField(default=0)
+    poor = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    reconciled_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'dashboard_stats'
+        verbose_name_plural = 'dashboard stats'
+
+    def __str__(self):
+        return f"Dashboard stats ({self.total_customers} customers, {self.total_loans} loans)"
+
+    @property
+    def score_distribution(self):
+        return {
+            'excellent': self.excellent,
+            'good': self.good,
+            'fair': self.fair,
+            'poor': self.poor,
+        }
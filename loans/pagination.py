@@ -0,0 +1,257 @@
+"""Pagination helpers that avoid OFFSET scans and whole-table materialization"""
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def _positive_int(value, name):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError(f'{name} must be an integer.')
+    if value < 0:
+        raise PaginationError(f'{name} must not be negative.')
+    return value
+
+
+def get_page_size(request):
+    """Requested page size, bounded by API_MAX_PAGE_SIZE"""
+    page_size = _positive_int(request.GET.get('page_size', settings.API_PAGE_SIZE), 'page_size')
+    if page_size == 0:
+        raise PaginationError('page_size must be at least 1.')
+    return min(page_size, settings.API_MAX_PAGE_SIZE)
+
+
+def keyset_page(queryset, key, cursor, page_size, cursor_of=None):
+    """Rows with `key` greater than the cursor, returns (rows, next_cursor)
+
+    `cursor_of` reads the key from a row, defaulting to attribute access on
+    model instances; pass one for values_list() rows.
+    """
+    rows = list(queryset.filter(**{f'{key}__gt': cursor}).order_by(key)[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    cursor_of = cursor_of or (lambda row: getattr(row, key))
+    return rows, cursor_of(rows[-1])
+
+
+def keyset_response(request, queryset, key, serialize, cursor_of=None):
+    """JSON page of a queryset ordered by `key`, resumed from the ?cursor= value"""
+    try:
+        cursor = _positive_int(request.GET.get('cursor', 0), 'cursor')
+        page_size = get_page_size(request)
+    except PaginationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    rows, next_cursor = keyset_page(queryset, key, cursor, page_size, cursor_of)
+    next_url = None
+    if next_cursor is not None:
+        next_url = request.build_absolute_uri(f'{request.path}?cursor={next_cursor}&page_size={page_size}')
+    return JsonResponse({
+        'results': serialize(rows),
+        'next_cursor': next_cursor,
+        'next': next_url,
+    })
+
+
+def ndjson_response(queryset, serialize_one):
+    """Stream a queryset as newline-delimited JSON with bounded memory"""
+    chunk_size = settings.API_STREAM_CHUNK_SIZE
+    
+    def lines():
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield json.dumps(serialize_one(obj), cls=DjangoJSONEncoder) + '\n'
+    
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
+def estimated_count(model):
+    """Row count of a model's table without scanning it on every request.
+
+    PostgreSQL reports the planner's reltuples estimate. Elsewhere, or before
+    the table has been analyzed, an exact count is cached for
+    LIST_COUNT_CACHE_TIMEOUT seconds. Small tables are always counted exactly.
+    """
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+        if row and row[0] >= settings.LIST_EXACT_COUNT_THRESHOLD:
+            return row[0]
+
+    key = f'loans:count:{table}'
+    count = cache.get(key)
+    if count is None or count < settings.LIST_EXACT_COUNT_THRESHOLD:
+        count = model.objects.count()
+        cache.set(key, count, settings.LIST_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class ListPage:
+    """One page of an HTML list, with links that keep the other query parameters"""
+
+    def __init__(self, request, rows, number, has_previous, has_next, count, count_is_estimate, per_page):
+        self.request = request
+        self.object_list = rows
+        self.number = number
+        self.has_previous = has_previous
+        self.has_next = has_next
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+        self.per_page = per_page
+        self.previous_url = self.next_url = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_previous or self.has_next
+
+    @property
+    def start_index(self):
+        return (self.number - 1) * self.per_page + 1 if self.object_list else 0
+
+    @property
+    def end_index(self):
+        return (self.number - 1) * self.per_page + len(self.object_list)
+
+    @property
+    def num_pages(self):
+        if self.count_is_estimate:
+            return None
+        return max(1, -(-self.count // self.per_page))
+
+    def url(self, **params):
+        query = self.request.GET.copy()
+        for name in ('page', 'after', 'before'):
+            query.pop(name, None)
+        query.update({name: value for name, value in params.items() if value is not None})
+        return f'?{query.urlencode()}'
+
+    @property
+    def first_url(self):
+        return self.url(page=1)
+
+    @property
+    def last_url(self):
+        return self.url(page=self.num_pages) if self.num_pages else None
+
+    @property
+    def page_links(self):
+        """Numbered links around the current page, limited to OFFSET-addressable pages"""
+        last = self.num_pages or self.number + (1 if self.has_next else 0)
+        return [
+            (number, self.url(page=number))
+            for number in range(max(1, self.number - 2), min(last, self.number + 2) + 1)
+            if number == self.number or not self.count_is_estimate
+            or number <= settings.LIST_MAX_OFFSET_PAGE
+        ]
+
+    def link_neighbours(self, use_cursors):
+        """Set previous/next URLs, as keyset cursors past LIST_MAX_OFFSET_PAGE"""
+        if not self.object_list:
+            return
+        deep = settings.LIST_MAX_OFFSET_PAGE if use_cursors else None
+        if self.has_next:
+            number = self.number + 1
+            after = self.object_list[-1].pk if deep and number > deep else None
+            self.next_url = self.url(page=number, after=after)
+        if self.has_previous:
+            number = self.number - 1
+            before = self.object_list[0].pk if deep and number > deep else None
+            self.previous_url = self.url(page=number, before=before)
+
+
+def _page_number(request):
+    try:
+        return max(1, int(request.GET.get('page', 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _list_cursors(request):
+    """The ?after= and ?before= primary keys, None for both when either is malformed"""
+    cursors = []
+    for name in ('after', 'before'):
+        value = request.GET.get(name)
+        try:
+            cursors.append(_positive_int(value, name) if value else None)
+        except PaginationError:
+            return None, None, False
+    return cursors[0], cursors[1], True
+
+
+def paginate_list(request, queryset, per_page, exact_count=False, ordering_field='created_at'):
+    """Paginate an HTML list without COUNT(*) and without deep OFFSET scans.
+
+    Pages are fetched with one extra row to know whether a next page exists,
+    and the total shown comes from estimated_count(). Past
+    LIST_MAX_OFFSET_PAGE the links switch to keyset cursors (?after= and
+    ?before= the edge row's primary key), ordered by `ordering_field` then
+    primary key, newest first. With `exact_count` (bounded result sets such
+    as searches) the queryset's own ordering is kept and the total is exact.
+    """
+    number = _page_number(request)
+    if exact_count:
+        count = queryset.count()
+        number = min(number, max(1, -(-count // per_page)))
+        offset = (number - 1) * per_page
+        rows = list(queryset[offset:offset + per_page])
+        page = ListPage(request, rows, number, number > 1, offset + per_page < count, count, False, per_page)
+        page.link_neighbours(use_cursors=False)
+        return page
+
+    model = queryset.model
+    pk_name = model._meta.pk.name
+    queryset = queryset.order_by(f'-{ordering_field}', f'-{pk_name}')
+    count = estimated_count(model)
+    after, before, valid = _list_cursors(request)
+    if not valid:
+        number = 1
+    anchor = None
+    if after or before:
+        anchor = model.objects.filter(pk=after or before).values_list(ordering_field, pk_name).first()  # type: ignore
+
+    if anchor is None:
+        # Plain page numbers, also the fallback for a cursor whose row was deleted.
+        # Deeper pages are only reachable through cursors, never a deep OFFSET.
+        number = min(number, settings.LIST_MAX_OFFSET_PAGE)
+        offset = (number - 1) * per_page
+        rows = list(queryset[offset:offset + per_page + 1])
+        has_previous, has_next = number > 1, len(rows) > per_page
+        rows = rows[:per_page]
+    elif after:
+        key, pk = anchor
+        rows = list(queryset.filter(
+            Q(**{f'{ordering_field}__lt': key}) | Q(**{ordering_field: key, f'{pk_name}__lt': pk})
+        )[:per_page + 1])
+        has_previous, has_next = True, len(rows) > per_page
+        rows = rows[:per_page]
+    else:
+        key, pk = anchor
+        rows = list(queryset.filter(
+            Q(**{f'{ordering_field}__gt': key}) | Q(**{ordering_field: key, f'{pk_name}__gt': pk})
+        ).order_by(ordering_field, pk_name)[:per_page + 1])
+        has_previous, has_next = len(rows) > per_page, True
+        rows = rows[:per_page][::-1]
+
+    if anchor is not None and not has_previous:
+        number = 1
+    page = ListPage(request, rows, number, has_previous, has_next, count, True, per_page)
+    page.link_neighbours(use_cursors=True)
+    return page
@@ -0,0 +1,85 @@
+"""Portfolio-wide re-evaluation of loan approval decisions.
+
+Loans are split into chunks of loan IDs. Each chunk is evaluated with
+evaluate_loan_approvals, so a chunk costs one loan query and one grouped
+scoring query pair, and its decisions are upserted into the
+loan_approval_decisions table. Chunks can run in a process pool, where
+every worker opens its own database connection.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connection, connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Loan, LoanApprovalDecision
+from .utils import LOOKUP_CHUNK_SIZE, evaluate_loan_approvals
+
+DECISION_UPDATE_FIELDS = ['approval', 'reason', 'credit_score', 'evaluated_at']
+
+
+def pending_loans():
+    """Loans that were never evaluated or are waiting for manual review"""
+    return Loan.objects.filter(  # type: ignore
+        Q(approval_decision__isnull=True) | Q(approval_decision__approval=LoanApprovalDecision.PENDING)
+    )
+
+
+def save_decisions(decisions):
+    """Upsert {loan_id: decision} into the results table"""
+    evaluated_at = timezone.now()
+    LoanApprovalDecision.objects.bulk_create(  # type: ignore
+        [
+            LoanApprovalDecision(
+                loan_id=loan_id,
+                approval=decision['approval'],
+                reason=decision['reason'],
+                credit_score=decision['credit_score'],
+                evaluated_at=evaluated_at,
+            )
+            for loan_id, decision in decisions.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['loan'],
+        update_fields=DECISION_UPDATE_FIELDS,
+    )
+
+
+def evaluate_chunk(loan_ids):
+    """Evaluate and store the decisions of one chunk, returns counts per approval status"""
+    decisions = evaluate_loan_approvals(Loan.objects.filter(loan_id__in=loan_ids))  # type: ignore
+    save_decisions(decisions)
+    return Counter(decision['approval'] for decision in decisions.values())
+
+
+def _evaluate_chunk_in_worker(loan_ids):
+    try:
+        return evaluate_chunk(loan_ids)
+    finally:
+        # Worker processes own their database connection
+        connection.close()
+
+
+def reevaluate_portfolio(loans=None, workers=1, chunk_size=LOOKUP_CHUNK_SIZE):
+    """Re-evaluate the approval decision of every loan in a queryset.
+
+    Returns the number of decisions written per approval status.
+    """
+    loans = Loan.objects.all() if loans is None else loans  # type: ignore
+    loan_ids = list(loans.values_list('loan_id', flat=True).order_by('loan_id'))
+    chunks = [loan_ids[offset:offset + chunk_size] for offset in range(0, len(loan_ids), chunk_size)]
+    
+    totals = Counter()
+    if workers <= 1:
+        for chunk in chunks:
+            totals.update(evaluate_chunk(chunk))
+        return totals
+    
+    # Forked workers must not share the parent's connection
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        for counts in pool.map(_evaluate_chunk_in_worker, chunks):
+            totals.update(counts)
+    return totals
@@ -0,0 +1,175 @@
+"""Per-request profiling: wall time, database queries and scoring sections.
+
+ProfilingMiddleware wraps every database connection for the duration of a
+request and counts the queries and the time spent executing them.
+Functions decorated with @profiled(name) add their own time to the
+request. The totals are aggregated per view in this process, and served
+at /profiling/.
+
+Views declare how many queries they should need with @query_budget(n).
+Going over the budget logs a warning, and raises AssertionError when
+PROFILING_ENFORCE_BUDGETS is on (the default under `manage.py test`), so
+N+1 regressions fail the test suite instead of surfacing in production.
+Queries run while a streaming response is consumed are not counted.
+"""
+import contextvars
+import functools
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REQUEST_LATENCY, SECTION_LATENCY
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('loans_request_profile', default=None)
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+class RequestProfile:
+    """Counters of the request being served"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.sections = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - start
+
+    def add_section(self, name, seconds):
+        calls, total = self.sections.get(name, (0, 0.0))
+        self.sections[name] = (calls + 1, total + seconds)
+
+
+def current_profile():
+    """Profile of the request being served, None outside of requests"""
+    return _current.get()
+
+
+def profiled(name):
+    """Record the time spent in the decorated function on the current request and in metrics"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                SECTION_LATENCY.observe(seconds, function=name)
+                profile = _current.get()
+                if profile is not None:
+                    profile.add_section(name, seconds)
+        return wrapper
+    return decorator
+
+
+def query_budget(max_queries):
+    """Declare the most database queries a view should run per request"""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def _record(view_name, profile, wall_seconds, budget):
+    with _stats_lock:
+        stats = _stats.setdefault(view_name, {
+            'requests': 0, 'wall_seconds': 0.0, 'max_wall_seconds': 0.0,
+            'queries': 0, 'max_queries': 0, 'db_seconds': 0.0,
+            'budget': budget, 'over_budget': 0, 'sections': {},
+        })
+        stats['requests'] += 1
+        stats['wall_seconds'] += wall_seconds
+        stats['max_wall_seconds'] = max(stats['max_wall_seconds'], wall_seconds)
+        stats['queries'] += profile.queries
+        stats['max_queries'] = max(stats['max_queries'], profile.queries)
+        stats['db_seconds'] += profile.db_seconds
+        stats['budget'] = budget
+        if budget is not None and profile.queries > budget:
+            stats['over_budget'] += 1
+        for name, (calls, seconds) in profile.sections.items():
+            section = stats['sections'].setdefault(name, {'calls': 0, 'seconds': 0.0})
+            section['calls'] += calls
+            section['seconds'] += seconds
+
+
+def profile_stats():
+    """Per-view averages and maxima for this process, times in milliseconds"""
+    with _stats_lock:
+        snapshot = {
+            view_name: dict(stats, sections={name: dict(section) for name, section in stats['sections'].items()})
+            for view_name, stats in _stats.items()
+        }
+    report = {}
+    for view_name, stats in sorted(snapshot.items()):
+        requests = stats['requests']
+        report[view_name] = {
+            'requests': requests,
+            'avg_wall_ms': round(stats['wall_seconds'] / requests * 1000, 3),
+            'max_wall_ms': round(stats['max_wall_seconds'] * 1000, 3),
+            'avg_queries': round(stats['queries'] / requests, 2),
+            'max_queries': stats['max_queries'],
+            'avg_db_ms': round(stats['db_seconds'] / requests * 1000, 3),
+            'query_budget': stats['budget'],
+            'over_budget': stats['over_budget'],
+            'sections': {
+                name: {'calls': section['calls'], 'total_ms': round(section['seconds'] * 1000, 3)}
+                for name, section in sorted(stats['sections'].items())
+            },
+        }
+    return report
+
+
+def reset_profile_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class ProfilingMiddleware:
+    """Measure every request and check it against the view's query budget"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        wall_seconds = time.perf_counter() - start
+        
+        view_name, budget = getattr(request, '_profiling_view', (None, None))
+        if view_name is None:
+            return response
+        _record(view_name, profile, wall_seconds, budget)
+        REQUEST_LATENCY.observe(wall_seconds, view=view_name, method=request.method, status=response.status_code)
+        if budget is not None and profile.queries > budget:
+            message = f'{view_name} ran {profile.queries} queries, over its budget of {budget}'
+            logger.warning(message)
+            if getattr(settings, 'PROFILING_ENFORCE_BUDGETS', False):
+                raise AssertionError(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        view_name = match.view_name if match else view_func.__name__
+        request._profiling_view = (view_name, getattr(view_func, 'query_budget', None))
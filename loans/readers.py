@@ -0,0 +1,110 @@
+"""Chunked readers for customer and loan files.
+
+Workbooks are streamed with openpyxl in read-only mode, CSV files with the
+pandas chunked reader and Parquet files batch by batch with pyarrow, so the
+ingestion pipeline only ever holds one chunk of rows in memory. Each chunk
+is a DataFrame whose index continues across chunks, keeping row numbers in
+error reports relative to the whole file.
+"""
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+DEFAULT_CHUNK_SIZE = 5000
+
+FILE_FORMATS = {
+    '.xlsx': 'xlsx',
+    '.xlsm': 'xlsx',
+    '.xls': 'xls',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+
+def detect_format(source):
+    """Guess the file format of a path or uploaded file from its extension"""
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(name or ''))[1].lower()
+    return FILE_FORMATS.get(extension, 'xlsx')
+
+
+def _frame(rows, header, start):
+    width = len(header)
+    rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame.from_records(rows, columns=header, index=pd.RangeIndex(start, start + len(rows)))
+
+
+def iter_xlsx_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the first worksheet of a workbook in fixed-size DataFrame chunks"""
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = ['' if cell is None else str(cell).strip() for cell in header]
+
+        buffer = []
+        start = 0
+        for row in rows:
+            # Read-only sheets may report trailing blank rows
+            if all(cell is None for cell in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield _frame(buffer, header, start)
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield _frame(buffer, header, start)
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a CSV file in fixed-size DataFrame chunks"""
+    with pd.read_csv(source, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            chunk.columns = [str(column).strip() for column in chunk.columns]
+            yield chunk
+
+
+def iter_parquet_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a Parquet file in fixed-size DataFrame chunks (requires pyarrow)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError('Reading Parquet files requires the pyarrow package') from e
+
+    start = 0
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def iter_xls_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Legacy .xls workbooks cannot be streamed, so they are read whole and sliced"""
+    df = pd.read_excel(source)
+    df.columns = [str(column).strip() for column in df.columns]
+    for offset in range(0, len(df), chunk_size):
+        yield df.iloc[offset:offset + chunk_size]
+
+
+READERS = {
+    'xlsx': iter_xlsx_chunks,
+    'xls': iter_xls_chunks,
+    'csv': iter_csv_chunks,
+    'parquet': iter_parquet_chunks,
+}
+
+
+def read_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Yield DataFrame chunks of a customer or loan file in any supported format"""
+    file_format = file_format or detect_format(source)
+    if file_format not in READERS:
+        raise ValueError(f'Unsupported file format: {file_format}')
+    return READERS[file_format](source, chunk_size)
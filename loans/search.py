@@ -0,0 +1,190 @@
+"""Indexed search for the customer and loan lists.
+
+Customer names and phone numbers are split into normalized tokens stored
+in the customer_search_terms side table. A query token matches every term
+it prefixes, which is a range scan on the (term, customer) index instead
+of an icontains scan over the whole customers table. Rows come back in
+term order, so exact matches rank before longer completions and the scan
+can stop after `limit` customers. Numeric queries also take an exact path
+on the customer ID, loan ID and phone number, ranked ahead of prefix hits.
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Value, When
+
+from .models import Customer, CustomerSearchTerm
+
+MAX_RESULTS = 200
+TERM_MAX_LENGTH = 100
+INDEX_BATCH_SIZE = 2000
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-().+]')
+_MAX_INTEGER = 2 ** 31 - 1
+
+
+def normalize(text):
+    """Lowercase and strip accents so 'José' and 'jose' index the same"""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text):
+    return [token[:TERM_MAX_LENGTH] for token in _TOKEN_RE.findall(normalize(text))]
+
+
+def terms_for(first_name, last_name, phone_number):
+    """Search terms of one customer: name tokens and the phone number digits"""
+    terms = set(tokenize(first_name)) | set(tokenize(last_name))
+    digits = re.sub(r'\D', '', str(phone_number or ''))
+    if digits:
+        terms.add(digits[:TERM_MAX_LENGTH])
+    return terms
+
+
+def _term_rows(customers):
+    return [
+        CustomerSearchTerm(customer_id=customer.customer_id, term=term)
+        for customer in customers
+        for term in terms_for(customer.first_name, customer.last_name, customer.phone_number)
+    ]
+
+
+def index_customers(customers):
+    """Replace the search terms of the given customers"""
+    customers = [customer for customer in customers if customer.customer_id is not None]
+    if not customers:
+        return
+    with transaction.atomic():
+        CustomerSearchTerm.objects.filter(  # type: ignore
+            customer_id__in=[customer.customer_id for customer in customers]
+        ).delete()
+        CustomerSearchTerm.objects.bulk_create(_term_rows(customers), batch_size=INDEX_BATCH_SIZE)  # type: ignore
+
+
+def index_customers_by_phone(phone_numbers):
+    """Index customers inserted without returned IDs, found again by their unique phone"""
+    phone_numbers = list(phone_numbers)
+    for offset in range(0, len(phone_numbers), INDEX_BATCH_SIZE):
+        chunk = phone_numbers[offset:offset + INDEX_BATCH_SIZE]
+        index_customers(
+            Customer.objects.filter(phone_number__in=chunk)  # type: ignore
+            .only('customer_id', 'first_name', 'last_name', 'phone_number')
+        )
+
+
+def rebuild_search_index(batch_size=INDEX_BATCH_SIZE):
+    """Rebuild the whole side table, returns the number of customers indexed"""
+    customers = Customer.objects.only(  # type: ignore
+        'customer_id', 'first_name', 'last_name', 'phone_number'
+    ).order_by('customer_id')
+    indexed = 0
+    with transaction.atomic():
+        CustomerSearchTerm.objects.all().delete()  # type: ignore
+        batch = []
+        for customer in customers.iterator(chunk_size=batch_size):
+            batch.append(customer)
+            if len(batch) >= batch_size:
+                CustomerSearchTerm.objects.bulk_create(_term_rows(batch), batch_size=batch_size)  # type: ignore
+                indexed += len(batch)
+                batch = []
+        CustomerSearchTerm.objects.bulk_create(_term_rows(batch), batch_size=batch_size)  # type: ignore
+        indexed += len(batch)
+    return indexed
+
+
+def _prefix(token, field='term'):
+    """Range condition matching every value that starts with `token`.
+
+    The upper bound increments the last character rather than appending a
+    sentinel, which keeps the range valid under non-binary collations.
+    """
+    upper = token[:-1] + chr(ord(token[-1]) + 1)
+    return Q(**{f'{field}__gte': token, f'{field}__lt': upper})
+
+
+def _exact_integer(query):
+    query = query.strip()
+    if query.isdigit() and int(query) <= _MAX_INTEGER:
+        return int(query)
+    return None
+
+
+def _phone_digits(query):
+    """Digits of a query written like a phone number ('98765 43210', '(987) 654-3210')"""
+    digits = _PHONE_SEPARATORS_RE.sub('', query)
+    return digits if digits.isdigit() else None
+
+
+def search_customer_ids(query, limit=MAX_RESULTS):
+    """Customer IDs matching the query, best match first"""
+    ranked = []
+
+    def add(customer_ids):
+        for customer_id in customer_ids:
+            if customer_id not in ranked:
+                ranked.append(customer_id)
+
+    number = _exact_integer(query)
+    if number is not None:
+        add(Customer.objects.filter(customer_id=number).values_list('customer_id', flat=True))  # type: ignore
+    phone = _phone_digits(query)
+    if phone:
+        add(Customer.objects.filter(phone_number=phone).values_list('customer_id', flat=True))  # type: ignore
+        tokens = [phone]
+    else:
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+
+    if tokens and len(ranked) < limit:
+        # The longest token is the most selective, it drives the index scan
+        terms = CustomerSearchTerm.objects.filter(_prefix(tokens[0]))  # type: ignore
+        for token in tokens[1:]:
+            terms = terms.filter(Exists(
+                CustomerSearchTerm.objects.filter(customer_id=OuterRef('customer_id')).filter(_prefix(token))  # type: ignore
+            ))
+        # A customer can match through several terms, so over-fetch before de-duplicating
+        candidates = terms.order_by('term', 'customer_id').values_list('customer_id', flat=True)
+        add(candidates[:limit * 2])
+
+    return ranked[:limit]
+
+
+def rank_order(field, ids):
+    """Ordering expression that keeps `ids` in the given order"""
+    return Case(
+        *[When(**{field: value}, then=Value(position)) for position, value in enumerate(ids)],
+        default=Value(len(ids)),
+        output_field=IntegerField(),
+    )
+
+
+def _limited_ids(query, limit):
+    """Up to `limit` matching customer IDs, and whether more customers matched"""
+    customer_ids = search_customer_ids(query, limit + 1)
+    return customer_ids[:limit], len(customer_ids) > limit
+
+
+def search_customers(queryset, query, limit=MAX_RESULTS):
+    """Filter a customer queryset to the ranked search results.
+
+    Returns the queryset and whether matches beyond `limit` were left out.
+    """
+    customer_ids, truncated = _limited_ids(query, limit)
+    return queryset.filter(customer_id__in=customer_ids).order_by(rank_order('customer_id', customer_ids)), truncated
+
+
+def search_loans(queryset, query, limit=MAX_RESULTS):
+    """Loans with a matching loan ID first, then loans of the matching customers.
+
+    Returns the queryset and whether customers beyond `limit` were left out.
+    """
+    customer_ids, truncated = _limited_ids(query, limit)
+    condition = Q(customer_id__in=customer_ids)
+    ordering = [rank_order('customer_id', customer_ids), '-created_at']
+    loan_id = _exact_integer(query)
+    if loan_id is not None:
+        condition |= Q(loan_id=loan_id)
+        ordering.insert(0, rank_order('loan_id', [loan_id]))
+    return queryset.filter(condition).order_by(*ordering), truncated
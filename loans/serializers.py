@@ -1,6 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from .models import Customer, Loan
 from decimal import Decimal
+import decimal
 
 
 class CustomerSerializer(serializers.ModelSerializer):
@@ -25,9 +28,56 @@ class CustomerRegistrationSerializer(serializers.Serializer):
 
 class LoanEligibilitySerializer(serializers.Serializer):
     customer_id = serializers.IntegerField()
-    loan_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
-    interest_rate = serializers.DecimalField(max_digits=5, decimal_places=2)
-    tenure = serializers.IntegerField()
+    loan_amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'))
+    interest_rate = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal('0'))
+    tenure = serializers.IntegerField(min_value=1, max_value=360)
+
+
+class BatchLoanEligibilitySerializer(serializers.Serializer):
+    applications = serializers.ListField(
+        child=LoanEligibilitySerializer(),
+        allow_empty=False,
+        max_length=settings.ELIGIBILITY_BATCH_MAX_SIZE,
+    )
+
+
+class BulkLoanApprovalSerializer(serializers.Serializer):
+    loan_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.APPROVAL_BATCH_MAX_SIZE,
+    )
+    pending = serializers.BooleanField(default=False)
+    # Resume a pending run after this loan_id, the next_cursor of the previous page
+    cursor = serializers.IntegerField(min_value=0, default=0)
+
+    def validate(self, data):
+        if bool(data.get('loan_ids')) == data['pending']:
+            raise serializers.ValidationError("Pass either loan_ids or pending, not both.")
+        if data['cursor'] and not data['pending']:
+            raise serializers.ValidationError("cursor only applies to pending runs.")
+        return data
+
+
+class CreditScenarioSerializer(serializers.Serializer):
+    loan_amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'), required=False)
+    tenure = serializers.IntegerField(min_value=1, max_value=360, required=False)
+    monthly_salary = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'), required=False)
+    approved_limit = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'), required=False)
+
+    def validate(self, data):
+        if ('loan_amount' in data) != ('tenure' in data):
+            raise serializers.ValidationError("An extra loan needs both loan_amount and tenure.")
+        return data
+
+
+class CreditSimulationSerializer(serializers.Serializer):
+    scenarios = serializers.ListField(
+        child=CreditScenarioSerializer(),
+        allow_empty=False,
+        max_length=settings.SIMULATION_MAX_SCENARIOS,
+    )
 
 
 class LoanCreationSerializer(serializers.Serializer):
@@ -55,4 +105,87 @@ class CustomerLoanSerializer(serializers.ModelSerializer):
                  'monthly_repayment', 'repayments_left']
     
     def get_repayments_left(self, obj):
-        return obj.repayments_left
\ No newline at end of file
+        return obj.repayments_left
+
+
+def _decimal_converter(field):
+    """Precompiled equivalent of DecimalField.to_representation for stored Decimals"""
+    if field.decimal_places is None or field.localize or not getattr(
+            field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING):
+        return field.to_representation
+
+    quantum = Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+    return convert
+
+
+# Field types whose to_representation is a no-op for values read from the database
+_PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField)
+
+
+class ValuesSerializer:
+    """Fast path for read-only list output of a ModelSerializer.
+
+    Reads plain tuples with values_list() and builds the same dicts the DRF
+    serializer would, without instantiating models or bound fields per row.
+    The conversion plan is compiled once from the serializer's own fields,
+    so the JSON output stays byte-identical to `serializer_class(many=True)`.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.lookups = []
+        self._plan = self._compile(serializer_class(), '')
+
+    def _compile(self, serializer, prefix):
+        plan = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.BaseSerializer):
+                if getattr(field, 'many', False):
+                    raise TypeError(f'{name}: nested many=True serializers are not supported')
+                plan.append((name, None, self._compile(field, f'{prefix}{field.source}__')))
+                continue
+            if field.source == '*' or '.' in field.source:
+                raise TypeError(f'{name}: only plain model fields are supported')
+
+            if isinstance(field, serializers.DecimalField):
+                convert = _decimal_converter(field)
+            elif isinstance(field, _PASSTHROUGH_FIELDS):
+                convert = None
+            else:
+                convert = field.to_representation
+            plan.append((name, len(self.lookups), convert))
+            self.lookups.append(prefix + field.source)
+        return plan
+
+    def values(self, queryset):
+        """Queryset of tuples in the order the plan expects"""
+        return queryset.values_list(*self.lookups)
+
+    def index(self, lookup):
+        return self.lookups.index(lookup)
+
+    def _build(self, plan, row):
+        data = {}
+        for name, index, convert in plan:
+            if index is None:
+                data[name] = self._build(convert, row)
+                continue
+            value = row[index]
+            data[name] = value if value is None or convert is None else convert(value)
+        return data
+
+    def to_representation(self, row):
+        return self._build(self._plan, row)
+
+    def serialize(self, rows):
+        build, plan = self._build, self._plan
+        return [build(plan, row) for row in rows]
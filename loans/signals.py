@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import CreditScoreSnapshot, Customer, Loan
+from .search import index_customers
+from .stats import record_customers, record_loans, record_score_changes
+from .utils import invalidate_credit_scores, refresh_credit_score_snapshots
+
+
+def rescore_on_commit(customer_ids):
+    """Refresh snapshots once the write commits, keeping the score histogram current"""
+    customer_ids = {customer_id for customer_id in customer_ids if customer_id is not None}
+    transaction.on_commit(lambda: refresh_credit_score_snapshots(
+        Customer.objects.filter(customer_id__in=customer_ids)  # type: ignore
+    ))
+
+
+@receiver(post_init, sender=Loan)
+def remember_loan_customer(sender, instance, **kwargs):
+    """Keep the loaded customer so reassigning a loan invalidates both customers"""
+    instance._loaded_customer_id = instance.__dict__.get('customer_id')
+    instance._loaded_loan_amount = instance.__dict__.get('loan_amount')
+
+
+@receiver(post_save, sender=Loan)
+@receiver(post_delete, sender=Loan)
+def loan_changed(sender, instance, **kwargs):
+    """Invalidate credit scores of the customers whose loan history changed"""
+    customer_ids = [instance.customer_id, getattr(instance, '_loaded_customer_id', None)]
+    invalidate_credit_scores(customer_ids)
+    rescore_on_commit(customer_ids)
+    instance._loaded_customer_id = instance.customer_id
+
+
+@receiver(post_save, sender=Loan)
+def loan_saved(sender, instance, created, **kwargs):
+    """Add the loan, or its change in amount, to the dashboard totals"""
+    # Views assign floats, the loaded value is a Decimal
+    amount = Decimal(str(instance.loan_amount))
+    previous = getattr(instance, '_loaded_loan_amount', None)
+    if created:
+        record_loans(1, amount)
+    elif previous is not None:
+        record_loans(0, amount - Decimal(str(previous)))
+    instance._loaded_loan_amount = amount
+
+
+@receiver(post_delete, sender=Loan)
+def loan_deleted(sender, instance, **kwargs):
+    record_loans(-1, -instance.loan_amount)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def customer_changed(sender, instance, **kwargs):
+    """Invalidate the credit score when the approved limit may have changed"""
+    invalidate_credit_scores([instance.customer_id])
+
+
+@receiver(post_save, sender=Customer)
+def customer_saved(sender, instance, created, **kwargs):
+    """Keep the search terms in step with the customer's name and phone"""
+    index_customers([instance])
+    if created:
+        record_customers(1)
+    rescore_on_commit([instance.customer_id])
+
+
+@receiver(pre_delete, sender=Customer)
+def customer_deleting(sender, instance, **kwargs):
+    """Drop the customer from the totals and its band before the snapshot cascades away"""
+    record_customers(-1)
+    score = (
+        CreditScoreSnapshot.objects  # type: ignore
+        .filter(customer_id=instance.customer_id)
+        .values_list('score', flat=True)
+        .first()
+    )
+    record_score_changes([(score, None)])
@@ -0,0 +1,113 @@
+"""Dashboard totals maintained incrementally instead of aggregated per page view.
+
+The dashboard_stats table holds a single row. Customer and loan writes
+adjust its counters with F() updates, and every credit score snapshot
+write moves the customer between the excellent/good/fair/poor bands, so
+the histogram always describes the persisted scores. Concurrent writers
+or raw SQL can still make the counters drift, which
+reconcile_dashboard_stats() repairs by recounting from the tables.
+"""
+from collections import Counter
+from decimal import Decimal
+
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Customer, DashboardStats, Loan
+
+SCORE_BANDS = [
+    ('excellent', Q(credit_score_snapshot__score__gte=800)),
+    ('good', Q(credit_score_snapshot__score__gte=700, credit_score_snapshot__score__lt=800)),
+    ('fair', Q(credit_score_snapshot__score__gte=600, credit_score_snapshot__score__lt=700)),
+    ('poor', Q(credit_score_snapshot__score__lt=600)),
+]
+
+STATS_FIELDS = [
+    'total_customers', 'total_loans', 'total_loan_amount', 'excellent', 'good', 'fair', 'poor',
+    'updated_at', 'reconciled_at',
+]
+
+
+def score_band(score):
+    if score is None:
+        return None
+    if score >= 800:
+        return 'excellent'
+    if score >= 700:
+        return 'good'
+    if score >= 600:
+        return 'fair'
+    return 'poor'
+
+
+def _apply(**deltas):
+    """Add deltas to the counters, a no-op until the row has been reconciled once"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    DashboardStats.objects.filter(pk=DashboardStats.SINGLETON_ID).update(  # type: ignore
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def record_customers(count):
+    _apply(total_customers=count)
+
+
+def record_loans(count, amount):
+    _apply(total_loans=count, total_loan_amount=Decimal(str(amount or 0)))
+
+
+def record_score_changes(changes):
+    """Move customers between score bands, `changes` is (old score, new score) pairs"""
+    deltas = Counter()
+    for old, new in changes:
+        old_band, new_band = score_band(old), score_band(new)
+        if old_band != new_band:
+            if old_band:
+                deltas[old_band] -= 1
+            if new_band:
+                deltas[new_band] += 1
+    _apply(**deltas)
+
+
+def reconcile_dashboard_stats(refresh_scores=True):
+    """Recount every counter from the tables, optionally refreshing score snapshots first"""
+    from .utils import refresh_credit_score_snapshots
+
+    if refresh_scores:
+        refresh_credit_score_snapshots()
+    # Customers and their snapshot bands in one pass, snapshots are one per customer
+    customers = Customer.objects.aggregate(  # type: ignore
+        total_customers=Count('pk'),
+        **{band: Count('credit_score_snapshot', filter=condition) for band, condition in SCORE_BANDS}
+    )
+    loans = Loan.objects.aggregate(total_loans=Count('pk'), total_loan_amount=Sum('loan_amount'))  # type: ignore
+    now = timezone.now()
+    stats = DashboardStats(
+        pk=DashboardStats.SINGLETON_ID,
+        total_loans=loans['total_loans'],
+        total_loan_amount=loans['total_loan_amount'] or 0,
+        updated_at=now,
+        reconciled_at=now,
+        **customers
+    )
+    DashboardStats.objects.bulk_create(  # type: ignore
+        [stats],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=STATS_FIELDS,
+    )
+    return stats
+
+
+def get_dashboard_stats():
+    """The stats row, recounted without rescoring if it is missing
+
+    Migration 0008 creates the row, so this only happens after it was
+    removed by hand or by a flush. Snapshots are counted as they are, the
+    reconcile_dashboard_stats command refreshes them.
+    """
+    stats = DashboardStats.objects.filter(pk=DashboardStats.SINGLETON_ID).first()  # type: ignore
+    return stats or reconcile_dashboard_stats(refresh_scores=False)
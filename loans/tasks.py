@@ -1,90 +1,502 @@
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from decimal import Decimal
-from datetime import datetime
+from functools import partial
+from django.db import transaction
+from itertools import chain
+from .frames import date_column, in_chunks, numeric_column, phone_numbers, text_column
 from .models import Customer, Loan
+from .metrics import INGESTED_ROWS, INGESTION_RATE, INGESTION_SECONDS
+from .readers import DEFAULT_CHUNK_SIZE, read_chunks
+from .search import index_customers_by_phone
+from .stats import record_customers, record_loans
+from .utils import invalidate_credit_scores, refresh_credit_score_snapshots
+from .validation import validate_customer_upload, validate_loan_upload
+import django
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
 
-def ingest_customer_data():
-    """Function to ingest customer data from Excel file"""
+CUSTOMER_COLUMNS = [
+    'Customer ID', 'First Name', 'Last Name', 'Age', 'Phone Number',
+    'Monthly Salary', 'Approved Limit'
+]
+
+LOAN_COLUMNS = [
+    'Loan ID', 'Customer ID', 'Loan Amount', 'Tenure', 'Interest Rate',
+    'Monthly payment', 'EMIs paid on Time', 'Date of Approval', 'End Date'
+]
+
+
+@dataclass
+class IngestionReport:
+    """Outcome of an ingestion run with a per-row error report"""
+    label: str
+    created: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    error: str = ''
+
+    @property
+    def rejected(self):
+        return len(self.errors)
+
+    def reject(self, frame, mask, reason, id_column):
+        """Record the rows selected by mask as rejected and drop them from the frame"""
+        rejected = frame[mask]
+        for index, record_id in zip(rejected.index, rejected[id_column]):
+            self.errors.append({
+                'row': int(index) + 1,
+                'id': None if pd.isna(record_id) else int(record_id),
+                'error': reason,
+            })
+        return frame[~mask]
+
+    @property
+    def processed(self):
+        return self.created + self.skipped + self.rejected
+
+    def add_error(self, index, reason, record_id=None):
+        """Record a single rejected row"""
+        self.errors.append({'row': int(index) + 1, 'id': record_id, 'error': reason})
+
+    def as_dict(self):
+        return {
+            'label': self.label,
+            'created': self.created,
+            'skipped': self.skipped,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'error': self.error,
+        }
+
+    def __str__(self):
+        if self.error:
+            return self.error
+        message = f"Successfully ingested {self.created} {self.label}"
+        if self.skipped:
+            message += f", {self.skipped} duplicates skipped"
+        if self.errors:
+            message += f", {self.rejected} rows rejected"
+        return message
+
+
+def _to_decimal(value):
+    return Decimal(str(value))
+
+
+def prepare_customers(df, report):
+    """Validate and convert customer columns, rejecting invalid rows in bulk"""
+    frame = pd.DataFrame({
+        'customer_id': numeric_column(df, 'Customer ID'),
+        'first_name': text_column(df, 'First Name'),
+        'last_name': text_column(df, 'Last Name'),
+        'age': numeric_column(df, 'Age'),
+        'phone_number': phone_numbers(df['Phone Number']),
+        'monthly_salary': numeric_column(df, 'Monthly Salary').round(2),
+        'approved_limit': numeric_column(df, 'Approved Limit').round(2),
+    }, index=df.index)
+
+    numeric = ['customer_id', 'age', 'monthly_salary', 'approved_limit']
+    frame = report.reject(frame, frame[numeric].isna().any(axis=1), 'Missing or non-numeric value', 'customer_id')
+    frame = report.reject(
+        frame,
+        (frame['first_name'] == '') | (frame['last_name'] == '') | (frame['phone_number'] == ''),
+        'Missing name or phone number', 'customer_id'
+    )
+    frame = report.reject(
+        frame,
+        (frame['first_name'].str.len() > 100) | (frame['last_name'].str.len() > 100) |
+        (frame['phone_number'].str.len() > 15),
+        'Name or phone number too long', 'customer_id'
+    )
+    frame = report.reject(frame, ~frame['age'].between(18, 100), 'Age must be between 18 and 100', 'customer_id')
+    frame = report.reject(
+        frame,
+        (frame['monthly_salary'] <= 0) | (frame['approved_limit'] <= 0),
+        'Monthly salary and approved limit must be positive', 'customer_id'
+    )
+    return frame.astype({'customer_id': 'int64', 'age': 'int64'})
+
+
+def prepare_loans(df, report):
+    """Validate and convert loan columns, rejecting invalid rows in bulk"""
+    frame = pd.DataFrame({
+        'loan_id': numeric_column(df, 'Loan ID'),
+        'customer_id': numeric_column(df, 'Customer ID'),
+        'loan_amount': numeric_column(df, 'Loan Amount').round(2),
+        'tenure': numeric_column(df, 'Tenure'),
+        'interest_rate': numeric_column(df, 'Interest Rate').round(2),
+        'monthly_repayment': numeric_column(df, 'Monthly payment').round(2),
+        'emis_paid_on_time': numeric_column(df, 'EMIs paid on Time'),
+        'start_date': date_column(df, 'Date of Approval'),
+        'end_date': date_column(df, 'End Date'),
+    }, index=df.index)
+
+    frame = report.reject(frame, frame.isna().any(axis=1), 'Missing or invalid value', 'loan_id')
+    frame = report.reject(frame, ~frame['tenure'].between(1, 360), 'Tenure must be between 1 and 360 months', 'loan_id')
+    frame = report.reject(
+        frame,
+        (frame['loan_amount'] <= 0) | (frame['monthly_repayment'] <= 0) |
+        (frame['interest_rate'] <= 0) | (frame['interest_rate'] > 100),
+        'Amounts and interest rate must be positive', 'loan_id'
+    )
+    frame = report.reject(
+        frame,
+        (frame['emis_paid_on_time'] < 0) | (frame['emis_paid_on_time'] > frame['tenure']),
+        'EMIs paid on time cannot exceed total tenure', 'loan_id'
+    )
+    frame = report.reject(frame, frame['start_date'] >= frame['end_date'], 'End date must be after start date', 'loan_id')
+
+    frame = frame.astype({'loan_id': 'int64', 'customer_id': 'int64', 'tenure': 'int64', 'emis_paid_on_time': 'int64'})
+    frame['start_date'] = frame['start_date'].dt.date
+    frame['end_date'] = frame['end_date'].dt.date
+    return frame
+
+
+def _record_batch(kind, rows, seconds):
+    INGESTED_ROWS.inc(rows, kind=kind)
+    INGESTION_SECONDS.inc(seconds, kind=kind)
+    if seconds > 0:
+        INGESTION_RATE.set(rows / seconds, kind=kind)
+
+
+def _conflict_key(model, objects):
+    """Fields that identify a row inserted by this batch, None when rows cannot conflict"""
+    pk_name = model._meta.pk.name
+    if all(getattr(obj, pk_name) is not None for obj in objects):
+        return (pk_name, 'phone_number') if model is Customer else (pk_name, 'customer_id')
+    # Uploaded rows get their primary key from the database, only phone numbers are unique
+    return ('phone_number',) if model is Customer else None
+
+
+def _stored_keys(model, fields, objects):
+    """Key tuples of `objects` that are present in the table"""
+    found = set()
+    for chunk in in_chunks({getattr(obj, fields[0]) for obj in objects}):
+        found.update(model.objects.filter(**{f'{fields[0]}__in': chunk}).values_list(*fields))  # type: ignore
+    return found
+
+
+def _bulk_insert(model, frame, build, batch_size, report, after_batch=None):
+    """Insert prepared rows in batches, each batch in its own transaction
+
+    ignore_conflicts silently drops rows that collide with ones written
+    since validation, e.g. by a concurrent import job. Rows are counted as
+    created only if their key appears with this insert, the others are
+    reported as errors.
+    """
+    pk_name = model._meta.pk.name
+    for offset in range(0, len(frame), batch_size):
+        start = time.perf_counter()
+        batch = frame.iloc[offset:offset + batch_size]
+        objects = [build(record) for record in batch.to_dict('records')]
+        key = _conflict_key(model, objects)
+        with transaction.atomic():
+            before = _stored_keys(model, key, objects) if key else set()
+            model.objects.bulk_create(  # type: ignore
+                objects,
+                batch_size=batch_size,
+                ignore_conflicts=True
+            )
+            after = _stored_keys(model, key, objects) if key else None
+
+        inserted = []
+        for index, obj in zip(batch.index, objects):
+            obj_key = tuple(getattr(obj, name) for name in key) if key else None
+            if key is None or (obj_key in after and obj_key not in before):
+                inserted.append(obj)
+            else:
+                report.add_error(index, 'Conflicts with a row stored by another import', getattr(obj, pk_name))
+        report.created += len(inserted)
+        _record_batch(report.label, len(inserted), time.perf_counter() - start)
+        if not inserted:
+            continue
+        # bulk_create skips model signals, so invalidate scores explicitly
+        invalidate_credit_scores({obj.customer_id for obj in inserted})
+        if after_batch is not None:
+            after_batch(inserted)
+
+
+def _customers_inserted(objects):
+    # ignore_conflicts leaves uploaded customers without IDs, find them by phone
+    phone_numbers = [obj.phone_number for obj in objects]
+    index_customers_by_phone(phone_numbers)
+    record_customers(len(objects))
+    refresh_credit_score_snapshots(Customer.objects.filter(phone_number__in=phone_numbers))  # type: ignore
+
+
+def _loans_inserted(objects):
+    record_loans(len(objects), sum((obj.loan_amount for obj in objects), Decimal(0)))
+    refresh_credit_score_snapshots(
+        Customer.objects.filter(customer_id__in={obj.customer_id for obj in objects})  # type: ignore
+    )
+
+
+def _build_customer(record):
+    # Uploaded rows have no Customer ID and get one assigned by the database
+    return Customer(
+        customer_id=record.get('customer_id'),
+        first_name=record['first_name'],
+        last_name=record['last_name'],
+        age=record['age'],
+        phone_number=record['phone_number'],
+        monthly_salary=_to_decimal(record['monthly_salary']),
+        approved_limit=_to_decimal(record['approved_limit']),
+        current_debt=_to_decimal(record.get('current_debt', 0)),
+    )
+
+
+def _build_loan(record):
+    return Loan(
+        loan_id=record.get('loan_id'),
+        customer_id=record['customer_id'],
+        loan_amount=_to_decimal(record['loan_amount']),
+        tenure=record['tenure'],
+        interest_rate=_to_decimal(record['interest_rate']),
+        monthly_repayment=_to_decimal(record['monthly_repayment']),
+        emis_paid_on_time=record['emis_paid_on_time'],
+        start_date=record['start_date'],
+        end_date=record['end_date'],
+    )
+
+
+class CustomerWriter:
+    """Writes prepared customer frames, tracking the IDs and phones seen so far"""
+
+    def __init__(self, report, batch_size=DEFAULT_BATCH_SIZE):
+        self.report = report
+        self.batch_size = batch_size
+        self.known_ids = set(Customer.objects.values_list('customer_id', flat=True))  # type: ignore
+        self.seen_phones = set()
+
+    def write(self, frame):
+        report = self.report
+
+        # Existing customers are left untouched, like get_or_create
+        present = frame['customer_id'].isin(self.known_ids) | frame['customer_id'].duplicated()
+        report.skipped += int(present.sum())
+        frame = frame[~present]
+
+        taken = set(self.seen_phones)
+        for phones in in_chunks(frame['phone_number'].unique()):
+            taken.update(Customer.objects.filter(phone_number__in=phones).values_list('phone_number', flat=True))  # type: ignore
+        frame = report.reject(
+            frame,
+            frame['phone_number'].isin(taken) | frame['phone_number'].duplicated(),
+            'Phone number already exists', 'customer_id'
+        )
+
+        _bulk_insert(Customer, frame, _build_customer, self.batch_size, report, _customers_inserted)
+        self.known_ids.update(frame['customer_id'])
+        self.seen_phones.update(frame['phone_number'])
+
+
+class LoanWriter:
+    """Writes prepared loan frames for customers that already exist"""
+
+    def __init__(self, report, batch_size=DEFAULT_BATCH_SIZE):
+        self.report = report
+        self.batch_size = batch_size
+        self.known_customers = set(Customer.objects.values_list('customer_id', flat=True))  # type: ignore
+        self.known_loans = set(Loan.objects.values_list('loan_id', flat=True))  # type: ignore
+
+    def write(self, frame):
+        report = self.report
+
+        present = frame['loan_id'].isin(self.known_loans) | frame['loan_id'].duplicated()
+        report.skipped += int(present.sum())
+        frame = frame[~present]
+
+        frame = report.reject(frame, ~frame['customer_id'].isin(self.known_customers), 'Customer not found', 'loan_id')
+
+        _bulk_insert(Loan, frame, _build_loan, self.batch_size, report, _loans_inserted)
+        self.known_loans.update(frame['loan_id'])
+
+
+def ingest_customer_frames(frames, batch_size=DEFAULT_BATCH_SIZE, report=None):
+    """Ingest customer rows from DataFrames with one ID lookup and bulk inserts"""
+    report = report or IngestionReport('customers')
+    writer = CustomerWriter(report, batch_size)
+    for df in frames:
+        writer.write(prepare_customers(df, report))
+    logger.info(f"Ingested {report.created} customers, skipped {report.skipped}, rejected {report.rejected}")
+    return report
+
+
+def ingest_loan_frames(frames, batch_size=DEFAULT_BATCH_SIZE, report=None):
+    """Ingest loan rows from DataFrames with batched customer lookups and bulk inserts"""
+    report = report or IngestionReport('loans')
+    writer = LoanWriter(report, batch_size)
+    for df in frames:
+        writer.write(prepare_loans(df, report))
+    logger.info(f"Ingested {report.created} loans, skipped {report.skipped}, rejected {report.rejected}")
+    return report
+
+
+def _missing_columns(df, columns):
+    return [col for col in columns if col not in df.columns]
+
+
+def _ingest_file(path, columns, ingest_frames, report, batch_size, chunk_size, file_format):
+    """Stream a file chunk by chunk into an ingestion pipeline"""
+    chunks = read_chunks(path, chunk_size, file_format)
+    first = next(chunks, None)
+    if first is None:
+        return report
+    # Check for missing columns
+    missing = _missing_columns(first, columns)
+    if missing:
+        report.error = f"Error: Missing columns in Excel: {', '.join(missing)}"
+        return report
+    return ingest_frames(chain([first], chunks), batch_size, report)
+
+
+def ingest_customer_data(path='customer_data.xlsx', batch_size=DEFAULT_BATCH_SIZE,
+                         chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Function to ingest customer data from an Excel, CSV or Parquet file"""
+    report = IngestionReport('customers')
     try:
-        df = pd.read_excel('customer_data.xlsx')
-        customers_created = 0
-        
-        for _, row in df.iterrows():
-            try:
-                customer, created = Customer.objects.get_or_create(  # type: ignore
-                    customer_id=row['Customer ID'],
-                    defaults={
-                        'first_name': row['First Name'],
-                        'last_name': row['Last Name'],
-                        'age': int(row['Age']),
-                        'phone_number': str(row['Phone Number']),
-                        'monthly_salary': Decimal(str(row['Monthly Salary'])),
-                        'approved_limit': Decimal(str(row['Approved Limit'])),
-                        'current_debt': 0,
-                    }
-                )
-                if created:
-                    customers_created += 1
-                    logger.info(f"Created customer: {customer.first_name} {customer.last_name}")
-            except Exception as e:
-                logger.error(f"Error creating customer {row['Customer ID']}: {str(e)}")
-                continue
-        
-        return f"Successfully ingested {customers_created} customers"
+        return _ingest_file(
+            path, CUSTOMER_COLUMNS, ingest_customer_frames, report,
+            batch_size, chunk_size, file_format
+        )
     except Exception as e:
         logger.error(f"Error ingesting customer data: {str(e)}")
-        return f"Error ingesting customer data: {str(e)}"
+        report.error = f"Error ingesting customer data: {str(e)}"
+        return report
 
 
-def ingest_loan_data():
-    """Function to ingest loan data from Excel file"""
-    required_columns = [
-        'Loan ID', 'Customer ID', 'Loan Amount', 'Tenure', 'Interest Rate',
-        'Monthly payment', 'EMIs paid on Time', 'Date of Approval', 'End Date'
-    ]
+def ingest_loan_data(path='loan_data.xlsx', batch_size=DEFAULT_BATCH_SIZE,
+                     chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Function to ingest loan data from an Excel, CSV or Parquet file"""
+    report = IngestionReport('loans')
     try:
-        df = pd.read_excel('loan_data.xlsx')
-        # Check for missing columns
-        missing = [col for col in required_columns if col not in df.columns]
-        if missing:
-            return f"Error: Missing columns in Excel: {', '.join(missing)}"
-        loans_created = 0
-        for _, row in df.iterrows():
-            try:
-                customer = Customer.objects.get(customer_id=row['Customer ID'])  # type: ignore
-                # Convert date strings to datetime objects
-                start_date = pd.to_datetime(row['Date of Approval']).date()  # type: ignore
-                end_date = pd.to_datetime(row['End Date']).date()  # type: ignore
-                # Auto-round decimals to 2 places
-                interest_rate = round(float(row['Interest Rate']), 2)
-                monthly_payment = round(float(row['Monthly payment']), 2)
-                loan, created = Loan.objects.get_or_create(  # type: ignore
-                    loan_id=row['Loan ID'],
-                    defaults={
-                        'customer': customer,
-                        'loan_amount': Decimal(str(row['Loan Amount'])),
-                        'tenure': int(row['Tenure']),
-                        'interest_rate': Decimal(str(interest_rate)),
-                        'monthly_repayment': Decimal(str(monthly_payment)),
-                        'emis_paid_on_time': int(row['EMIs paid on Time']),
-                        'start_date': start_date,
-                        'end_date': end_date,
-                    }
-                )
-                if created:
-                    loans_created += 1
-                    logger.info(f"Created loan: {loan.loan_id} for customer {customer.first_name}")
-            except Customer.DoesNotExist:  # type: ignore
-                logger.warning(f"Customer {row['Customer ID']} not found for loan {row['Loan ID']}")
-                continue
-            except Exception as e:
-                logger.error(f"Error creating loan {row['Loan ID']}: {str(e)}")
-                continue
-        return f"Successfully ingested {loans_created} loans"
+        return _ingest_file(
+            path, LOAN_COLUMNS, ingest_loan_frames, report,
+            batch_size, chunk_size, file_format
+        )
     except Exception as e:
         logger.error(f"Error ingesting loan data: {str(e)}")
-        return f"Error ingesting loan data: {str(e)}"
\ No newline at end of file
+        report.error = f"Error ingesting loan data: {str(e)}"
+        return report
+
+
+PIPELINES = {
+    'customers': (CUSTOMER_COLUMNS, prepare_customers, CustomerWriter),
+    'loans': (LOAN_COLUMNS, prepare_loans, LoanWriter),
+}
+
+
+def _prepare_partition(kind, df):
+    """Process pool entry point: validate and convert one partition of rows"""
+    started = time.perf_counter()
+    report = IngestionReport(kind)
+    frame = PIPELINES[kind][1](df, report)
+    return {
+        'worker': os.getpid(),
+        'frame': frame,
+        'errors': report.errors,
+        'rows': len(df),
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _bounded_map(pool, func, items, window):
+    """Ordered pool.map that keeps at most `window` partitions in flight"""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def ingest_data_parallel(kind, path, workers, batch_size=DEFAULT_BATCH_SIZE,
+                         chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Validate partitions of a file in a process pool and write them in batches.
+
+    Returns the ingestion report and per-worker throughput statistics.
+    """
+    columns, _, writer_class = PIPELINES[kind]
+    report = IngestionReport(kind)
+    stats = {}
+    try:
+        chunks = read_chunks(path, chunk_size, file_format)
+        first = next(chunks, None)
+        if first is None:
+            return report, stats
+        missing = _missing_columns(first, columns)
+        if missing:
+            report.error = f"Error: Missing columns in Excel: {', '.join(missing)}"
+            return report, stats
+        
+        writer = writer_class(report, batch_size)
+        # Workers only convert rows, so they need Django configured but no DB
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            partitions = _bounded_map(pool, partial(_prepare_partition, kind), chain([first], chunks), workers * 2)
+            for result in partitions:
+                report.errors.extend(result['errors'])
+                writer.write(result['frame'])
+                worker = stats.setdefault(result['worker'], {'partitions': 0, 'rows': 0, 'seconds': 0.0})
+                worker['partitions'] += 1
+                worker['rows'] += result['rows']
+                worker['seconds'] += result['seconds']
+    except Exception as e:
+        logger.error(f"Error ingesting {kind} data: {str(e)}")
+        report.error = f"Error ingesting {kind} data: {str(e)}"
+    return report, stats
+
+
+UNRECOGNIZED_UPLOAD = 'Unrecognized Excel file format. Found columns: {columns}. Please check the column headers.'
+
+
+def detect_upload_kind(columns):
+    """Determine whether uploaded rows hold customers or loans from the headers"""
+    if 'First Name' in columns:
+        return 'customers'
+    if 'Loan Amount' in columns and 'Customer ID' in columns:
+        return 'loans'
+    return None
+
+
+def _import_customer_rows(df, report):
+    """Validate one chunk of uploaded customer rows at once and bulk insert the valid ones"""
+    validator = validate_customer_upload(df)
+    report.errors.extend(validator.errors())
+    _bulk_insert(Customer, validator.valid_rows(), _build_customer, DEFAULT_BATCH_SIZE, report, _customers_inserted)
+
+
+def _import_loan_rows(df, report):
+    """Validate one chunk of uploaded loan rows at once and bulk insert the valid ones"""
+    validator = validate_loan_upload(df)
+    report.errors.extend(validator.errors())
+    _bulk_insert(Loan, validator.valid_rows(), _build_loan, DEFAULT_BATCH_SIZE, report, _loans_inserted)
+
+
+def import_upload(source, progress=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Import an uploaded customer or loan file, reporting progress after each chunk"""
+    chunks = read_chunks(source, chunk_size)
+    first = next(chunks, None)
+    columns = list(first.columns) if first is not None else []
+    kind = detect_upload_kind(columns)
+    if kind is None:
+        report = IngestionReport('rows')
+        report.error = UNRECOGNIZED_UPLOAD.format(columns=columns)
+        return report
+    
+    report = IngestionReport(kind)
+    import_rows = _import_customer_rows if kind == 'customers' else _import_loan_rows
+    for chunk in chain([first], chunks):
+        import_rows(chunk, report)
+        if progress:
+            progress(report)
+    logger.info(f"Imported upload: {report}")
+    return report
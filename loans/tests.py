@@ -1,9 +1,63 @@
-from django.test import TestCase
+from django.http import HttpResponse
+from django.db import connection, connections
+from django.db.models.signals import post_delete, pre_delete
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
-from decimal import Decimal
-from .models import Customer, Loan
-from .utils import calculate_credit_score, calculate_monthly_installment
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from datetime import date, timedelta
+from pathlib import Path
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from credit_system.fastboot import ensure_database, restore_snapshot, schema_fingerprint
+from credit_system.importprofile import format_report, profile_imports
+from .cache import cache_enabled, cache_stats, get_cache, reset_cache_stats
+from .deletion import delete_customers
+from .jobs import STALE_JOB_MESSAGE, run_import_job, sweep_stale_jobs
+from .models import (
+    Customer, Loan, CreditScoreSnapshot, CustomerSearchTerm, DashboardStats, ImportJob, LoanApprovalDecision
+)
+from .portfolio import pending_loans, reevaluate_portfolio
+from .metrics import Counter, Gauge, Histogram, Registry
+from .profiling import ProfilingMiddleware, profile_stats, query_budget, reset_profile_stats
+from .readers import read_chunks
+from .search import search_customer_ids, search_customers
+from .stats import get_dashboard_stats, reconcile_dashboard_stats
+from .serializers import CustomerSerializer, LoanDetailSerializer, ValuesSerializer
+from .tasks import (
+    CUSTOMER_COLUMNS, CustomerWriter, IngestionReport, ingest_customer_data, ingest_customer_frames,
+    ingest_loan_data, ingest_loan_frames, prepare_customers
+)
+from .validation import validate_customer_upload, validate_loan_upload
+from .utils import (
+    amortization_schedule, annuity_factor, calculate_credit_score,
+    calculate_monthly_installment, calculate_monthly_installment_exact,
+    calculate_monthly_installments, check_loan_eligibility, determine_loan_approval, get_cached_credit_score, get_cached_loan_approval,
+    get_credit_score, get_credit_score_components, iter_amortization,
+    monthly_repayment_mismatches, project_outstanding_balance,
+    refresh_credit_score_snapshots, score_customers
+)
+
+# The credit cache is bypassed without a shared backend, cache tests opt into a local one
+LOCAL_CREDIT_CACHE = override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'credit': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'credit-tests'},
+    },
+    CREDIT_CACHE_SINGLE_PROCESS=True,
+)
 
 
 class CreditSystemTestCase(TestCase):
@@ -84,3 +138,1327 @@ class CreditSystemTestCase(TestCase):
         emi = calculate_monthly_installment(100000, 12, 12.0)
         self.assertIsInstance(emi, float)
         self.assertGreater(emi, 0)
+
+
+class CreditScoreQueryTestCase(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='Score',
+            last_name='User',
+            age=35,
+            phone_number='5550000001',
+            monthly_salary=80000,
+            approved_limit=1000000
+        )
+        today = date.today()
+        Loan.objects.create(  # type: ignore
+            customer=self.customer, loan_amount=200000, tenure=12,
+            interest_rate=10, monthly_repayment=17583, emis_paid_on_time=12,
+            start_date=date(today.year, 1, 1), end_date=today + timedelta(days=365)
+        )
+        Loan.objects.create(  # type: ignore
+            customer=self.customer, loan_amount=300000, tenure=24,
+            interest_rate=12, monthly_repayment=14122, emis_paid_on_time=12,
+            start_date=date(2020, 1, 1), end_date=date(2022, 1, 1)
+        )
+
+    def test_credit_score_uses_single_query(self):
+        """All score components are fetched with one aggregate query"""
+        with self.assertNumQueries(1):
+            score = calculate_credit_score(self.customer)
+        # 300 + 24/36 * 220 + 2 * 20 + 1 * 30 + 0.5 * 50 = 541.67
+        self.assertEqual(score, 541)
+
+    def test_credit_score_debt_utilization_penalty(self):
+        """Active principal above 60% of the approved limit costs 50 points"""
+        self.customer.approved_limit = Decimal('300000')
+        self.assertEqual(calculate_credit_score(self.customer), 491)
+
+    def test_credit_score_components(self):
+        """Components match the loan history"""
+        components = get_credit_score_components(self.customer)
+        self.assertEqual(components['total_emis'], 36)
+        self.assertEqual(components['paid_on_time'], 24)
+        self.assertEqual(components['num_loans'], 2)
+        self.assertEqual(components['current_year_loans'], 1)
+        self.assertEqual(components['total_loan_amount'], Decimal('500000'))
+        self.assertEqual(components['current_debt'], Decimal('200000'))
+
+
+class BulkCreditScoreTestCase(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.customers = []
+        # (approved_limit, [(amount, tenure, paid, start, end)])
+        profiles = [
+            (1000000, []),
+            (1000000, [(200000, 12, 12, date(today.year, 1, 1), today + timedelta(days=30))]),
+            (250000, [(200000, 24, 6, date(2021, 5, 1), today + timedelta(days=90)),
+                      (150000, 12, 12, date(2019, 1, 1), date(2020, 1, 1))]),
+            (500000, [(300000, 36, 30, date(today.year, 2, 1), today + timedelta(days=700)),
+                      (5000000, 60, 60, date(2015, 1, 1), date(2020, 1, 1))]),
+            # Exactly 80% utilization falls in the 60-80% band
+            (500000, [(400000, 12, 0, date(2022, 1, 1), today + timedelta(days=10))]),
+        ]
+        for index, (limit, loans) in enumerate(profiles):
+            customer = Customer.objects.create(  # type: ignore
+                first_name='Bulk', last_name=str(index), age=30,
+                phone_number=f'555100{index:04d}',
+                monthly_salary=50000, approved_limit=limit
+            )
+            for amount, tenure, paid, start, end in loans:
+                Loan.objects.create(  # type: ignore
+                    customer=customer, loan_amount=amount, tenure=tenure,
+                    interest_rate=10, monthly_repayment=1000,
+                    emis_paid_on_time=paid, start_date=start, end_date=end
+                )
+            self.customers.append(customer)
+
+    def test_bulk_scores_match_single_customer_scores(self):
+        """Vectorized scores are identical to calculate_credit_score"""
+        with self.assertNumQueries(2):
+            scores = score_customers(Customer.objects.all())  # type: ignore
+        expected = {c.customer_id: calculate_credit_score(c) for c in self.customers}
+        self.assertEqual(scores, expected)
+        self.assertEqual(scores[self.customers[0].customer_id], 650)
+
+    def test_bulk_scores_empty_queryset(self):
+        """Scoring an empty queryset returns no scores"""
+        self.assertEqual(score_customers(Customer.objects.none()), {})  # type: ignore
+
+
+class CreditScoreSnapshotTestCase(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='Snap', last_name='Shot', age=40,
+            phone_number='5552000001', monthly_salary=60000, approved_limit=1000000
+        )
+        self.other = Customer.objects.create(  # type: ignore
+            first_name='Other', last_name='Customer', age=40,
+            phone_number='5552000002', monthly_salary=60000, approved_limit=1000000
+        )
+
+    def create_loan(self, customer, amount=200000):
+        return Loan.objects.create(  # type: ignore
+            customer=customer, loan_amount=amount, tenure=12,
+            interest_rate=10, monthly_repayment=17583, emis_paid_on_time=6,
+            start_date=date(2021, 1, 1), end_date=date.today() + timedelta(days=60)
+        )
+
+    def test_snapshot_served_in_one_query(self):
+        """A fresh snapshot is read back without recomputing the score"""
+        self.create_loan(self.customer)
+        score = get_credit_score(self.customer)
+        self.assertEqual(score, calculate_credit_score(self.customer))
+        with self.assertNumQueries(1):
+            self.assertEqual(get_credit_score(self.customer), score)
+        snapshot = CreditScoreSnapshot.objects.get(customer=self.customer)  # type: ignore
+        self.assertEqual(snapshot.num_loans, 1)
+        self.assertEqual(snapshot.current_debt, Decimal('200000'))
+
+    def test_loan_write_invalidates_snapshot(self):
+        """Saving or deleting a loan forces the next read to recompute"""
+        self.assertEqual(get_credit_score(self.customer), 650)
+        loan = self.create_loan(self.customer)
+        self.assertTrue(CreditScoreSnapshot.objects.get(customer=self.customer).is_stale)  # type: ignore
+        self.assertEqual(get_credit_score(self.customer), calculate_credit_score(self.customer))
+        loan.delete()
+        self.assertEqual(get_credit_score(self.customer), 650)
+
+    def test_reassigned_loan_invalidates_both_customers(self):
+        """Moving a loan to another customer invalidates the old and new owner"""
+        loan = self.create_loan(self.customer)
+        refresh_credit_score_snapshots()
+        loan = Loan.objects.get(pk=loan.pk)  # type: ignore
+        loan.customer = self.other
+        loan.save()
+        stale = set(
+            CreditScoreSnapshot.objects.filter(is_stale=True).values_list('customer_id', flat=True)  # type: ignore
+        )
+        self.assertEqual(stale, {self.customer.customer_id, self.other.customer_id})
+
+    def test_snapshot_rolls_over_with_the_date(self):
+        """Snapshots computed on an earlier day are not served"""
+        self.create_loan(self.customer)
+        refresh_credit_score_snapshots(today=date.today() - timedelta(days=1))
+        get_credit_score(self.customer)
+        snapshot = CreditScoreSnapshot.objects.get(customer=self.customer)  # type: ignore
+        self.assertEqual(snapshot.as_of, date.today())
+
+    def test_refresh_command(self):
+        """The scheduled refresh recomputes every customer's snapshot"""
+        self.create_loan(self.customer)
+        call_command('refresh_credit_scores', stdout=io.StringIO())
+        scores = dict(CreditScoreSnapshot.objects.values_list('customer_id', 'score'))  # type: ignore
+        self.assertEqual(scores, {
+            self.customer.customer_id: calculate_credit_score(self.customer),
+            self.other.customer_id: 650,
+        })
+
+
+@LOCAL_CREDIT_CACHE
+class CreditCacheTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        reset_cache_stats()
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='Cache', last_name='User', age=30,
+            phone_number='5553000001', monthly_salary=100000, approved_limit=1000000
+        )
+        self.loan = Loan.objects.create(  # type: ignore
+            customer=self.customer, loan_amount=100000, tenure=12,
+            interest_rate=10, monthly_repayment=8792, emis_paid_on_time=12,
+            start_date=date(2020, 1, 1), end_date=date(2021, 1, 1)
+        )
+
+    def test_repeated_scores_hit_the_cache(self):
+        """The second lookup is served from the cache without queries"""
+        score = get_cached_credit_score(self.customer)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_credit_score(self.customer), score)
+        self.assertEqual(cache_stats()['score'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_loan_write_bumps_customer_version(self):
+        """Writing a loan makes cached scores and decisions unreachable"""
+        before = get_cached_credit_score(self.customer)
+        get_cached_loan_approval(self.customer, self.loan)
+        self.loan.emis_paid_on_time = 0
+        self.loan.save()
+        after = get_cached_credit_score(self.customer)
+        self.assertLess(after, before)
+        self.assertEqual(after, calculate_credit_score(self.customer))
+        self.assertEqual(get_cached_loan_approval(self.customer, self.loan)['credit_score'], after)
+        self.assertEqual(cache_stats()['approval']['misses'], 2)
+
+    def test_process_local_cache_needs_opt_in(self):
+        """Without CREDIT_CACHE_SINGLE_PROCESS a LocMemCache is bypassed, never served stale"""
+        with override_settings(CREDIT_CACHE_SINGLE_PROCESS=False):
+            self.assertFalse(cache_enabled())
+            get_cached_credit_score(self.customer)
+            with self.assertNumQueries(1):
+                get_cached_credit_score(self.customer)
+            self.assertEqual(cache_stats(), {})
+        with override_settings(CACHES={'credit': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.assertFalse(cache_enabled())
+
+    def test_loan_detail_scores_once(self):
+        """The loan detail page reuses the cached score for the approval decision"""
+        response = self.client.get(f'/loans/loans/{self.loan.loan_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cache_stats()['score'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+        self.assertEqual(
+            response.context['approval_status']['credit_score'],
+            response.context['credit_score']
+        )
+
+
+class BulkIngestionTestCase(TestCase):
+    def test_ingest_sample_workbooks(self):
+        """The bundled workbooks load with duplicate loan IDs skipped"""
+        customers = ingest_customer_data(batch_size=100)
+        loans = ingest_loan_data(batch_size=100)
+        self.assertEqual((customers.created, customers.rejected), (300, 0))
+        self.assertEqual((loans.created, loans.skipped, loans.rejected), (753, 29, 0))
+        self.assertEqual(Loan.objects.count(), 753)  # type: ignore
+        self.assertEqual(str(customers), 'Successfully ingested 300 customers')
+        
+        # Re-running is idempotent
+        self.assertEqual(ingest_customer_data().skipped, 300)
+        self.assertEqual(ingest_loan_data().created, 0)
+
+    def test_parallel_ingest_command(self):
+        """Rows validated in a process pool are written like the serial path"""
+        out = io.StringIO()
+        call_command('ingest_data', workers=2, batch_size=100, chunk_size=128, stdout=out)
+        self.assertIn('Loan data: Successfully ingested 753 loans, 29 duplicates skipped', out.getvalue())
+        self.assertIn('rows/s', out.getvalue())
+        self.assertEqual(Customer.objects.count(), 300)  # type: ignore
+        self.assertEqual(Loan.objects.count(), 753)  # type: ignore
+
+    def test_ingest_reports_rejected_rows(self):
+        """Invalid rows are rejected with their row number and reason"""
+        customers = pd.DataFrame({
+            'Customer ID': [1, 2, 3, 4],
+            'First Name': ['Ann', 'Bob', '', 'Dan'],
+            'Last Name': ['Lee', 'Ray', 'Kim', 'Fox'],
+            'Age': [30, 12, 40, 50],
+            'Phone Number': [5550001, 5550002, 5550003, 5550001],
+            'Monthly Salary': [50000, 40000, 30000, 20000],
+            'Approved Limit': [1800000, 1400000, 1100000, 700000],
+        })
+        report = ingest_customer_frames([customers])
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors, [
+            {'row': 3, 'id': 3, 'error': 'Missing name or phone number'},
+            {'row': 2, 'id': 2, 'error': 'Age must be between 18 and 100'},
+            {'row': 4, 'id': 4, 'error': 'Phone number already exists'},
+        ])
+        
+        loans = pd.DataFrame({
+            'Loan ID': [10, 11, 12],
+            'Customer ID': [1, 1, 99],
+            'Loan Amount': [100000, 100000, 100000],
+            'Tenure': [12, 12, 12],
+            'Interest Rate': [10.5, 10.5, 10.5],
+            'Monthly payment': [8815, 8815, 8815],
+            'EMIs paid on Time': [12, 13, 0],
+            'Date of Approval': ['2020-01-01', '2020-01-01', '2020-01-01'],
+            'End Date': ['2021-01-01', '2021-01-01', '2021-01-01'],
+        })
+        report = ingest_loan_frames([loans])
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors, [
+            {'row': 2, 'id': 11, 'error': 'EMIs paid on time cannot exceed total tenure'},
+            {'row': 3, 'id': 12, 'error': 'Customer not found'},
+        ])
+        self.assertEqual(Loan.objects.get(loan_id=10).interest_rate, Decimal('10.50'))  # type: ignore
+
+    def test_rows_dropped_by_conflicts_are_not_counted(self):
+        """A row written by someone else after validation is reported, not counted as created"""
+        report = IngestionReport('customers')
+        writer = CustomerWriter(report)
+        Customer.objects.create(  # type: ignore
+            customer_id=801, first_name='Other', last_name='Job', age=30,
+            phone_number='5557000099', monthly_salary=50000, approved_limit=1800000
+        )
+        writer.write(prepare_customers(pd.DataFrame({
+            'Customer ID': [800, 801],
+            'First Name': ['Ann', 'Bob'],
+            'Last Name': ['Lee', 'Ray'],
+            'Age': [30, 40],
+            'Phone Number': [5557000001, 5557000002],
+            'Monthly Salary': [50000, 40000],
+            'Approved Limit': [1800000, 1400000],
+        }), report))
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors, [
+            {'row': 2, 'id': 801, 'error': 'Conflicts with a row stored by another import'},
+        ])
+        self.assertEqual(Customer.objects.get(customer_id=801).first_name, 'Other')  # type: ignore
+
+
+class ChunkedReaderTestCase(TestCase):
+    def test_xlsx_chunks_keep_row_numbers(self):
+        """Workbook chunks are bounded and indexed relative to the whole file"""
+        chunks = list(read_chunks('customer_data.xlsx', chunk_size=128))
+        self.assertEqual([len(chunk) for chunk in chunks], [128, 128, 44])
+        self.assertEqual(chunks[1].index[0], 128)
+        self.assertEqual(list(chunks[0].columns), CUSTOMER_COLUMNS)
+        
+        whole = pd.read_excel('customer_data.xlsx')
+        pd.testing.assert_frame_equal(pd.concat(chunks), whole, check_dtype=False)
+
+    def test_ingest_from_csv(self):
+        """CSV files go through the same ingestion pipeline"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'customers.csv')
+            pd.read_excel('customer_data.xlsx').to_csv(path, index=False)
+            report = ingest_customer_data(path, chunk_size=50)
+        self.assertEqual(report.created, 300)
+        self.assertEqual(Customer.objects.get(customer_id=1).phone_number, '9629317944')  # type: ignore
+
+    @override_settings(EXCEL_UPLOAD_ASYNC=False)
+    def test_excel_upload_accepts_csv(self):
+        """The upload view streams CSV files"""
+        upload = SimpleUploadedFile(
+            'customers.csv',
+            b'First Name,Last Name,Age,Phone Number,Monthly Salary,Approved Limit\n'
+            b'John,Doe,30,1234567890,5000.00,10000.00\n'
+            b'Jane,Smith,25,9876543210,6000.00,12000.00\n',
+            content_type='text/csv'
+        )
+        response = self.client.post('/loans/excel-upload/', {'excel_file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Customer.objects.count(), 2)  # type: ignore
+
+
+class ImportJobTestCase(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name, EXCEL_UPLOAD_ASYNC=True)
+        self.settings_override.enable()
+        Customer.objects.create(  # type: ignore
+            first_name='Job', last_name='Owner', age=30, phone_number='5554000001',
+            monthly_salary=50000, approved_limit=1000000
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def upload(self, content):
+        upload = SimpleUploadedFile('loans.csv', content, content_type='text/csv')
+        response = self.client.post('/loans/excel-upload/', {'excel_file': upload})
+        self.assertEqual(response.status_code, 200)
+        return response.context['job']
+
+    def test_upload_returns_queued_job(self):
+        """The upload is stored and a job returned without processing rows"""
+        customer_id = Customer.objects.get().customer_id  # type: ignore
+        job = self.upload(
+            b'Customer ID,Loan Amount,Tenure,Interest Rate,Monthly payment,EMIs paid on Time,Date of Approval,End Date\n'
+            + f'{customer_id},5000,12,10.5,440,6,2024-01-01,2024-12-31\n'.encode()
+            + b'999,8000,24,9.5,375,12,2024-01-01,2025-12-31\n'
+            + f'{customer_id},8000,24,9.5,375,12,,2025-12-31\n'.encode()
+        )
+        self.assertEqual(job.status, ImportJob.STATUS_QUEUED)
+        self.assertEqual(Loan.objects.count(), 0)  # type: ignore
+        
+        run_import_job(job.job_id)
+        status = self.client.get(f'/loans/api/import-jobs/{job.job_id}/').json()
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['kind'], 'loans')
+        self.assertEqual(
+            (status['rows_processed'], status['rows_succeeded'], status['rows_failed']),
+            (3, 1, 2)
+        )
+        self.assertEqual([error['row'] for error in status['errors']], [2, 3])
+        self.assertEqual(Loan.objects.count(), 1)  # type: ignore
+
+    def test_unrecognized_upload_fails_job(self):
+        """Files with unknown headers finish as failed with the reason"""
+        job = self.upload(b'Foo,Bar\n1,2\n')
+        run_import_job(job.job_id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn('Unrecognized Excel file format', job.message)
+
+    def test_unknown_job(self):
+        """Polling a missing job returns 404"""
+        self.assertEqual(self.client.get('/loans/api/import-jobs/999/').status_code, 404)
+
+    def test_silent_job_is_swept_as_failed(self):
+        """A job whose worker stopped reporting is failed on poll and never picked up again"""
+        job = self.upload(b'Foo,Bar\n1,2\n')
+        ImportJob.objects.filter(pk=job.pk).update(updated_at=job.updated_at - timedelta(hours=1))  # type: ignore
+        with override_settings(IMPORT_JOB_STALE_AFTER=60):
+            status = self.client.get(f'/loans/api/import-jobs/{job.job_id}/').json()
+            self.assertEqual(sweep_stale_jobs(), 0)
+        self.assertEqual(status['status'], 'failed')
+        self.assertEqual(status['message'], STALE_JOB_MESSAGE)
+
+        run_import_job(job.job_id)
+        job.refresh_from_db()
+        self.assertEqual(job.message, STALE_JOB_MESSAGE)
+
+
+class UploadValidationTestCase(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='Known', last_name='Customer', age=30, phone_number='5555000001',
+            monthly_salary=50000, approved_limit=1000000
+        )
+
+    def test_customer_rows_validated_in_one_query(self):
+        """Every customer rule runs on the whole frame with a single phone lookup"""
+        df = pd.DataFrame({
+            'First Name': ['Ann', 'Bob', 'Cat', 'Dan', 'Eve', None],
+            'Last Name': ['Lee', 'Ray', 'Kim', 'Fox', 'Oak', 'Elm'],
+            'Age': [30, 17, 40, 50, 60, 30],
+            'Phone Number': [5550001, 5550002, 5555000001, 5550001, 5550005, 5550006],
+            'Monthly Salary': [50000, 40000, 30000, 20000, -1, 1000],
+            'Approved Limit': [1800000, 1400000, 1100000, 700000, 100000, 1000],
+        })
+        with self.assertNumQueries(1):
+            validator = validate_customer_upload(df)
+        self.assertEqual(list(validator.rejected), [False, True, True, True, True, True])
+        self.assertEqual(list(validator.reasons), [
+            '',
+            'Age must be a whole number between 18 and 100',
+            'Customer with this phone number already exists',
+            'Duplicate phone number in file',
+            'Monthly salary and approved limit must be positive',
+            'Missing required fields',
+        ])
+        self.assertEqual(validator.valid_rows()['phone_number'].tolist(), ['5550001'])
+
+    def test_loan_rows_validated_in_one_query(self):
+        """Loan rules and the customer existence check run on the whole frame"""
+        customer_id = self.customer.customer_id
+        df = pd.DataFrame({
+            'Customer ID': [customer_id, customer_id, customer_id, 999],
+            'Loan Amount': [5000, 5000, 5000, 5000],
+            'Tenure': [12, 12, 12, 12],
+            'Interest Rate': [10.5, 10.5, 10.5, 10.5],
+            'Monthly payment': [440, 440, 440, 440],
+            'EMIs paid on Time': [6, 13, 6, 6],
+            'Date of Approval': ['2024-01-01', '2024-01-01', '2025-01-01', '2024-01-01'],
+            'End Date': ['2024-12-31', '2024-12-31', '2024-12-31', '2024-12-31'],
+        })
+        with self.assertNumQueries(1):
+            validator = validate_loan_upload(df)
+        self.assertEqual(list(validator.reasons), [
+            '',
+            'EMIs paid on time cannot exceed total tenure',
+            'End date must be after start date',
+            'Customer does not exist',
+        ])
+        self.assertEqual(validator.valid_rows()['start_date'].tolist(), [date(2024, 1, 1)])
+
+    def test_fractional_ids_and_emis_are_rejected(self):
+        """Customer IDs and EMI counts with a fraction are rejected instead of truncated"""
+        customer_id = self.customer.customer_id
+        df = pd.DataFrame({
+            'Customer ID': [customer_id, customer_id + 0.7, customer_id],
+            'Loan Amount': [5000, 5000, 5000],
+            'Tenure': [12, 12, 12],
+            'Interest Rate': [10.5, 10.5, 10.5],
+            'Monthly payment': [440, 440, 440],
+            'EMIs paid on Time': [6.0, 6, 3.7],
+            'Date of Approval': ['2024-01-01'] * 3,
+            'End Date': ['2024-12-31'] * 3,
+        })
+        validator = validate_loan_upload(df)
+        reason = 'Customer ID and EMIs paid on time must be whole numbers'
+        self.assertEqual(list(validator.reasons), ['', reason, reason])
+        self.assertEqual(validator.valid_rows()['emis_paid_on_time'].tolist(), [6])
+
+
+class ApiPaginationTestCase(TestCase):
+    def setUp(self):
+        for index in range(5):
+            customer = Customer.objects.create(  # type: ignore
+                first_name='Page', last_name=str(index), age=30,
+                phone_number=f'555600{index:04d}', monthly_salary=50000, approved_limit=1000000
+            )
+            Loan.objects.create(  # type: ignore
+                customer=customer, loan_amount=100000, tenure=12, interest_rate=10,
+                monthly_repayment=8792, emis_paid_on_time=12,
+                start_date=date(2020, 1, 1), end_date=date(2021, 1, 1)
+            )
+
+    def test_customers_keyset_pages(self):
+        """Following next_cursor walks every customer exactly once"""
+        seen = []
+        cursor = 0
+        while cursor is not None:
+            page = self.client.get('/loans/api/customers/', {'cursor': cursor, 'page_size': 2}).json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen.extend(row['customer_id'] for row in page['results'])
+            cursor = page['next_cursor']
+        self.assertEqual(seen, list(Customer.objects.order_by('customer_id').values_list('customer_id', flat=True)))  # type: ignore
+
+    def test_loans_page_query_count(self):
+        """A page of loans costs one query regardless of table size"""
+        with self.assertNumQueries(1):
+            page = self.client.get('/loans/api/loans/', {'page_size': 3}).json()
+        self.assertEqual(len(page['results']), 3)
+        self.assertEqual(page['next_cursor'], page['results'][-1]['loan_id'])
+        self.assertEqual(page['results'][0]['customer']['first_name'], 'Page')
+
+    def test_ndjson_stream(self):
+        """The NDJSON export yields one serialized row per line"""
+        response = self.client.get('/loans/api/loans/', {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['loan_amount'], '100000.00')
+
+    def test_values_serializer_matches_drf(self):
+        """The values_list() fast path renders byte-identical JSON to the DRF serializers"""
+        Customer.objects.create(  # type: ignore
+            first_name='Odd', last_name='Cents', age=41, phone_number='5556009999',
+            monthly_salary=Decimal('1234.5'), approved_limit=Decimal('99999999.99')
+        )
+        cases = [
+            (CustomerSerializer, Customer.objects.order_by('customer_id')),  # type: ignore
+            (LoanDetailSerializer, Loan.objects.select_related('customer').order_by('loan_id')),  # type: ignore
+        ]
+        for serializer_class, queryset in cases:
+            fast = ValuesSerializer(serializer_class)
+            expected = json.dumps(serializer_class(queryset, many=True).data, cls=DjangoJSONEncoder)
+            actual = json.dumps(fast.serialize(fast.values(queryset)), cls=DjangoJSONEncoder)
+            self.assertEqual(actual, expected)
+
+    def test_invalid_cursor(self):
+        """Malformed pagination parameters are rejected"""
+        self.assertEqual(self.client.get('/loans/api/customers/', {'cursor': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get('/loans/api/customers/', {'page_size': 0}).status_code, 400)
+
+
+class QueryPlanTestCase(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='Plan', last_name='Check', age=30,
+            phone_number='5557000001', monthly_salary=50000, approved_limit=1000000
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f'{index_name} not used by plan:\n{plan}')
+
+    def test_hot_queries_use_indexes(self):
+        """Eligibility, scoring and list ordering are served by the composite indexes"""
+        from django.db import connection
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan text differs between databases')
+
+        today = date.today()
+        self.assertUsesIndex(
+            Loan.objects.filter(customer=self.customer, end_date__gt=today),  # type: ignore
+            'loans_customer_end_idx'
+        )
+        self.assertUsesIndex(
+            Loan.objects.filter(customer=self.customer, start_date__year=today.year),  # type: ignore
+            'loans_customer_start_idx'
+        )
+        self.assertUsesIndex(Customer.objects.order_by('-created_at')[:20], 'customers_created_idx')  # type: ignore
+        self.assertUsesIndex(Loan.objects.order_by('-created_at')[:20], 'loans_created_idx')  # type: ignore
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.jose = Customer.objects.create(  # type: ignore
+            first_name='José', last_name='Martinez', age=30,
+            phone_number='9876543210', monthly_salary=50000, approved_limit=1000000
+        )
+        self.josephine = Customer.objects.create(  # type: ignore
+            first_name='Josephine', last_name='Marsh', age=40,
+            phone_number='9123456789', monthly_salary=60000, approved_limit=2000000
+        )
+        self.loan = Loan.objects.create(  # type: ignore
+            customer=self.josephine, loan_amount=100000, tenure=12, interest_rate=10,
+            monthly_repayment=8792, emis_paid_on_time=3,
+            start_date=date(2024, 1, 1), end_date=date(2025, 1, 1)
+        )
+
+    def test_prefix_matches_are_ranked(self):
+        """Exact terms rank before longer completions, accents are ignored"""
+        self.assertEqual(search_customer_ids('jose'), [self.jose.customer_id, self.josephine.customer_id])
+        self.assertEqual(search_customer_ids('JOSEPH'), [self.josephine.customer_id])
+        self.assertEqual(search_customer_ids('jo mart'), [self.jose.customer_id])
+        self.assertEqual(search_customer_ids('nobody'), [])
+
+    def test_exact_paths_for_numbers(self):
+        """Customer IDs and phone numbers match exactly, phone prefixes through the index"""
+        self.assertEqual(search_customer_ids(str(self.josephine.customer_id))[0], self.josephine.customer_id)
+        self.assertEqual(search_customer_ids('98765 43210'), [self.jose.customer_id])
+        self.assertEqual(search_customer_ids('9123'), [self.josephine.customer_id])
+
+    def test_index_follows_edits(self):
+        """Renaming a customer replaces its search terms"""
+        self.jose.first_name = 'Pedro'
+        self.jose.save()
+        self.assertEqual(search_customer_ids('jose'), [self.josephine.customer_id])
+        self.assertEqual(search_customer_ids('pedro'), [self.jose.customer_id])
+
+    def test_bulk_ingest_indexes_customers(self):
+        """Customers inserted through bulk_create are searchable"""
+        ingest_customer_frames([pd.DataFrame([{
+            'Customer ID': 900, 'First Name': 'Bulk', 'Last Name': 'Loaded', 'Age': 30,
+            'Phone Number': 9000000900, 'Monthly Salary': 50000, 'Approved Limit': 1800000,
+        }])])
+        self.assertEqual(search_customer_ids('bulk'), [900])
+
+    def test_list_views_use_search(self):
+        """customer_list and loan_list filter through the search index"""
+        response = self.client.get('/loans/customers/', {'search': 'martinez'})
+        self.assertEqual(list(response.context['page_obj']), [self.jose])
+        response = self.client.get('/loans/loans/', {'search': str(self.loan.loan_id)})
+        self.assertEqual(list(response.context['page_obj'])[0], self.loan)
+        response = self.client.get('/loans/loans/', {'search': 'marsh'})
+        self.assertEqual(list(response.context['page_obj']), [self.loan])
+        self.assertFalse(response.context['search_truncated'])
+
+    def test_truncated_search_is_flagged(self):
+        """Searches matching more customers than the limit report the cut"""
+        customers, truncated = search_customers(Customer.objects.all(), 'jose', limit=1)  # type: ignore
+        self.assertEqual(list(customers), [self.jose])
+        self.assertTrue(truncated)
+        self.assertFalse(search_customers(Customer.objects.all(), 'jose')[1])  # type: ignore
+
+
+class ListPaginationTestCase(TestCase):
+    def setUp(self):
+        for index in range(25):
+            Customer.objects.create(  # type: ignore
+                first_name='Listed', last_name=str(index), age=30,
+                phone_number=f'555800{index:04d}', monthly_salary=50000, approved_limit=1000000
+            )
+        self.expected = list(Customer.objects.order_by('-created_at', '-customer_id'))  # type: ignore
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get('/loans/customers/' + url)
+            page = response.context['page_obj']
+            pages.append(page)
+            url = getattr(page, link)
+        return pages
+
+    @override_settings(LIST_MAX_OFFSET_PAGE=1, LIST_EXACT_COUNT_THRESHOLD=0)
+    def test_keyset_links_walk_every_row(self):
+        """Next links past the offset limit are cursors, previous links walk back the same pages"""
+        cache.clear()
+        pages = self.walk('?', 'next_url')
+        self.assertEqual([customer for page in pages for customer in page], self.expected)
+        self.assertEqual([page.number for page in pages], [1, 2, 3])
+        self.assertIn('after=', pages[-1].request.GET.urlencode())
+        self.assertTrue(all(page.count_is_estimate and page.count == 25 for page in pages))
+
+        back = self.walk(pages[-1].previous_url, 'previous_url')
+        self.assertEqual([list(page) for page in back], [list(page) for page in pages[-2::-1]])
+
+    @override_settings(LIST_EXACT_COUNT_THRESHOLD=0)
+    def test_count_is_cached(self):
+        """Page views reuse the cached total instead of counting every time"""
+        cache.clear()
+        self.client.get('/loans/customers/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/loans/customers/', {'page': 2})
+        self.assertContains(response, 'of about 25 customers')
+
+    @override_settings(LIST_MAX_OFFSET_PAGE=2, LIST_EXACT_COUNT_THRESHOLD=0)
+    def test_deep_page_number_is_clamped(self):
+        """A page number past the offset limit shows the last OFFSET page instead of scanning"""
+        response = self.client.get('/loans/customers/', {'page': 50000})
+        page = response.context['page_obj']
+        self.assertEqual(page.number, 2)
+        self.assertEqual(list(page), self.expected[10:20])
+        self.assertIn('after=', page.next_url)
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        """Non-integer ?after= and ?before= values show page 1 instead of failing"""
+        for params in ({'after': 'abc'}, {'before': '1.5', 'page': 4}, {'after': '-3'}):
+            response = self.client.get('/loans/customers/', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['page_obj'].number, 1)
+            self.assertEqual(list(response.context['page_obj']), self.expected[:10])
+        response = self.client.get('/loans/loans/', {'before': '1.5'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_counts_exactly(self):
+        """Bounded search results keep an exact total and numbered pages"""
+        response = self.client.get('/loans/customers/', {'search': 'listed'})
+        page = response.context['page_obj']
+        self.assertFalse(page.count_is_estimate)
+        self.assertEqual(page.num_pages, 3)
+        self.assertIn('search=listed', page.next_url)
+
+
+class DashboardStatsTestCase(TestCase):
+    def setUp(self):
+        reconcile_dashboard_stats()
+
+    def create_customer(self, phone):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Customer.objects.create(  # type: ignore
+                first_name='Stats', last_name='Customer', age=30,
+                phone_number=phone, monthly_salary=50000, approved_limit=1000000
+            )
+
+    def create_loan(self, customer, amount):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Loan.objects.create(  # type: ignore
+                customer=customer, loan_amount=amount, tenure=12, interest_rate=10,
+                monthly_repayment=8792, emis_paid_on_time=12,
+                start_date=date(2020, 1, 1), end_date=date(2021, 1, 1)
+            )
+
+    def assertMatchesReconciled(self):
+        stats = get_dashboard_stats()
+        incremental = (stats.total_customers, stats.total_loans, stats.total_loan_amount, stats.score_distribution)
+        stats = reconcile_dashboard_stats()
+        self.assertEqual(
+            incremental,
+            (stats.total_customers, stats.total_loans, stats.total_loan_amount, stats.score_distribution)
+        )
+
+    def test_writes_update_counters(self):
+        """Creating, editing and deleting rows keeps the counters equal to a recount"""
+        first = self.create_customer('5559000001')
+        second = self.create_customer('5559000002')
+        loan = self.create_loan(first, 100000)
+        self.create_loan(second, 250000)
+        stats = get_dashboard_stats()
+        self.assertEqual((stats.total_customers, stats.total_loans), (2, 2))
+        self.assertEqual(stats.total_loan_amount, Decimal('350000'))
+        self.assertEqual(sum(stats.score_distribution.values()), 2)
+        self.assertMatchesReconciled()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            loan.loan_amount = 150000.5
+            loan.save()
+        self.assertEqual(get_dashboard_stats().total_loan_amount, Decimal('400000.50'))
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(sum(get_dashboard_stats().score_distribution.values()), 1)
+        self.assertMatchesReconciled()
+
+    def test_bulk_ingest_updates_counters(self):
+        """Bulk inserts bypass signals but still maintain the counters"""
+        ingest_customer_frames([pd.DataFrame([{
+            'Customer ID': 700, 'First Name': 'Bulk', 'Last Name': 'Stats', 'Age': 30,
+            'Phone Number': 9000000700, 'Monthly Salary': 50000, 'Approved Limit': 1800000,
+        }])])
+        ingest_loan_frames([pd.DataFrame([{
+            'Customer ID': 700, 'Loan ID': 7000, 'Loan Amount': 500000, 'Tenure': 12,
+            'Interest Rate': 10, 'Monthly payment': 43958, 'EMIs paid on Time': 12,
+            'Date of Approval': '2020-01-01', 'End Date': '2021-01-01',
+        }])])
+        self.assertEqual(get_dashboard_stats().total_loans, 1)
+        self.assertMatchesReconciled()
+
+    def test_dashboard_reads_the_stats_row(self):
+        """The dashboard no longer aggregates or scores customers per request"""
+        customer = self.create_customer('5559000003')
+        self.create_loan(customer, 100000)
+        with self.assertNumQueries(3):
+            response = self.client.get('/loans/')
+        self.assertEqual(response.context['total_loans'], 1)
+        response = self.client.get('/loans/delete-all/')
+        self.assertEqual(response.context['customer_count'], 1)
+
+    def test_missing_row_is_recounted_without_scoring(self):
+        """A missing stats row is rebuilt from counts alone, within the dashboard budget"""
+        customer = self.create_customer('5559000006')
+        self.create_loan(customer, 100000)
+        CreditScoreSnapshot.objects.all().delete()  # type: ignore
+        DashboardStats.objects.all().delete()  # type: ignore
+        with self.assertNumQueries(6):
+            response = self.client.get('/loans/')
+        self.assertEqual(response.context['total_customers'], 1)
+        self.assertEqual(sum(response.context['score_distribution'].values()), 0)
+        self.assertFalse(CreditScoreSnapshot.objects.exists())  # type: ignore
+
+    def test_customer_delete_is_set_based(self):
+        """Deleting a customer does not cascade row by row and keeps the counters exact"""
+        kept = self.create_customer('5559000004')
+        self.create_loan(kept, 100000)
+        customer = self.create_customer('5559000005')
+        for _ in range(5):
+            self.create_loan(customer, 50000)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(f'/loans/customers/{customer.customer_id}/delete/')
+        self.assertLess(len(queries), 20)
+        self.assertFalse(Loan.objects.filter(customer_id=customer.customer_id).exists())  # type: ignore
+        self.assertEqual(get_dashboard_stats().total_loans, 1)
+        self.assertMatchesReconciled()
+
+    def test_delete_all_query_count_is_flat(self):
+        """Deleting everything costs the same number of queries whatever the table size"""
+        for index in range(10):
+            customer = self.create_customer(f'55590001{index:02d}')
+            self.create_loan(customer, 100000)
+            self.create_loan(customer, 200000)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post('/loans/delete-all/')
+        self.assertLess(len(queries), 25)
+        self.assertFalse(Customer.objects.exists())  # type: ignore
+        self.assertEqual(get_dashboard_stats().total_customers, 0)
+
+    def test_delete_customers_skips_row_signals(self):
+        """Loans and customers are removed without per-row signals, dependants and totals follow"""
+        kept = self.create_customer('5559000201')
+        self.create_loan(kept, 100000)
+        customer = self.create_customer('5559000202')
+        loans = [self.create_loan(customer, 50000) for _ in range(3)]
+        LoanApprovalDecision.objects.create(  # type: ignore
+            loan=loans[0], approval=LoanApprovalDecision.APPROVED, reason='Test', credit_score=700
+        )
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(sender)
+        for signal in (pre_delete, post_delete):
+            signal.connect(receiver)
+            self.addCleanup(signal.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = delete_customers(Customer.objects.filter(pk=customer.pk))  # type: ignore
+        self.assertEqual(result, (1, 3))
+        self.assertEqual(received, [])
+        self.assertFalse(LoanApprovalDecision.objects.exists())  # type: ignore
+        self.assertFalse(CreditScoreSnapshot.objects.filter(customer_id=customer.pk).exists())  # type: ignore
+        self.assertFalse(CustomerSearchTerm.objects.filter(customer_id=customer.pk).exists())  # type: ignore
+        self.assertEqual(Loan.objects.get().customer_id, kept.pk)  # type: ignore
+        self.assertMatchesReconciled()
+
+
+class AmortizationTestCase(TestCase):
+    amounts = [100000, 250000, 50000]
+    tenures = [12, 36, 6]
+    rates = [10.5, 8, 0]
+
+    def test_installments_match_scalar_emi(self):
+        """Vectorized EMIs equal calculate_monthly_installment for every loan"""
+        emis = calculate_monthly_installments(self.amounts, self.tenures, self.rates)
+        expected = [
+            calculate_monthly_installment(amount, tenure, rate)
+            for amount, tenure, rate in zip(self.amounts, self.tenures, self.rates)
+        ]
+        self.assertEqual(emis.tolist(), expected)
+
+    def test_schedule_pays_off_every_loan(self):
+        """Principal sums to the loan amount and balances end at zero"""
+        schedule = amortization_schedule(self.amounts, self.tenures, self.rates)
+        self.assertEqual(schedule['balance'].shape, (3, 36))
+        np.testing.assert_allclose(schedule['principal'].sum(axis=1), self.amounts)
+        np.testing.assert_allclose(schedule['balance'][:, -1], 0, atol=1e-6)
+        # Loans past their tenure stay at zero
+        self.assertEqual(schedule['interest'][2, 6:].sum(), 0)
+        self.assertEqual(schedule['interest'][2].sum(), 0)
+
+    def test_streamed_months_match_schedule(self):
+        """iter_amortization yields the same months amortization_schedule stacks"""
+        schedule = amortization_schedule(self.amounts, self.tenures, self.rates)
+        for month, interest, principal, balance in iter_amortization(self.amounts, self.tenures, self.rates):
+            np.testing.assert_array_equal(interest, schedule['interest'][:, month - 1])
+            np.testing.assert_array_equal(balance, schedule['balance'][:, month - 1])
+        projection = project_outstanding_balance(self.amounts, self.tenures, self.rates)
+        np.testing.assert_allclose(projection, schedule['balance'].sum(axis=0))
+
+    def test_repayment_mismatches(self):
+        """Stated repayments far from the computed EMI are flagged"""
+        emis = calculate_monthly_installments(self.amounts, self.tenures, self.rates)
+        stated = [emis[0], emis[1] * 2, emis[2] + 1]
+        mismatches = monthly_repayment_mismatches(self.amounts, self.tenures, self.rates, stated)
+        self.assertEqual(mismatches.tolist(), [False, True, False])
+
+
+class ExactInstallmentTestCase(TestCase):
+    def reference_emi(self, amount, tenure, rate):
+        with localcontext() as context:
+            context.prec = 120
+            r = Decimal(rate) / 1200
+            growth = (1 + r) ** tenure
+            return Decimal(amount) * r * growth / (growth - 1)
+
+    def test_matches_high_precision_reference(self):
+        """Exact EMIs equal a 120-digit computation rounded to cents"""
+        for amount in ('1000.00', '250000.55', '99999999.99', '1234567890.12'):
+            for rate in ('0.01', '7.25', '10.5', '24.99', '99.99'):
+                for tenure in (1, 12, 60, 240, 360):
+                    expected = self.reference_emi(amount, tenure, rate).quantize(Decimal('0.01'))
+                    self.assertEqual(
+                        calculate_monthly_installment_exact(Decimal(amount), tenure, Decimal(rate)),
+                        expected, (amount, rate, tenure)
+                    )
+
+    def test_rounding_modes(self):
+        """Half-even by default, other rounding modes on request"""
+        # 0.20 over 8 months is 0.025, a tie between two cents
+        self.assertEqual(calculate_monthly_installment_exact(1000, 16, 0), Decimal('62.50'))
+        self.assertEqual(calculate_monthly_installment_exact(Decimal('0.20'), 8, 0), Decimal('0.02'))
+        self.assertEqual(
+            calculate_monthly_installment_exact(Decimal('0.20'), 8, 0, rounding=ROUND_HALF_UP), Decimal('0.03')
+        )
+
+    def test_float_inputs_and_factor_cache(self):
+        """Float rates hit the same cached factor as their Decimal spelling"""
+        annuity_factor.cache_clear()
+        self.assertEqual(
+            calculate_monthly_installment_exact(100000, 12, 10.5),
+            calculate_monthly_installment_exact(Decimal('100000'), 12, Decimal('10.50')),
+        )
+        self.assertEqual(annuity_factor.cache_info().currsize, 1)
+        self.assertAlmostEqual(
+            float(calculate_monthly_installment_exact(100000, 12, 10.5)),
+            calculate_monthly_installment(100000, 12, 10.5), places=2
+        )
+
+
+class BatchEligibilityTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        today = date.today()
+        self.customers = []
+        for index, salary in enumerate([50000, 20000, 100000]):
+            customer = Customer.objects.create(  # type: ignore
+                first_name='Batch', last_name=str(index), age=30,
+                phone_number=f'555300{index:04d}',
+                monthly_salary=salary, approved_limit=36 * salary
+            )
+            Loan.objects.create(  # type: ignore
+                customer=customer, loan_amount=100000, tenure=24,
+                interest_rate=10, monthly_repayment=8000,
+                emis_paid_on_time=10, start_date=date(2022, 1, 1), end_date=today + timedelta(days=200)
+            )
+            self.customers.append(customer)
+
+    def test_batch_matches_single_checks(self):
+        """Every decision equals check_loan_eligibility, with grouped queries"""
+        applications = [
+            {'customer_id': customer.customer_id, 'loan_amount': amount, 'interest_rate': 11.5, 'tenure': 12}
+            for customer in self.customers for amount in (50000, 150000)
+        ]
+        applications.append({'customer_id': 999999, 'loan_amount': 50000, 'interest_rate': 11.5, 'tenure': 12})
+        with self.assertNumQueries(4):
+            response = self.client.post('/loans/api/check-eligibility/batch/', {'applications': applications}, format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), len(applications))
+        
+        for application, result in zip(applications[:-1], results):
+            customer = Customer.objects.get(customer_id=application['customer_id'])  # type: ignore
+            eligible, credit_score, corrected_rate = check_loan_eligibility(
+                customer, Decimal(str(application['loan_amount'])), Decimal('11.50'), 12
+            )
+            self.assertEqual(result['approval'], eligible)
+            self.assertEqual(result['credit_score'], credit_score)
+            self.assertEqual(result['corrected_interest_rate'], None if corrected_rate is None else str(corrected_rate))
+        self.assertIn(False, [result['approval'] for result in results[:-1]])
+        self.assertEqual(results[-1], {'customer_id': 999999, 'approval': False, 'error': 'Customer not found.'})
+
+    def test_invalid_batches(self):
+        """Malformed items and empty batches are rejected"""
+        response = self.client.post('/loans/api/check-eligibility/batch/', {'applications': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/loans/api/check-eligibility/batch/', {'applications': [
+            {'customer_id': self.customers[0].customer_id, 'loan_amount': 1000, 'interest_rate': 10, 'tenure': 0}
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('applications', response.json()['errors'])
+
+
+class BulkLoanApprovalTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        today = date.today()
+        self.loans = []
+        for index, (salary, debt) in enumerate([(50000, 0), (10000, 4000), (80000, 0)]):
+            customer = Customer.objects.create(  # type: ignore
+                first_name='Approval', last_name=str(index), age=30,
+                phone_number=f'555400{index:04d}',
+                monthly_salary=salary, approved_limit=36 * salary, current_debt=debt
+            )
+            for amount in (2000, 20000):
+                self.loans.append(Loan.objects.create(  # type: ignore
+                    customer=customer, loan_amount=amount, tenure=12,
+                    interest_rate=10, monthly_repayment=amount / 10,
+                    emis_paid_on_time=12, start_date=date(2020, 1, 1), end_date=today + timedelta(days=60)
+                ))
+
+    def expected(self, loan):
+        loan = Loan.objects.select_related('customer').get(loan_id=loan.loan_id)  # type: ignore
+        return {'loan_id': loan.loan_id, **determine_loan_approval(loan.customer, loan)}
+
+    def test_bulk_by_id_matches_single_decisions(self):
+        """Listed loans are evaluated with one loan query and one scoring query pair"""
+        loan_ids = [loan.loan_id for loan in self.loans] + [999999]
+        with self.assertNumQueries(3):
+            response = self.client.post('/loans/api/loan-approval/bulk/', {'loan_ids': loan_ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results[:-1], [self.expected(loan) for loan in self.loans])
+        self.assertEqual(results[-1], {'loan_id': 999999, 'error': 'Loan not found.'})
+
+    def test_portfolio_run_stores_decisions(self):
+        """The command writes one decision per loan and pending mode follows them"""
+        out = io.StringIO()
+        call_command('evaluate_loan_approvals', '--chunk-size', '4', stdout=out)
+        self.assertIn(f'Stored {len(self.loans)} decisions', out.getvalue())
+        
+        stored = {decision.loan_id: decision for decision in LoanApprovalDecision.objects.all()}  # type: ignore
+        self.assertEqual(len(stored), len(self.loans))
+        for loan in self.loans:
+            expected = self.expected(loan)
+            self.assertEqual(stored[loan.loan_id].approval, expected['approval'])
+            self.assertEqual(stored[loan.loan_id].credit_score, expected['credit_score'])
+        
+        pending = {decision.loan_id for decision in stored.values() if decision.approval == 'pending'}
+        self.assertEqual(set(pending_loans().values_list('loan_id', flat=True)), pending)
+        response = self.client.post('/loans/api/loan-approval/bulk/', {'pending': True}, format='json')
+        self.assertEqual({result['loan_id'] for result in response.json()['results']}, pending)
+        self.assertEqual(sum(reevaluate_portfolio(pending_loans()).values()), len(pending))
+
+    @override_settings(APPROVAL_BATCH_MAX_SIZE=4)
+    def test_pending_pages_follow_the_cursor(self):
+        """Truncated pending runs return a cursor that reaches the remaining loans"""
+        seen, cursor = [], 0
+        while cursor is not None:
+            response = self.client.post(
+                '/loans/api/loan-approval/bulk/', {'pending': True, 'cursor': cursor}, format='json'
+            )
+            body = response.json()
+            seen.extend(result['loan_id'] for result in body['results'])
+            self.assertEqual(body['truncated'], body['next_cursor'] is not None)
+            cursor = body['next_cursor']
+        self.assertEqual(seen, sorted(loan.loan_id for loan in self.loans))
+
+    def test_requires_ids_or_pending(self):
+        """Exactly one of loan_ids and pending must be given"""
+        for payload in ({}, {'loan_ids': [self.loans[0].loan_id], 'pending': True},
+                        {'loan_ids': [self.loans[0].loan_id], 'cursor': 5}):
+            response = self.client.post('/loans/api/loan-approval/bulk/', payload, format='json')
+            self.assertEqual(response.status_code, 400)
+
+
+class CreditSimulationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.customer = Customer.objects.create(  # type: ignore
+            first_name='What', last_name='If', age=40, phone_number='5555000001',
+            monthly_salary=60000, approved_limit=2000000, current_debt=5000
+        )
+        Loan.objects.create(  # type: ignore
+            customer=self.customer, loan_amount=400000, tenure=36,
+            interest_rate=9, monthly_repayment=12000, emis_paid_on_time=30,
+            start_date=date(2021, 1, 1), end_date=date.today() + timedelta(days=180)
+        )
+        self.scenarios = [
+            {},
+            {'loan_amount': 20000, 'tenure': 12},
+            {'loan_amount': 900000, 'tenure': 60},
+            {'loan_amount': 20000, 'tenure': 12, 'monthly_salary': 30000},
+            {'loan_amount': 20000, 'tenure': 12, 'approved_limit': 500000},
+            {'loan_amount': 600000, 'tenure': 24, 'approved_limit': 500000},
+        ]
+
+    def actual(self, scenario):
+        """Score and decide the scenario the slow way, with a real loan row"""
+        customer = Customer.objects.get(pk=self.customer.pk)  # type: ignore
+        customer.monthly_salary = Decimal(str(scenario.get('monthly_salary', customer.monthly_salary)))
+        customer.approved_limit = Decimal(str(scenario.get('approved_limit', customer.approved_limit)))
+        if 'loan_amount' not in scenario:
+            return calculate_credit_score(customer), None
+        loan = Loan.objects.create(  # type: ignore
+            customer=customer, loan_amount=scenario['loan_amount'], tenure=scenario['tenure'],
+            interest_rate=10, monthly_repayment=1000, emis_paid_on_time=0,
+            start_date=date.today(), end_date=date.today() + timedelta(days=31 * scenario['tenure'])
+        )
+        loan.refresh_from_db()
+        try:
+            decision = determine_loan_approval(customer, loan)
+            return decision['credit_score'], decision['approval']
+        finally:
+            loan.delete()
+
+    def test_scenarios_match_real_loans(self):
+        """Simulated outcomes equal scoring with the loan actually created"""
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                f'/loans/api/credit-score/{self.customer.customer_id}/simulate/',
+                {'scenarios': self.scenarios}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(
+            [(result['credit_score'], result['approval']) for result in results],
+            [self.actual(scenario) for scenario in self.scenarios]
+        )
+        self.assertEqual(Loan.objects.count(), 1)  # type: ignore
+
+    def test_invalid_scenarios(self):
+        """An extra loan needs both amount and tenure, unknown customers are 404"""
+        url = f'/loans/api/credit-score/{self.customer.customer_id}/simulate/'
+        response = self.client.post(url, {'scenarios': [{'loan_amount': 1000}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/loans/api/credit-score/999999/simulate/', {'scenarios': [{}]}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class FastBootTestCase(TestCase):
+    @contextmanager
+    def sqlite_database(self, db_path):
+        """A temporary alias for an on-disk SQLite file, the test database lives in memory"""
+        alias = 'fastboot'
+        connections.settings[alias] = {**connections['default'].settings_dict, 'NAME': str(db_path)}
+        try:
+            yield alias
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def test_in_memory_database_follows_the_migration_plan(self):
+        """Without a database file the migration plan decides, and it is empty here"""
+        self.assertFalse(ensure_database())
+
+    def test_migrated_database_is_left_alone(self):
+        """An on-disk database stamped with the current schema skips migrate"""
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = Path(directory, 'db.sqlite3')
+            stamp = Path(directory, 'db.sqlite3.schema')
+            with self.sqlite_database(db_path) as alias:
+                self.assertTrue(ensure_database(alias, snapshot=''))
+                self.assertIn(Customer._meta.db_table, connections[alias].introspection.table_names())
+                self.assertEqual(stamp.read_text(), schema_fingerprint())
+
+                self.assertFalse(ensure_database(alias, snapshot=''))
+
+                stamp.write_text('outdated')
+                self.assertTrue(ensure_database(alias, snapshot=''))
+                self.assertEqual(stamp.read_text(), schema_fingerprint())
+
+    def test_snapshot_restored_only_when_missing(self):
+        """The snapshot and its schema stamp are copied into an empty location"""
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = Path(directory, 'snapshot.sqlite3')
+            snapshot.write_bytes(b'snapshot')
+            Path(directory, 'snapshot.sqlite3.schema').write_text('fingerprint')
+            db_path = Path(directory, 'tmp', 'db.sqlite3')
+            
+            self.assertTrue(restore_snapshot(db_path, snapshot))
+            self.assertEqual(db_path.read_bytes(), b'snapshot')
+            self.assertEqual(Path(directory, 'tmp', 'db.sqlite3.schema').read_text(), 'fingerprint')
+            
+            db_path.write_bytes(b'live data')
+            self.assertFalse(restore_snapshot(db_path, snapshot))
+            self.assertEqual(db_path.read_bytes(), b'live data')
+
+
+class ImportProfileTestCase(SimpleTestCase):
+    def test_boot_imports_skip_the_ingestion_stack(self):
+        """Booting Django and loading the URLconf leaves pandas and openpyxl unimported"""
+        entries = profile_imports()
+        modules = {module for module, _, _ in entries}
+        self.assertIn('loans.views', modules)
+        self.assertNotIn('pandas', modules)
+        self.assertNotIn('openpyxl', modules)
+        self.assertNotIn('numpy', modules)
+        self.assertNotIn('loans.tasks', modules)
+        report = format_report(entries)
+        self.assertIn('django', report)
+
+    def test_views_do_not_import_pandas(self):
+        """Importing loans.views leaves the whole data-science stack unloaded"""
+        statement = (
+            "import os, sys; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'credit_system.settings'); "
+            "import django; django.setup(); import loans.views; "
+            "loaded = [name for name in ('pandas', 'numpy', 'openpyxl') if name in sys.modules]; "
+            "assert not loaded, loaded"
+        )
+        modules = {module for module, _, _ in profile_imports(statement)}
+        self.assertIn('loans.views', modules)
+
+    def test_lazy_module_loads_on_first_use(self):
+        """The numpy stand-in in loans.utils imports numpy when a vectorized path runs"""
+        from .lazy import LazyModule, lazy_module
+        from . import utils
+        self.assertIsInstance(utils.np, LazyModule)
+        self.assertEqual(calculate_monthly_installments([1200], [12], [0]).tolist(), [100.0])
+        self.assertIs(utils.np.asarray, np.asarray)
+        self.assertEqual(lazy_module('json').dumps([1]), '[1]')
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        reset_profile_stats()
+        customer = Customer.objects.create(  # type: ignore
+            first_name='Profiled', last_name='Customer', age=30, phone_number='5556000001',
+            monthly_salary=50000, approved_limit=1800000
+        )
+        self.loan = Loan.objects.create(  # type: ignore
+            customer=customer, loan_amount=100000, tenure=12, interest_rate=10,
+            monthly_repayment=8800, emis_paid_on_time=6,
+            start_date=date(2023, 1, 1), end_date=date(2030, 1, 1)
+        )
+
+    def test_requests_are_aggregated_per_view(self):
+        """Query counts and scoring sections show up under the view name"""
+        self.client.get('/loans/api/loans/')
+        self.client.get('/loans/api/loans/')
+        self.client.post(f'/loans/api/loan-approval/{self.loan.loan_id}/')
+        
+        stats = self.client.get('/profiling/').json()
+        self.assertEqual(stats['loans:api_loans']['requests'], 2)
+        self.assertEqual(stats['loans:api_loans']['max_queries'], 1)
+        self.assertEqual(stats['loans:api_loans']['query_budget'], 2)
+        approval = stats['loans:api_loan_approval']
+        self.assertEqual(approval['sections']['determine_loan_approval']['calls'], 1)
+        self.assertGreater(approval['avg_queries'], 0)
+        self.assertEqual(profile_stats()['profiling']['requests'], 1)
+
+    def test_budget_overrun_warns_or_fails(self):
+        """A view over its query budget logs a warning, and fails when budgets are enforced"""
+        @query_budget(1)
+        def chatty_view(request):
+            Customer.objects.count()  # type: ignore
+            Loan.objects.count()  # type: ignore
+            return HttpResponse()
+
+        def get_response(request):
+            middleware.process_view(request, chatty_view, (), {})
+            return chatty_view(request)
+
+        middleware = ProfilingMiddleware(get_response)
+        request = RequestFactory().get('/chatty/')
+        with override_settings(PROFILING_ENFORCE_BUDGETS=False):
+            with self.assertLogs('loans.profiling', 'WARNING') as logs:
+                middleware(request)
+        self.assertIn('ran 2 queries, over its budget of 1', logs.output[0])
+        with override_settings(PROFILING_ENFORCE_BUDGETS=True):
+            with self.assertRaises(AssertionError):
+                middleware(RequestFactory().get('/chatty/'))
+        self.assertEqual(profile_stats()['chatty_view']['over_budget'], 2)
+
+
+@LOCAL_CREDIT_CACHE
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        customer = Customer.objects.create(  # type: ignore
+            first_name='Metered', last_name='Customer', age=30, phone_number='5557000001',
+            monthly_salary=50000, approved_limit=1800000
+        )
+        self.loan = Loan.objects.create(  # type: ignore
+            customer=customer, loan_amount=100000, tenure=12, interest_rate=10,
+            monthly_repayment=8800, emis_paid_on_time=6,
+            start_date=date(2023, 1, 1), end_date=date(2030, 1, 1)
+        )
+
+    def test_metrics_endpoint(self):
+        """Request latency, scoring time, cache lookups and decisions are exported"""
+        self.client.post(f'/loans/api/loan-approval/{self.loan.loan_id}/')
+        self.client.post(f'/loans/api/loan-approval/{self.loan.loan_id}/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE credit_http_request_duration_seconds histogram', body)
+        self.assertIn('credit_http_request_duration_seconds_count{view="loans:api_loan_approval",method="POST",status="200"}', body)
+        self.assertIn('credit_scoring_duration_seconds_count{function="determine_loan_approval"}', body)
+        self.assertIn('credit_cache_requests_total{kind="approval",result="hit"}', body)
+        self.assertIn('credit_loan_decisions_total{approval=', body)
+
+    def test_histogram_exposition(self):
+        """Buckets are cumulative and end with +Inf, _count matches"""
+        registry = Registry()
+        latency = Histogram('test_seconds', 'Test latency', ['view'], registry=registry, buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            latency.observe(value, view='a"b')
+        lines = registry.render().splitlines()
+        self.assertIn('test_seconds_bucket{view="a\\"b",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{view="a\\"b",le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{view="a\\"b",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{view="a\\"b"} 3', lines)
+        with self.assertRaises(ValueError):
+            latency.observe(1)
+
+    def test_multiprocess_files_are_added_up(self):
+        """Every worker's file in METRICS_MULTIPROCESS_DIR counts towards the totals"""
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS_MULTIPROCESS_DIR=directory, METRICS_FLUSH_INTERVAL=0):
+            registry = Registry()
+            rows = Counter('test_rows_total', 'Test rows', ['kind'], registry=registry)
+            rows.inc(5, kind='loans')
+            # Another worker's values, the parent process stands in for a live one
+            with open(os.path.join(directory, f'metrics-{os.getppid()}.json'), 'w') as handle:
+                json.dump({'test_rows_total': [[['loans'], 7]]}, handle)
+            self.assertIn('test_rows_total{kind="loans"} 12.0', registry.render())
+
+    def test_multiprocess_gauges_are_per_process(self):
+        """Gauges carry the pid of their process, exited processes only keep their counters"""
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS_MULTIPROCESS_DIR=directory, METRICS_FLUSH_INTERVAL=0):
+            registry = Registry()
+            rate = Gauge('test_rate', 'Test rate', ['kind'], registry=registry)
+            rows = Counter('test_rows_total', 'Test rows', ['kind'], registry=registry)
+            rate.set(100, kind='loans')
+            rows.inc(5, kind='loans')
+            with open(os.path.join(directory, f'metrics-{os.getppid()}.json'), 'w') as handle:
+                json.dump({'test_rate': [[['loans'], 40]]}, handle)
+            exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                                    capture_output=True, text=True, check=True)
+            dead_file = os.path.join(directory, f'metrics-{exited.stdout.strip()}.json')
+            with open(dead_file, 'w') as handle:
+                json.dump({'test_rate': [[['loans'], 999]], 'test_rows_total': [[['loans'], 7]]}, handle)
+
+            lines = registry.render().splitlines()
+            self.assertIn(f'test_rate{{kind="loans",pid="{os.getpid()}"}} 100.0', lines)
+            self.assertIn(f'test_rate{{kind="loans",pid="{os.getppid()}"}} 40.0', lines)
+            self.assertFalse(any(line.endswith(' 999.0') for line in lines))
+            self.assertIn('test_rows_total{kind="loans"} 12.0', lines)
+            self.assertTrue(os.path.exists(dead_file))
@@ -23,6 +23,7 @@ urlpatterns = [
     
     # Excel upload
     path('excel-upload/', views.excel_upload, name='excel_upload'),
+    path('api/import-jobs/<int:job_id>/', views.api_import_job, name='api_import_job'),
     
     # Data management
     path('delete-all/', views.delete_all_data, name='delete_all_data'),
@@ -31,5 +32,9 @@ urlpatterns = [
     path('api/customers/', views.api_customers, name='api_customers'),
     path('api/loans/', views.api_loans, name='api_loans'),
     path('api/credit-score/<int:customer_id>/', views.api_credit_score, name='api_credit_score'),
+    path('api/credit-score/<int:customer_id>/simulate/', views.api_credit_simulation, name='api_credit_simulation'),
     path('api/loan-approval/<int:loan_id>/', views.api_loan_approval, name='api_loan_approval'),
+    path('api/loan-approval/bulk/', views.api_loan_approval_bulk, name='api_loan_approval_bulk'),
+    path('api/check-eligibility/batch/', views.api_check_eligibility_batch, name='api_check_eligibility_batch'),
+    path('api/cache-stats/', views.api_cache_stats, name='api_cache_stats'),
 ]
\ No newline at end of file
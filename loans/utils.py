@@ -1,36 +1,63 @@
-from decimal import Decimal
-from datetime import datetime, date
-from .models import Loan, Customer
+from decimal import Decimal, ROUND_HALF_EVEN, localcontext
+from datetime import date
+from functools import lru_cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from .models import Loan, Customer, CreditScoreSnapshot
+from .cache import bump_customer_versions, cached
+from .lazy import lazy_module
+from .metrics import LOAN_DECISIONS
+from .profiling import profiled
+from .stats import record_score_changes
 import math
 
+# Only the bulk and vectorized paths need numpy, single-customer scoring does not
+np = lazy_module('numpy')
 
-def calculate_credit_score(customer):
-    """Calculate credit score based on historical data (300-850 range)"""
-    loans = Loan.objects.filter(customer=customer)  # type: ignore
-    
-    if not loans.exists():  # type: ignore
+
+def credit_score_aggregates(today=None):
+    """Conditional aggregates for every credit score component of a loan queryset"""
+    today = today or date.today()
+    return {
+        'total_emis': Sum('tenure'),
+        'paid_on_time': Sum('emis_paid_on_time'),
+        'num_loans': Count('pk'),
+        'current_year_loans': Count('pk', filter=Q(start_date__year=today.year)),
+        'total_loan_amount': Sum('loan_amount'),
+        'current_debt': Sum('loan_amount', filter=Q(end_date__gt=today)),
+    }
+
+
+def get_credit_score_components(customer, today=None):
+    """Fetch all credit score components for a customer in a single query"""
+    components = Loan.objects.filter(customer=customer).aggregate(  # type: ignore
+        **credit_score_aggregates(today)
+    )
+    # SUM() over an empty set is NULL, normalise to zero
+    return {key: value or 0 for key, value in components.items()}
+
+
+def compute_credit_score(components, approved_limit):
+    """Turn aggregated loan components into a credit score (300-850 range)"""
+    if not components['num_loans']:
         return 650  # Default score for new customers
     
     # Component 1: Past loans paid on time (40% weightage)
-    total_emis = sum(loan.tenure for loan in loans)
-    paid_on_time = sum(loan.emis_paid_on_time for loan in loans)
+    total_emis = components['total_emis']
+    paid_on_time = components['paid_on_time']
     on_time_ratio = paid_on_time / total_emis if total_emis > 0 else 0
     
     # Component 2: Number of loans taken (20% weightage)
-    num_loans = loans.count()  # type: ignore
+    num_loans = components['num_loans']
     
     # Component 3: Loan activity in current year (20% weightage)
-    current_year = datetime.now().year
-    current_year_loans = loans.filter(start_date__year=current_year).count()  # type: ignore
+    current_year_loans = components['current_year_loans']
     
     # Component 4: Loan approved volume (20% weightage)
-    total_loan_amount = sum(loan.loan_amount for loan in loans)
+    total_loan_amount = components['total_loan_amount']
     
     # Component 5: Current debt vs approved limit
-    current_debt = sum(
-        loan.loan_amount for loan in loans 
-        if loan.end_date > date.today()
-    )
+    current_debt = components['current_debt']
     
     # Base score starts at 300
     base_score = 300
@@ -51,8 +78,8 @@ def calculate_credit_score(customer):
     score += min(float(total_loan_amount) / 1000000 * 50, 110)
     
     # Penalty for high debt utilization
-    if customer.approved_limit > 0:
-        debt_utilization = (current_debt / customer.approved_limit) * 100
+    if approved_limit > 0:
+        debt_utilization = (current_debt / approved_limit) * 100
         if debt_utilization > 80:
             score -= 100
         elif debt_utilization > 60:
@@ -64,6 +91,211 @@ def calculate_credit_score(customer):
     return min(max(int(score), 300), 850)
 
 
+@profiled('calculate_credit_score')
+def calculate_credit_score(customer):
+    """Calculate credit score based on historical data (300-850 range)"""
+    components = get_credit_score_components(customer)
+    return compute_credit_score(components, customer.approved_limit)
+
+
+def get_bulk_credit_score_components(customers, today=None):
+    """Fetch credit score components for many customers grouped in one query"""
+    rows = (
+        Loan.objects.filter(customer__in=customers.values('pk'))  # type: ignore
+        .values('customer_id')
+        .annotate(**credit_score_aggregates(today))
+        .order_by()
+    )
+    return {row.pop('customer_id'): row for row in rows}
+
+
+def _to_cents(amount):
+    """Convert a money amount to integer cents for exact vectorized comparisons"""
+    return int(Decimal(amount or 0) * 100)
+
+
+def compute_credit_scores(num_loans, total_emis, paid_on_time, current_year_loans,
+                          volume_cents, debt_cents, limit_cents):
+    """Vectorized compute_credit_score over aligned NumPy component arrays"""
+    num_loans = np.asarray(num_loans, dtype=np.int64)
+    total_emis = np.asarray(total_emis, dtype=np.int64)
+    paid_on_time = np.asarray(paid_on_time, dtype=np.int64)
+    current_year_loans = np.asarray(current_year_loans, dtype=np.int64)
+    volume_cents = np.asarray(volume_cents, dtype=np.int64)
+    debt_cents = np.asarray(debt_cents, dtype=np.int64)
+    limit_cents = np.asarray(limit_cents, dtype=np.int64)
+    
+    # Payment history, loan history, current activity and volume bonus,
+    # accumulated in the same order as compute_credit_score
+    on_time_ratio = np.divide(
+        paid_on_time, total_emis,
+        out=np.zeros(len(num_loans)), where=total_emis > 0
+    )
+    score = np.full(len(num_loans), 300.0)
+    score += on_time_ratio * 220
+    score += np.minimum(num_loans * 20, 110)
+    score += np.minimum(current_year_loans * 30, 110)
+    score += np.minimum(volume_cents / 100 / 1000000 * 50, 110)
+    
+    # Debt utilization thresholds compared in integer cents, so
+    # debt / limit > 80% becomes debt * 5 > limit * 4 without rounding
+    has_limit = limit_cents > 0
+    penalty = np.select(
+        [
+            has_limit & (debt_cents * 5 > limit_cents * 4),
+            has_limit & (debt_cents * 5 > limit_cents * 3),
+            has_limit & (debt_cents * 5 > limit_cents * 2),
+        ],
+        [100, 50, 25],
+        default=0,
+    )
+    score -= penalty
+    
+    scores = np.clip(np.trunc(score), 300, 850).astype(np.int64)
+    return np.where(num_loans > 0, scores, 650)  # Default score for new customers
+
+
+EMPTY_CREDIT_SCORE_COMPONENTS = {
+    'total_emis': 0, 'paid_on_time': 0, 'num_loans': 0,
+    'current_year_loans': 0, 'total_loan_amount': 0, 'current_debt': 0,
+}
+
+
+def get_bulk_credit_scores(customers, today=None):
+    """Score customers in bulk, returns {customer_id: (score, components)}"""
+    limits = list(customers.values_list('customer_id', 'approved_limit').order_by())
+    if not limits:
+        return {}
+    components = get_bulk_credit_score_components(customers, today)
+    
+    columns = [
+        {key: value or 0 for key, value in components.get(customer_id, EMPTY_CREDIT_SCORE_COMPONENTS).items()}
+        for customer_id, _ in limits
+    ]
+    scores = compute_credit_scores(
+        num_loans=[c['num_loans'] for c in columns],
+        total_emis=[c['total_emis'] for c in columns],
+        paid_on_time=[c['paid_on_time'] for c in columns],
+        current_year_loans=[c['current_year_loans'] for c in columns],
+        volume_cents=[_to_cents(c['total_loan_amount']) for c in columns],
+        debt_cents=[_to_cents(c['current_debt']) for c in columns],
+        limit_cents=[_to_cents(limit) for _, limit in limits],
+    )
+    return {
+        customer_id: (int(score), column)
+        for (customer_id, _), score, column in zip(limits, scores, columns)
+    }
+
+
+@profiled('score_customers')
+def score_customers(customers, today=None):
+    """Score every customer in a queryset at once, returns {customer_id: score}"""
+    return {
+        customer_id: score
+        for customer_id, (score, _) in get_bulk_credit_scores(customers, today).items()
+    }
+
+
+SNAPSHOT_UPDATE_FIELDS = [
+    'score', 'num_loans', 'total_emis', 'paid_on_time', 'current_year_loans',
+    'total_loan_amount', 'current_debt', 'as_of', 'is_stale', 'computed_at',
+]
+
+
+def _build_snapshot(customer_id, score, components, today):
+    return CreditScoreSnapshot(
+        customer_id=customer_id,
+        score=score,
+        as_of=today,
+        is_stale=False,
+        computed_at=timezone.now(),
+        **components
+    )
+
+
+def refresh_credit_score_snapshot(customer, today=None):
+    """Recompute and persist the credit score snapshot of a single customer"""
+    today = today or date.today()
+    components = get_credit_score_components(customer, today)
+    score = compute_credit_score(components, customer.approved_limit)
+    previous = (
+        CreditScoreSnapshot.objects  # type: ignore
+        .filter(customer_id=customer.customer_id)
+        .values_list('score', flat=True)
+        .first()
+    )
+    snapshot = _build_snapshot(customer.customer_id, score, components, today)
+    snapshot.save()
+    record_score_changes([(previous, score)])
+    return snapshot
+
+
+def refresh_credit_score_snapshots(customers=None, today=None, batch_size=1000):
+    """Recompute and persist credit score snapshots for a customer queryset"""
+    today = today or date.today()
+    customers = Customer.objects.all() if customers is None else customers  # type: ignore
+    customer_ids = list(customers.values_list('customer_id', flat=True).order_by('customer_id'))
+    
+    refreshed = 0
+    for offset in range(0, len(customer_ids), batch_size):
+        batch_ids = customer_ids[offset:offset + batch_size]
+        batch = Customer.objects.filter(customer_id__in=batch_ids)  # type: ignore
+        previous = dict(
+            CreditScoreSnapshot.objects.filter(customer_id__in=batch_ids).values_list('customer_id', 'score')  # type: ignore
+        )
+        snapshots = [
+            _build_snapshot(customer_id, score, components, today)
+            for customer_id, (score, components) in get_bulk_credit_scores(batch, today).items()
+        ]
+        CreditScoreSnapshot.objects.bulk_create(  # type: ignore
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['customer'],
+            update_fields=SNAPSHOT_UPDATE_FIELDS,
+        )
+        record_score_changes((previous.get(snapshot.customer_id), snapshot.score) for snapshot in snapshots)
+        refreshed += len(snapshots)
+    return refreshed
+
+
+def invalidate_credit_scores(customer_ids):
+    """Mark credit score snapshots stale and drop cached entries after a write"""
+    customer_ids = {customer_id for customer_id in customer_ids if customer_id is not None}
+    if customer_ids:
+        CreditScoreSnapshot.objects.filter(customer_id__in=customer_ids).update(is_stale=True)  # type: ignore
+        bump_customer_versions(customer_ids)
+
+
+@profiled('get_credit_score')
+def get_credit_score(customer, today=None):
+    """Serve the persisted credit score, recomputing it only when stale or outdated"""
+    today = today or date.today()
+    score = (
+        CreditScoreSnapshot.objects  # type: ignore
+        .filter(customer_id=customer.customer_id, is_stale=False, as_of=today)
+        .values_list('score', flat=True)
+        .first()
+    )
+    if score is not None:
+        return score
+    return refresh_credit_score_snapshot(customer, today).score
+
+
+def get_cached_credit_score(customer):
+    """Credit score through the versioned cache, backed by the persisted snapshot"""
+    return cached('score', customer.customer_id, lambda: get_credit_score(customer))
+
+
+def get_cached_loan_approval(customer, loan):
+    """Loan approval decision through the versioned cache"""
+    return cached(
+        'approval',
+        customer.customer_id,
+        lambda: determine_loan_approval(customer, loan, get_cached_credit_score(customer)),
+        loan.loan_id
+    )
+
+
 def calculate_monthly_installment(loan_amount, tenure, interest_rate):
     """Calculate monthly installment using compound interest formula"""
     P = float(loan_amount)
@@ -78,6 +310,105 @@ def calculate_monthly_installment(loan_amount, tenure, interest_rate):
     return round(emi, 2)
 
 
+# Products use a small set of rates and tenures, so their factors are reused
+EMI_FACTOR_CACHE_SIZE = 1024
+# Enough digits that (1 + r)^360 keeps every cent of a 12-digit principal
+EMI_PRECISION = 40
+CENT = Decimal('0.01')
+
+
+def _as_decimal(value):
+    """Decimal from a Decimal, int, float or string, going through str() for floats"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+@lru_cache(maxsize=EMI_FACTOR_CACHE_SIZE)
+def annuity_factor(interest_rate, tenure):
+    """EMI per unit of principal, r * (1 + r)^n / ((1 + r)^n - 1), for a Decimal annual rate"""
+    with localcontext() as context:
+        context.prec = EMI_PRECISION
+        r = interest_rate / 1200  # Monthly interest rate
+        if r == 0:
+            return 1 / Decimal(tenure)
+        growth = (1 + r) ** tenure
+        return r * growth / (growth - 1)
+
+
+def calculate_monthly_installment_exact(loan_amount, tenure, interest_rate, rounding=ROUND_HALF_EVEN):
+    """Decimal EMI rounded to cents, half-even (banker's rounding) unless `rounding` says otherwise"""
+    factor = annuity_factor(_as_decimal(interest_rate), int(tenure))
+    with localcontext() as context:
+        context.prec = EMI_PRECISION
+        return (_as_decimal(loan_amount) * factor).quantize(CENT, rounding=rounding)
+
+
+def calculate_monthly_installments(loan_amounts, tenures, interest_rates):
+    """Vectorized calculate_monthly_installment over aligned arrays of loans"""
+    P = np.asarray(loan_amounts, dtype=np.float64)
+    n = np.asarray(tenures, dtype=np.int64)
+    r = np.asarray(interest_rates, dtype=np.float64) / (12 * 100)
+    
+    growth = np.power(1 + r, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        emi = np.round(P * r * growth / (growth - 1), 2)
+        return np.where(r == 0, P / n, emi)
+
+
+def iter_amortization(loan_amounts, tenures, interest_rates, monthly_installments=None):
+    """Yield (month, interest, principal, balance) arrays across many loans, one month at a time
+    
+    Only the current month is held in memory, so long schedules over a large
+    portfolio can be streamed. Loans past their tenure report zeros.
+    """
+    balance = np.array(loan_amounts, dtype=np.float64)
+    n = np.asarray(tenures, dtype=np.int64)
+    r = np.asarray(interest_rates, dtype=np.float64) / (12 * 100)
+    if monthly_installments is None:
+        emi = calculate_monthly_installments(balance, n, interest_rates)
+    else:
+        emi = np.asarray(monthly_installments, dtype=np.float64)
+    
+    for month in range(1, int(n.max(initial=0)) + 1):
+        active = month <= n
+        interest = np.where(active, balance * r, 0.0)
+        principal = np.where(active, np.minimum(emi - interest, balance), 0.0)
+        # The last installment settles whatever rounding left on the balance
+        principal = np.where(month == n, balance, principal)
+        balance = balance - principal
+        yield month, interest, principal, balance
+
+
+def amortization_schedule(loan_amounts, tenures, interest_rates, monthly_installments=None):
+    """Full amortization schedules as (loans x months) interest, principal and balance arrays"""
+    months = list(iter_amortization(loan_amounts, tenures, interest_rates, monthly_installments))
+    num_loans = len(np.atleast_1d(loan_amounts))
+    if not months:
+        empty = np.zeros((num_loans, 0))
+        return {'interest': empty, 'principal': empty.copy(), 'balance': empty.copy()}
+    return {
+        'interest': np.column_stack([interest for _, interest, _, _ in months]),
+        'principal': np.column_stack([principal for _, _, principal, _ in months]),
+        'balance': np.column_stack([balance for _, _, _, balance in months]),
+    }
+
+
+def project_outstanding_balance(loan_amounts, tenures, interest_rates, monthly_installments=None):
+    """Total outstanding principal of a portfolio at the end of every month"""
+    return np.array([
+        balance.sum()
+        for _, _, _, balance in iter_amortization(loan_amounts, tenures, interest_rates, monthly_installments)
+    ])
+
+
+def monthly_repayment_mismatches(loan_amounts, tenures, interest_rates, monthly_repayments, tolerance=0.01):
+    """Mask of loans whose stated monthly repayment is off the computed EMI by more than `tolerance` (relative)"""
+    expected = calculate_monthly_installments(loan_amounts, tenures, interest_rates)
+    stated = np.asarray(monthly_repayments, dtype=np.float64)
+    return np.abs(stated - expected) > np.abs(expected) * tolerance
+
+
 def get_corrected_interest_rate(credit_score, requested_rate):
     """Get corrected interest rate based on credit score"""
     if credit_score > 50:
@@ -90,6 +421,27 @@ def get_corrected_interest_rate(credit_score, requested_rate):
         return None  # Loan not approved
 
 
+def decide_loan_eligibility(credit_score, current_emis, monthly_salary, loan_amount, interest_rate, tenure):
+    """Eligibility from already fetched inputs, returns (eligible, corrected_rate, new_emi)"""
+    # Calculate new EMI
+    new_emi = calculate_monthly_installment_exact(loan_amount, tenure, interest_rate)
+    total_emis = current_emis + new_emi
+    
+    # Check if total EMIs exceed 50% of monthly salary
+    if total_emis > monthly_salary * Decimal('0.5'):
+        return False, None, new_emi
+    
+    # Check credit score eligibility
+    if credit_score > 50:
+        return True, interest_rate, new_emi
+    elif 30 < credit_score <= 50 and interest_rate >= 12:
+        return True, max(interest_rate, 12.0), new_emi
+    elif 10 < credit_score <= 30 and interest_rate >= 16:
+        return True, max(interest_rate, 16.0), new_emi
+    else:
+        return False, None, new_emi
+
+
 def check_loan_eligibility(customer, loan_amount, interest_rate, tenure):
     """Check if customer is eligible for loan"""
     # Calculate credit score
@@ -99,23 +451,59 @@ def check_loan_eligibility(customer, loan_amount, interest_rate, tenure):
     current_loans = Loan.objects.filter(customer=customer, end_date__gt=date.today())  # type: ignore
     current_emis = sum(loan.monthly_repayment for loan in current_loans)
     
-    # Calculate new EMI
-    new_emi = calculate_monthly_installment(loan_amount, tenure, interest_rate)
-    total_emis = current_emis + Decimal(str(new_emi))
+    eligible, corrected_rate, _ = decide_loan_eligibility(
+        credit_score, current_emis, customer.monthly_salary, loan_amount, interest_rate, tenure
+    )
+    return eligible, credit_score, corrected_rate
+
+
+# Keep IN (...) lookups under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def get_current_emis(customer_ids, today=None):
+    """Monthly repayments of loans still running, summed per customer in one query"""
+    today = today or date.today()
+    rows = (
+        Loan.objects.filter(customer_id__in=customer_ids, end_date__gt=today)  # type: ignore
+        .values('customer_id')
+        .annotate(current_emis=Sum('monthly_repayment'))
+        .order_by()
+    )
+    return {row['customer_id']: row['current_emis'] for row in rows}
+
+
+def check_loan_eligibility_bulk(applications, today=None):
+    """check_loan_eligibility for many applications with grouped queries per customer chunk
     
-    # Check if total EMIs exceed 50% of monthly salary
-    if total_emis > customer.monthly_salary * Decimal('0.5'):
-        return False, credit_score, None
+    `applications` are dicts with customer_id, loan_amount, interest_rate and
+    tenure. Returns one (eligible, credit_score, corrected_rate, new_emi)
+    tuple per application, or None where the customer does not exist. Each
+    application is judged on its own, like separate check_loan_eligibility calls.
+    """
+    today = today or date.today()
+    customer_ids = sorted({application['customer_id'] for application in applications})
     
-    # Check credit score eligibility
-    if credit_score > 50:
-        return True, credit_score, interest_rate
-    elif 30 < credit_score <= 50 and interest_rate >= 12:
-        return True, credit_score, max(interest_rate, 12.0)
-    elif 10 < credit_score <= 30 and interest_rate >= 16:
-        return True, credit_score, max(interest_rate, 16.0)
-    else:
-        return False, credit_score, None
+    salaries, scores, current_emis = {}, {}, {}
+    for offset in range(0, len(customer_ids), LOOKUP_CHUNK_SIZE):
+        chunk = customer_ids[offset:offset + LOOKUP_CHUNK_SIZE]
+        customers = Customer.objects.filter(customer_id__in=chunk)  # type: ignore
+        salaries.update(customers.values_list('customer_id', 'monthly_salary').order_by())
+        scores.update(score_customers(customers, today))
+        current_emis.update(get_current_emis(chunk, today))
+    
+    decisions = []
+    for application in applications:
+        customer_id = application['customer_id']
+        if customer_id not in salaries:
+            decisions.append(None)
+            continue
+        eligible, corrected_rate, new_emi = decide_loan_eligibility(
+            scores[customer_id], current_emis.get(customer_id, 0), salaries[customer_id],
+            application['loan_amount'], application['interest_rate'], application['tenure']
+        )
+        decisions.append((eligible, scores[customer_id], corrected_rate, new_emi))
+    return decisions
 
 
 def round_to_nearest_lakh(amount):
@@ -123,10 +511,18 @@ def round_to_nearest_lakh(amount):
     return round(amount / 100000) * 100000
 
 
-def determine_loan_approval(customer, loan):
+@profiled('determine_loan_approval')
+def determine_loan_approval(customer, loan, credit_score=None):
     """Determine loan approval status based on customer and loan data"""
-    # Calculate credit score
-    credit_score = calculate_credit_score(customer)
+    decision = _determine_loan_approval(customer, loan, credit_score)
+    LOAN_DECISIONS.inc(approval=decision['approval'])
+    return decision
+
+
+def _determine_loan_approval(customer, loan, credit_score):
+    # Calculate credit score unless the caller already has it
+    if credit_score is None:
+        credit_score = calculate_credit_score(customer)
     
     # Check if loan amount exceeds approved limit
     if loan.loan_amount > customer.approved_limit:
@@ -165,4 +561,95 @@ def determine_loan_approval(customer, loan):
             'approval': 'approved',
             'reason': f'All criteria met. Credit score: {credit_score}',
             'credit_score': credit_score
-        }
\ No newline at end of file
+        }
+
+
+def determine_loan_approvals(scores, loan_cents, limit_cents, debt_cents, salary_cents):
+    """Vectorized determine_loan_approval status over aligned arrays, amounts in integer cents"""
+    scores = np.asarray(scores, dtype=np.int64)
+    loan_cents = np.asarray(loan_cents, dtype=np.int64)
+    limit_cents = np.asarray(limit_cents, dtype=np.int64)
+    debt_cents = np.asarray(debt_cents, dtype=np.int64)
+    salary_cents = np.asarray(salary_cents, dtype=np.int64)
+    
+    # Debt-to-income above 50% becomes debt * 2 > salary without rounding
+    return np.select(
+        [
+            loan_cents > limit_cents,
+            (debt_cents + loan_cents) * 2 > salary_cents,
+            scores < 580,
+            scores < 670,
+        ],
+        ['rejected', 'rejected', 'rejected', 'pending'],
+        default='approved',
+    )
+
+
+def simulate_credit_scenarios(customer, scenarios, today=None):
+    """Credit score and approval of a customer under hypothetical changes, without any writes
+    
+    Each scenario may add a loan starting today (loan_amount and tenure) and
+    override monthly_salary or approved_limit. The loan history is
+    aggregated once and every scenario is evaluated as an array operation.
+    Returns one (score, approval) pair per scenario, approval is None for
+    scenarios without a loan to decide on.
+    """
+    components = get_credit_score_components(customer, today)
+    count = len(scenarios)
+    
+    def column(key, default):
+        values = [scenario.get(key) for scenario in scenarios]
+        return [default if value is None else value for value in values]
+    
+    loan_cents = np.array([_to_cents(amount) for amount in column('loan_amount', 0)], dtype=np.int64)
+    has_loan = loan_cents > 0
+    new_loans = has_loan.astype(np.int64)
+    tenures = np.where(has_loan, np.array(column('tenure', 0), dtype=np.int64), 0)
+    limit_cents = [_to_cents(limit) for limit in column('approved_limit', customer.approved_limit)]
+    salary_cents = [_to_cents(salary) for salary in column('monthly_salary', customer.monthly_salary)]
+    
+    # The extra loan is unpaid, runs past today and counts as a current-year loan
+    scores = compute_credit_scores(
+        num_loans=components['num_loans'] + new_loans,
+        total_emis=components['total_emis'] + tenures,
+        paid_on_time=np.full(count, components['paid_on_time']),
+        current_year_loans=components['current_year_loans'] + new_loans,
+        volume_cents=_to_cents(components['total_loan_amount']) + loan_cents,
+        debt_cents=_to_cents(components['current_debt']) + loan_cents,
+        limit_cents=limit_cents,
+    )
+    approvals = determine_loan_approvals(
+        scores, loan_cents, limit_cents, np.full(count, _to_cents(customer.current_debt)), salary_cents
+    )
+    return [
+        (int(score), str(approval) if loaned else None)
+        for score, approval, loaned in zip(scores, approvals, has_loan)
+    ]
+
+
+def evaluate_loan_approvals(loans, today=None):
+    """determine_loan_approval for every loan of a queryset, scoring each customer once
+    
+    Loans come with their customer through select_related and the scores
+    are computed in bulk, returns {loan_id: decision}.
+    """
+    loans = list(loans.select_related('customer'))
+    customer_ids = sorted({loan.customer_id for loan in loans})
+    scores = {}
+    for offset in range(0, len(customer_ids), LOOKUP_CHUNK_SIZE):
+        chunk = customer_ids[offset:offset + LOOKUP_CHUNK_SIZE]
+        scores.update(score_customers(Customer.objects.filter(customer_id__in=chunk), today))  # type: ignore
+    return {
+        loan.loan_id: determine_loan_approval(loan.customer, loan, scores[loan.customer_id])
+        for loan in loans
+    }
+
+
+def evaluate_loan_approvals_by_id(loan_ids, today=None):
+    """evaluate_loan_approvals for a list of loan IDs, looked up in chunks"""
+    loan_ids = list(loan_ids)
+    decisions = {}
+    for offset in range(0, len(loan_ids), LOOKUP_CHUNK_SIZE):
+        chunk = loan_ids[offset:offset + LOOKUP_CHUNK_SIZE]
+        decisions.update(evaluate_loan_approvals(Loan.objects.filter(loan_id__in=chunk), today))  # type: ignore
+    return decisions
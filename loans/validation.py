@@ -0,0 +1,151 @@
+"""Vectorized validation of uploaded customer and loan rows.
+
+Each validator converts a whole DataFrame chunk, runs every rule as a
+column operation and records the first failing reason per row. Database
+checks (phone numbers already registered, customers that must exist) are
+a single IN lookup per chunk instead of one query per row. Column
+conversion and chunked lookups come from frames.py, like the ingestion
+pipeline's.
+"""
+import pandas as pd
+
+from .models import Customer
+from .frames import column_or_default, date_column, in_chunks, numeric_column, phone_numbers, text_column
+
+# Largest values the DecimalFields can hold
+MAX_SALARY = 10 ** 8
+MAX_AMOUNT = 10 ** 10
+
+
+class FrameValidator:
+    """Collects a rejection mask and reasons for every row of a DataFrame"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.reasons = pd.Series('', index=frame.index, dtype=object)
+
+    def check(self, failed, reason):
+        """Reject rows where `failed` is true, keeping the first reason per row"""
+        failed = pd.Series(failed, index=self.frame.index).fillna(True).astype(bool)
+        self.reasons[failed & (self.reasons == '')] = reason
+
+    @property
+    def rejected(self):
+        return self.reasons != ''
+
+    def valid_rows(self):
+        return self.frame[~self.rejected]
+
+    def errors(self):
+        rejected = self.reasons[self.rejected]
+        return [
+            {'row': int(index) + 1, 'id': None, 'error': reason}
+            for index, reason in rejected.items()
+        ]
+
+
+def _existing(field, values):
+    """Values of `field` already stored in the customers table"""
+    found = set()
+    for chunk in in_chunks(values):
+        found.update(Customer.objects.filter(**{f'{field}__in': chunk}).values_list(field, flat=True))  # type: ignore
+    return found
+
+
+def validate_customer_upload(df):
+    """Convert and validate uploaded customer rows, returns the validator"""
+    frame = pd.DataFrame({
+        'first_name': text_column(df, 'First Name'),
+        'last_name': text_column(df, 'Last Name'),
+        'age': numeric_column(df, 'Age', 25),
+        'phone_number': phone_numbers(column_or_default(df, 'Phone Number', '')),
+        'monthly_salary': numeric_column(df, 'Monthly Salary', 0).round(2),
+        'approved_limit': numeric_column(df, 'Approved Limit', 0).round(2),
+        'current_debt': numeric_column(df, 'Current Debt', 0).fillna(0).round(2),
+    }, index=df.index)
+    validator = FrameValidator(frame)
+
+    validator.check(
+        (frame['first_name'] == '') | (frame['last_name'] == '') | (frame['phone_number'] == ''),
+        'Missing required fields'
+    )
+    validator.check(
+        (frame['first_name'].str.len() > 100) | (frame['last_name'].str.len() > 100) |
+        (frame['phone_number'].str.len() > 15),
+        'Name or phone number too long'
+    )
+    validator.check(
+        ~frame['age'].between(18, 100) | (frame['age'] != frame['age'].round()),
+        'Age must be a whole number between 18 and 100'
+    )
+    validator.check(
+        ~(frame['monthly_salary'] > 0) | ~(frame['approved_limit'] > 0),
+        'Monthly salary and approved limit must be positive'
+    )
+    validator.check(frame['current_debt'] < 0, 'Current debt cannot be negative')
+    validator.check(
+        (frame['monthly_salary'] >= MAX_SALARY) | (frame['approved_limit'] >= MAX_AMOUNT) |
+        (frame['current_debt'] >= MAX_AMOUNT),
+        'Amount too large'
+    )
+    validator.check(frame['phone_number'].duplicated(), 'Duplicate phone number in file')
+
+    candidates = frame.loc[~validator.rejected, 'phone_number']
+    validator.check(
+        frame['phone_number'].isin(_existing('phone_number', candidates.unique())),
+        'Customer with this phone number already exists'
+    )
+
+    frame['age'] = frame['age'].fillna(0).astype('int64')
+    return validator
+
+
+def validate_loan_upload(df):
+    """Convert and validate uploaded loan rows, returns the validator"""
+    frame = pd.DataFrame({
+        'customer_id': numeric_column(df, 'Customer ID', None),
+        'loan_amount': numeric_column(df, 'Loan Amount', 0).round(2),
+        'tenure': numeric_column(df, 'Tenure', 12),
+        'interest_rate': numeric_column(df, 'Interest Rate', 10.0).round(2),
+        'monthly_repayment': numeric_column(df, 'Monthly payment', 0).round(2),
+        'emis_paid_on_time': numeric_column(df, 'EMIs paid on Time', 0),
+        'start_date': date_column(df, 'Date of Approval'),
+        'end_date': date_column(df, 'End Date'),
+    }, index=df.index)
+    validator = FrameValidator(frame)
+
+    validator.check(frame['start_date'].isna() | frame['end_date'].isna(), 'Missing start_date or end_date')
+    validator.check(
+        frame[['customer_id', 'loan_amount', 'tenure', 'interest_rate', 'monthly_repayment', 'emis_paid_on_time']].isna().any(axis=1),
+        'Missing or non-numeric value'
+    )
+    validator.check(
+        ~frame['tenure'].between(1, 360) | (frame['tenure'] != frame['tenure'].round()),
+        'Tenure must be a whole number of months between 1 and 360'
+    )
+    validator.check(
+        (frame['customer_id'] != frame['customer_id'].round()) |
+        (frame['emis_paid_on_time'] != frame['emis_paid_on_time'].round()),
+        'Customer ID and EMIs paid on time must be whole numbers'
+    )
+    validator.check(
+        ~(frame['loan_amount'] > 0) | ~(frame['monthly_repayment'] > 0) |
+        (frame['loan_amount'] >= MAX_AMOUNT) | (frame['monthly_repayment'] >= MAX_AMOUNT),
+        'Loan amount and monthly payment must be positive and within limits'
+    )
+    validator.check(~frame['interest_rate'].between(0.01, 100), 'Interest rate must be between 0.01 and 100')
+    validator.check(
+        (frame['emis_paid_on_time'] < 0) | (frame['emis_paid_on_time'] > frame['tenure']),
+        'EMIs paid on time cannot exceed total tenure'
+    )
+    validator.check(frame['start_date'] >= frame['end_date'], 'End date must be after start date')
+
+    candidates = frame.loc[~validator.rejected, 'customer_id'].astype('int64')
+    existing = _existing('customer_id', candidates.unique().tolist())
+    validator.check(~frame['customer_id'].isin(existing), 'Customer does not exist')
+
+    frame['start_date'] = frame['start_date'].dt.date
+    frame['end_date'] = frame['end_date'].dt.date
+    for column in ('customer_id', 'tenure', 'emis_paid_on_time'):
+        frame[column] = frame[column].fillna(0).astype('int64')
+    return validator
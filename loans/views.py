@@ -1,53 +1,57 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib import messages
 from django.http import JsonResponse
-from django.core.paginator import Paginator
-from django.db.models import Count, Sum, Avg, Q
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from datetime import datetime, timedelta
 import json
-import pandas as pd
 import io
-
-from .models import Customer, Loan
-from .serializers import CustomerSerializer, LoanDetailSerializer
-from .utils import calculate_credit_score, determine_loan_approval
-
-
+import logging
+
+from .deletion import delete_customers
+from .models import Customer, Loan, ImportJob
+from .pagination import keyset_response, ndjson_response, paginate_list
+from .search import MAX_RESULTS as SEARCH_MAX_RESULTS, search_customers, search_loans
+from .stats import get_dashboard_stats, reconcile_dashboard_stats
+from .portfolio import pending_loans
+from .profiling import query_budget
+from .serializers import (
+    BatchLoanEligibilitySerializer, BulkLoanApprovalSerializer, CreditSimulationSerializer,
+    CustomerSerializer, LoanDetailSerializer, ValuesSerializer
+)
+from .cache import cache_stats
+from .utils import (
+    check_loan_eligibility_bulk, evaluate_loan_approvals_by_id, get_cached_credit_score,
+    get_cached_loan_approval, simulate_credit_scenarios
+)
+
+logger = logging.getLogger(__name__)
+
+# Read-only list endpoints serialize values_list() rows instead of model instances
+CUSTOMER_VALUES = ValuesSerializer(CustomerSerializer)
+LOAN_DETAIL_VALUES = ValuesSerializer(LoanDetailSerializer)
+
+
+@query_budget(6)
 def dashboard(request):
     """Main dashboard view with system statistics"""
     try:
-        # Get basic statistics
-        total_customers = Customer.objects.count()
-        total_loans = Loan.objects.count()
-        total_loan_amount = Loan.objects.aggregate(total=Sum('loan_amount'))['total'] or 0
+        # Totals and the score histogram are maintained on writes
+        stats = get_dashboard_stats()
         
         # Recent activities
         recent_customers = Customer.objects.order_by('-created_at')[:5]
-        recent_loans = Loan.objects.order_by('-created_at')[:5]
-        
-        # Credit score distribution
-        customers_with_scores = []
-        for customer in Customer.objects.all():
-            score = calculate_credit_score(customer)
-            customers_with_scores.append(score)
-        
-        score_distribution = {
-            'excellent': len([s for s in customers_with_scores if s >= 800]),
-            'good': len([s for s in customers_with_scores if 700 <= s < 800]),
-            'fair': len([s for s in customers_with_scores if 600 <= s < 700]),
-            'poor': len([s for s in customers_with_scores if s < 600])
-        }
+        recent_loans = Loan.objects.select_related('customer').order_by('-created_at')[:5]
         
         context = {
-            'total_customers': total_customers,
-            'total_loans': total_loans,
-            'total_loan_amount': total_loan_amount,
+            'total_customers': stats.total_customers,
+            'total_loans': stats.total_loans,
+            'total_loan_amount': stats.total_loan_amount,
             'recent_customers': recent_customers,
             'recent_loans': recent_loans,
-            'score_distribution': score_distribution,
+            'score_distribution': stats.score_distribution,
         }
         return render(request, 'loans/dashboard.html', context)
     except Exception as e:
@@ -69,36 +73,35 @@ def dashboard(request):
         return render(request, 'loans/dashboard.html', context)
 
 
+@query_budget(6)
 def customer_list(request):
     """List all customers with search and pagination"""
     customers = Customer.objects.all().order_by('-created_at')
     
     # Search functionality
     search_query = request.GET.get('search', '')
+    search_truncated = False
     if search_query:
-        customers = customers.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(phone_number__icontains=search_query)
-        )
+        customers, search_truncated = search_customers(customers, search_query)
     
-    # Pagination
-    paginator = Paginator(customers, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination, searches are bounded so only they get an exact count
+    page_obj = paginate_list(request, customers, 10, exact_count=bool(search_query))
     
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
+        'search_truncated': search_truncated,
+        'search_limit': SEARCH_MAX_RESULTS,
     }
     return render(request, 'loans/customer_list.html', context)
 
 
+@query_budget(15)
 def customer_detail(request, customer_id):
     """View customer details and their loans"""
     customer = get_object_or_404(Customer, customer_id=customer_id)
     loans = customer.loans.all().order_by('-created_at')
-    credit_score = calculate_credit_score(customer)
+    credit_score = get_cached_credit_score(customer)
     
     context = {
         'customer': customer,
@@ -158,37 +161,36 @@ def customer_edit(request, customer_id):
     return render(request, 'loans/customer_form.html', context)
 
 
+@query_budget(6)
 def loan_list(request):
     """List all loans with search and pagination"""
     loans = Loan.objects.select_related('customer').all().order_by('-created_at')
     
     # Search functionality
     search_query = request.GET.get('search', '')
+    search_truncated = False
     if search_query:
-        loans = loans.filter(
-            Q(customer__first_name__icontains=search_query) |
-            Q(customer__last_name__icontains=search_query) |
-            Q(loan_id__icontains=search_query)
-        )
+        loans, search_truncated = search_loans(loans, search_query)
     
-    # Pagination
-    paginator = Paginator(loans, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination, searches are bounded so only they get an exact count
+    page_obj = paginate_list(request, loans, 10, exact_count=bool(search_query))
     
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
+        'search_truncated': search_truncated,
+        'search_limit': SEARCH_MAX_RESULTS,
     }
     return render(request, 'loans/loan_list.html', context)
 
 
+@query_budget(15)
 def loan_detail(request, loan_id):
     """View loan details and approval status"""
-    loan = get_object_or_404(Loan, loan_id=loan_id)
+    loan = get_object_or_404(Loan.objects.select_related('customer'), loan_id=loan_id)
     customer = loan.customer
-    credit_score = calculate_credit_score(customer)
-    approval_status = determine_loan_approval(customer, loan)
+    credit_score = get_cached_credit_score(customer)
+    approval_status = get_cached_loan_approval(customer, loan)
     
     context = {
         'loan': loan,
@@ -262,7 +264,8 @@ def loan_edit(request, loan_id):
 
 
 def excel_upload(request):
-    """Handle Excel file uploads for bulk data import"""
+    """Handle Excel, CSV or Parquet file uploads for bulk data import"""
+    job = None
     if request.method == 'POST':
         try:
             excel_file = request.FILES.get('excel_file')
@@ -270,144 +273,28 @@ def excel_upload(request):
                 messages.error(request, 'Please select an Excel file.')
                 return redirect('excel_upload')
             
-            # Read Excel file
-            df = pd.read_excel(excel_file)
-            
-            # Print debug information
-            print(f"Excel file columns: {list(df.columns)}")
-            print(f"Excel file shape: {df.shape}")
-            print(f"First few rows: {df.head()}")
-            
-            # Determine file type based on columns
-            if 'First Name' in df.columns:
-                # Customer data
-                success_count = 0
-                error_count = 0
-                for index, row in df.iterrows():
-                    try:
-                        # Handle missing values with actual column names
-                        first_name = str(row.get('First Name', '')).strip()
-                        last_name = str(row.get('Last Name', '')).strip()
-                        age = int(row.get('Age', 25))
-                        phone_number = str(row.get('Phone Number', '')).strip()
-                        monthly_salary = float(row.get('Monthly Salary', 0))
-                        approved_limit = float(row.get('Approved Limit', 0))
-                        current_debt = float(row.get('Current Debt', 0))  # This column might not exist
-                        
-                        # Validate required fields
-                        if not first_name or not last_name or not phone_number:
-                            print(f"Row {index + 1}: Missing required fields")
-                            error_count += 1
-                            continue
-                        
-                        # Check if customer already exists
-                        if Customer.objects.filter(phone_number=phone_number).exists():
-                            print(f"Row {index + 1}: Customer with phone {phone_number} already exists")
-                            error_count += 1
-                            continue
-                        
-                        customer = Customer(
-                            first_name=first_name,
-                            last_name=last_name,
-                            age=age,
-                            phone_number=phone_number,
-                            monthly_salary=monthly_salary,
-                            approved_limit=approved_limit,
-                            current_debt=current_debt
-                        )
-                        customer.full_clean()
-                        customer.save()
-                        success_count += 1
-                        print(f"Row {index + 1}: Customer {first_name} {last_name} created successfully")
-                        
-                    except Exception as e:
-                        print(f"Row {index + 1}: Error - {str(e)}")
-                        error_count += 1
-                        continue
-                
-                if success_count > 0:
-                    messages.success(request, f'Successfully imported {success_count} customers from Excel file.')
-                if error_count > 0:
-                    messages.warning(request, f'{error_count} rows had errors and were skipped.')
-            
-            elif 'Loan Amount' in df.columns and 'Customer ID' in df.columns:
-                # Loan data
-                success_count = 0
-                error_count = 0
-                for index, row in df.iterrows():
-                    try:
-                        customer_id = int(row.get('Customer ID'))
-                        loan_amount = float(row.get('Loan Amount', 0))
-                        tenure = int(row.get('Tenure', 12))
-                        interest_rate = float(row.get('Interest Rate', 10.0))
-                        monthly_repayment = float(row.get('Monthly payment', 0))
-                        emis_paid_on_time = int(row.get('EMIs paid on Time', 0))
-                        
-                        # Handle date conversion with actual column names
-                        start_date = row.get('Date of Approval')
-                        end_date = row.get('End Date')
-                        
-                        if pd.isna(start_date) or pd.isna(end_date):
-                            print(f"Row {index + 1}: Missing start_date or end_date")
-                            error_count += 1
-                            continue
-                        
-                        # Convert dates properly
-                        if isinstance(start_date, str):
-                            start_date = pd.to_datetime(start_date).date()
-                        elif hasattr(start_date, 'date'):
-                            start_date = start_date.date()
-                        else:
-                            start_date = pd.to_datetime(start_date).date()
-                            
-                        if isinstance(end_date, str):
-                            end_date = pd.to_datetime(end_date).date()
-                        elif hasattr(end_date, 'date'):
-                            end_date = end_date.date()
-                        else:
-                            end_date = pd.to_datetime(end_date).date()
-                        
-                        # Validate customer exists
-                        try:
-                            customer = Customer.objects.get(customer_id=customer_id)
-                        except Customer.DoesNotExist:
-                            print(f"Row {index + 1}: Customer with ID {customer_id} does not exist")
-                            error_count += 1
-                            continue
-                        
-                        loan = Loan(
-                            customer=customer,
-                            loan_amount=loan_amount,
-                            tenure=tenure,
-                            interest_rate=interest_rate,
-                            monthly_repayment=monthly_repayment,
-                            emis_paid_on_time=emis_paid_on_time,
-                            start_date=start_date,
-                            end_date=end_date
-                        )
-                        loan.full_clean()
-                        loan.save()
-                        success_count += 1
-                        print(f"Row {index + 1}: Loan for customer {customer_id} created successfully")
-                        
-                    except Exception as e:
-                        print(f"Row {index + 1}: Error - {str(e)}")
-                        error_count += 1
-                        continue
-                
-                if success_count > 0:
-                    messages.success(request, f'Successfully imported {success_count} loans from Excel file.')
-                if error_count > 0:
-                    messages.warning(request, f'{error_count} rows had errors and were skipped.')
+            # pandas and openpyxl load with the first upload, not with every worker
+            from .jobs import submit_import_job
+            from .tasks import import_upload
             
+            if settings.EXCEL_UPLOAD_ASYNC:
+                # Process in the background, the page polls the job status
+                job = submit_import_job(excel_file)
+                messages.info(request, f'File "{job.file_name}" queued for import.')
             else:
-                messages.error(request, f'Unrecognized Excel file format. Found columns: {list(df.columns)}. Please check the column headers.')
+                report = import_upload(excel_file)
+                if report.error:
+                    messages.error(request, report.error)
+                if report.created > 0:
+                    messages.success(request, f'Successfully imported {report.created} {report.label} from Excel file.')
+                if report.rejected > 0:
+                    messages.warning(request, f'{report.rejected} rows had errors and were skipped.')
             
         except Exception as e:
-            print(f"Excel processing error: {str(e)}")
+            logger.exception('Excel processing error')
             messages.error(request, f'Error processing Excel file: {str(e)}')
     
-    return render(request, 'loans/excel_upload.html')
+    return render(request, 'loans/excel_upload.html', {'job': job})
 
 
 def customer_delete(request, customer_id):
@@ -417,8 +304,8 @@ def customer_delete(request, customer_id):
     if request.method == 'POST':
         try:
             customer_name = f"{customer.first_name} {customer.last_name}"
-            # Delete customer (this will cascade delete all loans due to ForeignKey)
-            customer.delete()
+            # One statement per table instead of the per-row cascade and its signals
+            delete_customers(Customer.objects.filter(customer_id=customer.customer_id))  # type: ignore
             messages.success(request, f'Customer "{customer_name}" and all their loans have been deleted successfully.')
             return redirect('loans:customer_list')
         except Exception as e:
@@ -455,11 +342,13 @@ def delete_all_data(request):
     if request.method == 'POST':
         try:
             # Get counts before deletion
-            customer_count = Customer.objects.count()
-            loan_count = Loan.objects.count()
+            stats = get_dashboard_stats()
+            customer_count = stats.total_customers
+            loan_count = stats.total_loans
             
-            # Delete all data
-            Customer.objects.all().delete()  # This will cascade delete all loans
+            # Delete all data, then recount once instead of adjusting per row
+            delete_customers(Customer.objects.all())  # type: ignore
+            reconcile_dashboard_stats(refresh_scores=False)
             
             messages.success(request, f'All data has been deleted successfully! ({customer_count} customers and {loan_count} loans removed)')
             return redirect('loans:dashboard')
@@ -467,28 +356,44 @@ def delete_all_data(request):
             messages.error(request, f'Error deleting all data: {str(e)}')
     
     # Get current data counts
+    stats = get_dashboard_stats()
     context = {
-        'customer_count': Customer.objects.count(),
-        'loan_count': Loan.objects.count(),
-        'total_loan_amount': Loan.objects.aggregate(total=Sum('loan_amount'))['total'] or 0
+        'customer_count': stats.total_customers,
+        'loan_count': stats.total_loans,
+        'total_loan_amount': stats.total_loan_amount
     }
     return render(request, 'loans/delete_all_confirm.html', context)
 
 
+def _values_list_response(request, queryset, key, serializer):
+    """Keyset page or NDJSON stream built from values_list() rows"""
+    rows = serializer.values(queryset)
+    if request.GET.get('format') == 'ndjson':
+        return ndjson_response(rows, serializer.to_representation)
+    key_index = serializer.index(key)
+    return keyset_response(
+        request, rows, key, serializer.serialize,
+        cursor_of=lambda row: row[key_index]
+    )
+
+
+@query_budget(2)
 def api_customers(request):
-    """API endpoint for customer data"""
-    customers = Customer.objects.all()
-    serializer = CustomerSerializer(customers, many=True)
-    return JsonResponse(serializer.data, safe=False)
+    """API endpoint for customer data, paginated by customer_id or streamed as NDJSON"""
+    return _values_list_response(
+        request, Customer.objects.order_by('customer_id'), 'customer_id', CUSTOMER_VALUES
+    )
 
 
+@query_budget(2)
 def api_loans(request):
-    """API endpoint for loan data"""
-    loans = Loan.objects.select_related('customer').all()
-    serializer = LoanDetailSerializer(loans, many=True)
-    return JsonResponse(serializer.data, safe=False)
+    """API endpoint for loan data, paginated by loan_id or streamed as NDJSON"""
+    return _values_list_response(
+        request, Loan.objects.order_by('loan_id'), 'loan_id', LOAN_DETAIL_VALUES
+    )
 
 
+@query_budget(15)
 @csrf_exempt
 def api_credit_score(request, customer_id):
     """API endpoint to calculate credit score for a customer"""
@@ -497,7 +402,7 @@ def api_credit_score(request, customer_id):
             customer = Customer.objects.filter(customer_id=customer_id).first()
             if not customer:
                 return JsonResponse({'error': 'Customer not found. Please check the Customer ID.'}, status=404)
-            credit_score = calculate_credit_score(customer)
+            credit_score = get_cached_credit_score(customer)
             if credit_score is None:
                 return JsonResponse({'error': 'Could not calculate credit score. Data may be missing or invalid.'}, status=400)
             return JsonResponse({'credit_score': credit_score})
@@ -506,18 +411,159 @@ def api_credit_score(request, customer_id):
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
 
+@query_budget(3)
+@csrf_exempt
+def api_credit_simulation(request, customer_id):
+    """API endpoint scoring a customer under many hypothetical scenarios, nothing is written"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Request body must be valid JSON.'}, status=400)
+    
+    serializer = CreditSimulationSerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse({'errors': serializer.errors}, status=400)
+    customer = Customer.objects.filter(customer_id=customer_id).first()
+    if not customer:
+        return JsonResponse({'error': 'Customer not found. Please check the Customer ID.'}, status=404)
+    
+    outcomes = simulate_credit_scenarios(customer, serializer.validated_data['scenarios'])
+    return JsonResponse({
+        'customer_id': customer.customer_id,
+        'results': [
+            {'credit_score': credit_score, 'approval': approval}
+            for credit_score, approval in outcomes
+        ],
+    })
+
+
+@query_budget(15)
 @csrf_exempt
 def api_loan_approval(request, loan_id):
     """API endpoint to check loan approval status"""
     if request.method == 'POST':
         try:
-            loan = Loan.objects.filter(loan_id=loan_id).first()
+            loan = Loan.objects.select_related('customer').filter(loan_id=loan_id).first()
             if not loan:
                 return JsonResponse({'error': 'Loan not found. Please check the Loan ID.'}, status=404)
-            approval_status = determine_loan_approval(loan.customer, loan)
+            approval_status = get_cached_loan_approval(loan.customer, loan)
             if not approval_status:
                 return JsonResponse({'error': 'Could not determine approval status. Data may be missing or invalid.'}, status=400)
             return JsonResponse(approval_status)
         except Exception as e:
             return JsonResponse({'error': f'Error checking approval status: {str(e)}'}, status=400)
     return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+
+@query_budget(60)
+@csrf_exempt
+def api_loan_approval_bulk(request):
+    """API endpoint evaluating many loans, by ID or every pending loan, in one request"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Request body must be valid JSON.'}, status=400)
+    
+    serializer = BulkLoanApprovalSerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse({'errors': serializer.errors}, status=400)
+    
+    if serializer.validated_data['pending']:
+        # One page of pending loans, resumed from the previous page's next_cursor
+        limit = settings.APPROVAL_BATCH_MAX_SIZE
+        loan_ids = list(
+            pending_loans()
+            .filter(loan_id__gt=serializer.validated_data['cursor'])
+            .order_by('loan_id')
+            .values_list('loan_id', flat=True)[:limit + 1]
+        )
+        truncated = len(loan_ids) > limit
+        loan_ids = loan_ids[:limit]
+    else:
+        loan_ids = serializer.validated_data['loan_ids']
+        truncated = False
+    decisions = evaluate_loan_approvals_by_id(loan_ids)
+    
+    results = [
+        {'loan_id': loan_id, **decisions[loan_id]} if loan_id in decisions
+        else {'loan_id': loan_id, 'error': 'Loan not found.'}
+        for loan_id in loan_ids
+    ]
+    return JsonResponse({
+        'results': results,
+        'truncated': truncated,
+        'next_cursor': loan_ids[-1] if truncated else None,
+    })
+
+
+@query_budget(60)
+@csrf_exempt
+def api_check_eligibility_batch(request):
+    """API endpoint pre-qualifying many loan applications in one request"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Request body must be valid JSON.'}, status=400)
+    
+    serializer = BatchLoanEligibilitySerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse({'errors': serializer.errors}, status=400)
+    applications = serializer.validated_data['applications']
+    
+    results = []
+    for application, decision in zip(applications, check_loan_eligibility_bulk(applications)):
+        if decision is None:
+            results.append({
+                'customer_id': application['customer_id'],
+                'approval': False,
+                'error': 'Customer not found.',
+            })
+            continue
+        eligible, credit_score, corrected_rate, monthly_installment = decision
+        results.append({
+            'customer_id': application['customer_id'],
+            'approval': eligible,
+            'credit_score': credit_score,
+            'interest_rate': application['interest_rate'],
+            'corrected_interest_rate': corrected_rate,
+            'tenure': application['tenure'],
+            'monthly_installment': monthly_installment,
+        })
+    return JsonResponse({'results': results})
+
+
+@query_budget(0)
+def api_cache_stats(request):
+    """API endpoint exposing credit cache hit/miss counters"""
+    return JsonResponse(cache_stats())
+
+
+@query_budget(4)
+def api_import_job(request, job_id):
+    """API endpoint reporting the progress of a background import job"""
+    job = ImportJob.objects.filter(job_id=job_id).first()
+    if not job:
+        return JsonResponse({'error': 'Import job not found.'}, status=404)
+    if job.is_stale:
+        # The worker running it is gone, report the job as failed
+        from .jobs import sweep_stale_jobs
+        sweep_stale_jobs()
+        job.refresh_from_db()
+    return JsonResponse({
+        'job_id': job.job_id,
+        'file_name': job.file_name,
+        'kind': job.kind,
+        'status': job.status,
+        'finished': job.is_finished,
+        'rows_processed': job.rows_processed,
+        'rows_succeeded': job.rows_succeeded,
+        'rows_failed': job.rows_failed,
+        'errors': job.errors,
+        'message': job.message,
+    })